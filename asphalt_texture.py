@@ -0,0 +1,102 @@
+# asphalt_texture.py - Procedural asphalt texture (NumPy value noise, no GL)
+#
+# Generated images are cached on disk under a hash of the generation
+# parameters, so large textures (up to 2048x2048) cost nothing after the
+# first run. Delete the .cache directory to force regeneration.
+import hashlib
+import json
+import os
+import numpy as np
+
+MAX_TEXTURE_SIZE = 2048
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'textures')
+CACHE_VERSION = 1  # Bump when the generator output changes
+
+
+def _check_size(size):
+    if size < 1 or size > MAX_TEXTURE_SIZE or size & (size - 1):
+        raise ValueError(f"Texture size must be a power of two up to {MAX_TEXTURE_SIZE}, got {size}")
+
+
+def value_noise(size, cells, rng):
+    """Tileable value noise in [0, 1]: random lattice of cells x cells, smoothly interpolated"""
+    lattice = rng.random((cells, cells), dtype=np.float32)
+    if cells >= size:
+        return lattice  # One cell per pixel, nothing to interpolate
+    coords = np.arange(size, dtype=np.float32) * (cells / size)
+    i0 = coords.astype(np.int64)
+    t = coords - i0
+    t = t * t * (3.0 - 2.0 * t)  # Smoothstep
+    i0 %= cells
+    i1 = (i0 + 1) % cells  # Wrap around so the texture repeats seamlessly
+
+    # Separable: interpolate along x on the lattice rows, then along z
+    rows = lattice[:, i0] * (1.0 - t) + lattice[:, i1] * t
+    return rows[i0] * (1.0 - t)[:, None] + rows[i1] * t[:, None]
+
+
+def generate_asphalt_image(size=128, octaves=4, base=60, amplitude=15, persistence=0.5, seed=0):
+    """Multi-octave gray noise as a (size, size, 3) uint8 array
+
+    The finest octave has one lattice cell per pixel (grain), coarser
+    octaves add larger patches. Values stay in base +/- amplitude.
+    """
+    _check_size(size)
+    rng = np.random.default_rng(seed)
+    noise = np.zeros((size, size), dtype=np.float32)
+    weight, total = 1.0, 0.0
+    cells = size
+    for _ in range(max(1, octaves)):
+        noise += weight * value_noise(size, cells, rng)
+        total += weight
+        weight *= persistence
+        cells = max(1, cells // 2)
+
+    # Normalize to [-1, 1] dan skala ke abu-abu gelap
+    noise = (noise / total) * 2.0 - 1.0
+    gray = np.clip(np.rint(base + noise * amplitude), 0, 255).astype(np.uint8)
+    return np.repeat(gray[:, :, None], 3, axis=2)
+
+
+def build_mipmaps(image):
+    """Mip chain by 2x2 box filtering, from full size down to 1x1"""
+    levels = [image]
+    while levels[-1].shape[0] > 1:
+        level = levels[-1].astype(np.uint16)
+        half = (level[0::2, 0::2] + level[1::2, 0::2] + level[0::2, 1::2] + level[1::2, 1::2] + 2) // 4
+        levels.append(half.astype(np.uint8))
+    return levels
+
+
+def texture_cache_key(**params):
+    """Content hash of the generation parameters"""
+    payload = json.dumps({'version': CACHE_VERSION, **params}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def load_asphalt_mipmaps(size=128, octaves=4, base=60, amplitude=15, persistence=0.5, seed=0,
+                         cache_dir=CACHE_DIR):
+    """Return the asphalt mip chain, from the disk cache when available"""
+    params = dict(size=size, octaves=octaves, base=base, amplitude=amplitude,
+                  persistence=persistence, seed=seed)
+    path = None
+    if cache_dir:
+        path = os.path.join(cache_dir, f"asphalt_{texture_cache_key(**params)}.npz")
+        if os.path.exists(path):
+            try:
+                with np.load(path) as cached:
+                    return [cached[f'level{i}'] for i in range(len(cached.files))]
+            except (OSError, ValueError, KeyError):
+                pass  # Rusak - generate ulang
+
+    levels = build_mipmaps(generate_asphalt_image(**params))
+
+    if path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = path + '.tmp.npz'
+            np.savez(tmp_path, **{f'level{i}': level for i, level in enumerate(levels)})
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not cache asphalt texture: {e}")
+    return levels
@@ -0,0 +1,139 @@
+# autopilot.py - Road-graph autopilot behind Car.auto_mode (no GL)
+#
+# Picks random destinations, plans routes on the intersection graph
+# (RoadGraph A*, LRU-cached, long queries on a worker thread) and steers the
+# car along the right-hand lane centerline with a look-ahead controller.
+import math
+import random
+from road_graph import RoadGraph, PathPlanner
+from timestep import step_scale
+
+CRUISE_SPEED = 18.0
+TURN_SPEED = 7.0          # Speed for turns at intersections
+SLOWDOWN_DISTANCE = 15.0  # Start slowing down this far before a turn or a stop
+LOOKAHEAD = 6.0           # Aim this far ahead along the lane centerline
+STEERING_GAIN = 0.35      # Steering angle per degree of heading error
+SEGMENT_SWITCH = 2.0      # Move on to the next segment this close to the end of the lane
+
+
+class Autopilot:
+    def __init__(self, road, seed=None, background=True):
+        self.graph = RoadGraph(road)
+        self.planner = PathPlanner(self.graph, background)
+        self.rng = random.Random(seed)
+        self.lane_offset = road.road_width / 4.0  # Center of the right-hand lane
+        self.reset()
+
+    def reset(self):
+        """Forget the current segment and route (after a teleport or mode switch)"""
+        self.segment = None      # (from_node, to_node) being driven
+        self.route = None        # Nodes after segment[1], None while planning
+        self.destination = None
+
+    def lane(self, segment):
+        """(start_x, start_z, heading_x, heading_z, length) of a segment's right-hand lane"""
+        (x0, z0), (x1, z1) = self.graph.positions[segment[0]], self.graph.positions[segment[1]]
+        length = math.hypot(x1 - x0, z1 - z0)
+        if length == 0:
+            return x0, z0, 0.0, 0.0, 0.0
+        hx, hz = (x1 - x0) / length, (z1 - z0) / length
+        # Right-hand side of the heading (same as road_graph.lane_directions)
+        return x0 - hz * self.lane_offset, z0 + hx * self.lane_offset, hx, hz, length
+
+    def plan(self):
+        """Pick a destination and fetch its route (None while the planner is busy)"""
+        start = self.segment[1]
+        if self.destination is None or self.destination == start and not self.route:
+            if self.graph.node_count < 2:
+                return
+            self.destination = self.rng.choice([n for n in range(self.graph.node_count) if n != start])
+            self.route = None
+        if self.route is None:
+            path = self.planner.request(start, self.destination)
+            if path is not None:
+                self.route = list(path[1:])
+
+    def next_segment(self):
+        """Segment after the current one, or None (route pending / destination reached)"""
+        if self.route:
+            return (self.segment[1], self.route[0])
+        return None
+
+    def corner(self, segment, following):
+        """Where the lane of `segment` meets the lane of `following`:
+        (distance along the current lane, distance along the next lane)
+
+        Lanes sit off the road axis, so a right turn meets the next lane
+        before the intersection center and a left turn after it.
+        """
+        start_x, start_z, hx, hz, length = self.lane(segment)
+        if following is None:
+            return length, 0.0
+        next_x, next_z, next_hx, next_hz, _ = self.lane(following)
+        if abs(hx * next_hx + hz * next_hz) > 0.5:
+            return length, 0.0  # Straight on (or U-turn): the lanes join at the end
+        # Perpendicular roads: project each lane's start onto the other lane
+        end = (next_x - start_x) * hx + (next_z - start_z) * hz
+        next_start = (start_x - next_x) * next_hx + (start_z - next_z) * next_hz
+        return end, next_start
+
+    def drive(self, car, delta_time=1.0 / 60.0):
+        """Set the car's steering and speed for a step of delta_time seconds"""
+        if self.segment is None:
+            self.segment = self.graph.segment_at(car.x, car.z, car.direction)
+            if self.segment is None:
+                # Outside the intersection grid: head for the closest intersection
+                node = self.graph.nearest_node(car.x, car.z)
+                self.segment = (node, node)
+        self.plan()
+
+        start_x, start_z, hx, hz, length = self.lane(self.segment)
+        along = (car.x - start_x) * hx + (car.z - start_z) * hz
+        following = self.next_segment()
+        end, next_start = self.corner(self.segment, following)
+        if along >= end - SEGMENT_SWITCH and following is not None:
+            self.segment = following
+            self.route.pop(0)
+            self.plan()
+            start_x, start_z, hx, hz, length = self.lane(self.segment)
+            along = (car.x - start_x) * hx + (car.z - start_z) * hz
+            following = self.next_segment()
+            end, next_start = self.corner(self.segment, following)
+
+        # Look-ahead point on the lane centerline, continuing into the next lane past the corner
+        ahead = along + LOOKAHEAD
+        if ahead > end and following is not None:
+            next_x, next_z, next_hx, next_hz, _ = self.lane(following)
+            distance = next_start + ahead - end
+            target_x, target_z = next_x + next_hx * distance, next_z + next_hz * distance
+        elif length == 0:
+            # Degenerate segment: drive straight to the intersection
+            target_x, target_z = self.graph.positions[self.segment[1]]
+        else:
+            ahead = min(max(ahead, 0.0), end)
+            target_x, target_z = start_x + hx * ahead, start_z + hz * ahead
+
+        # Steering: proportional to the heading error toward the look-ahead point
+        dx, dz = target_x - car.x, target_z - car.z
+        error = (math.degrees(math.atan2(dx, dz)) - car.direction + 180.0) % 360.0 - 180.0
+        car.steering_angle = max(-car.max_steering, min(car.max_steering, error * STEERING_GAIN))
+        car.wheel_angle = car.steering_angle
+
+        # Speed: cruise, slow for turns, stop at the end of the lane without a route
+        remaining = end - along
+        target_speed = CRUISE_SPEED
+        if following is None:
+            target_speed = CRUISE_SPEED * min(1.0, max(0.0, remaining - SEGMENT_SWITCH) / SLOWDOWN_DISTANCE)
+        elif remaining < SLOWDOWN_DISTANCE:
+            next_hx, next_hz = self.lane(following)[2:4]
+            if next_hx * hx + next_hz * hz < 0.99:  # Turning at the next intersection
+                target_speed = TURN_SPEED
+        if abs(error) > 45.0:
+            target_speed = min(target_speed, TURN_SPEED)
+        change = target_speed - car.speed
+        steps = step_scale(delta_time)
+        car.speed += max(-car.brake_power * steps, min(car.acceleration * 0.2 * steps, change))
+
+    def stop(self):
+        """Stop the background route planner"""
+        self.planner.stop()
@@ -0,0 +1,187 @@
+# benchmark.py - Deterministic frame-stage benchmark with baseline regression check
+#
+# Replays a scripted car route and camera-mode sequence with a fixed seed,
+# records per-stage timings and writes a JSON report:
+#     python benchmark.py --backend headless --frames 600 --output report.json
+#     python benchmark.py --backend egl --save-baseline bench_baseline.json
+#     python benchmark.py --backend egl --baseline bench_baseline.json
+# With --baseline the run exits with status 1 when any stage regresses.
+import argparse
+import json
+import random
+import sys
+import numpy as np
+from stages import StageTimer
+
+CAMERA_SEQUENCE = ['follow', 'orbital', 'top', 'free', 'side']
+
+# Driving script, repeated every ROUTE_PERIOD frames:
+# (start_frame, end_frame, interval, car control)
+ROUTE_PERIOD = 240
+ROUTE = [
+    (0, 60, 6, 'move_forward'),
+    (60, 90, 3, 'turn_left'),
+    (90, 150, 10, 'move_forward'),
+    (150, 180, 3, 'turn_right'),
+    (180, 210, 5, 'brake'),
+    (210, 240, 10, 'move_backward'),
+]
+
+
+def route_controls(frame):
+    """Car controls scripted for a given frame number"""
+    t = frame % ROUTE_PERIOD
+    return tuple(control for start, end, interval, control in ROUTE
+                 if start <= t < end and (t - start) % interval == 0)
+
+
+def camera_mode_for(frame, total_frames):
+    """Cycle through every camera mode once over the measured run"""
+    segment = max(1, total_frames // len(CAMERA_SEQUENCE))
+    return CAMERA_SEQUENCE[(frame // segment) % len(CAMERA_SEQUENCE)]
+
+
+def create_gl_simulation(width, height, seed, grid_size=3, traffic_count=None):
+    """Full CitySimulation rendering into an offscreen EGL pbuffer"""
+    from offscreen import create_egl_context
+    create_egl_context(width, height)
+
+    # OpenGL may only be imported after the EGL platform has been selected
+    from OpenGL.GL import glFinish
+    from main import CitySimulation
+    simulation = CitySimulation(width, height, offscreen=True, seed=seed, grid_size=grid_size,
+                                traffic_count=traffic_count)
+    simulation.city_renderer.compile_static_geometry()
+    return simulation, glFinish
+
+
+def summarize(samples_ns):
+    values = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    return {
+        'samples': int(len(values)),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'max_ms': float(values.max()),
+    }
+
+
+def run_benchmark(backend='headless', frames=600, seed=7, warmup=30, width=1280, height=720, grid_size=3,
+                  traffic_count=None):
+    """Run the scripted scenario and return a JSON-serializable report"""
+    random.seed(seed)
+    np.random.seed(seed)
+
+    if backend == 'egl':
+        simulation, sync = create_gl_simulation(width, height, seed, grid_size, traffic_count)
+    else:
+        from headless import HeadlessSimulation
+        simulation, sync = HeadlessSimulation(seed=seed, grid_size=grid_size, traffic_count=traffic_count), None
+
+    # glFinish after each GL stage so GPU time lands in the stage that issued it
+    timer = StageTimer(sync=sync)
+    simulation.stage_timer = timer
+    car, camera = simulation.car, simulation.camera
+
+    for frame in range(warmup + frames):
+        if frame == warmup:
+            timer.reset()
+
+        mode = camera_mode_for(max(0, frame - warmup), frames)
+        if camera.mode != mode:
+            camera.set_mode(mode)
+
+        controls = route_controls(frame)
+        with timer('frame'):
+            if backend == 'egl':
+                for control in controls:
+                    getattr(car, control)()
+                simulation.frame_count += 1
+                simulation.update_simulation(simulation.timestep.dt)
+                simulation.render()
+            else:
+                simulation.step(controls)
+
+    return {
+        'backend': backend,
+        'frames': frames,
+        'warmup': warmup,
+        'seed': seed,
+        'grid_size': grid_size,
+        'traffic_count': simulation.traffic.count,
+        'stages': {name: summarize(samples) for name, samples in sorted(timer.samples.items())},
+        'final_state': {
+            'car_x': round(float(car.x), 4),
+            'car_z': round(float(car.z), 4),
+            'car_direction': round(float(car.direction), 4),
+        },
+    }
+
+
+def compare_reports(report, baseline, tolerance=0.15, min_delta_ms=0.05):
+    """Return a list of regression messages (median time per stage vs baseline)"""
+    regressions = []
+    for name, base in baseline.get('stages', {}).items():
+        current = report['stages'].get(name)
+        if current is None:
+            continue
+        limit = base['p50_ms'] * (1.0 + tolerance) + min_delta_ms
+        if current['p50_ms'] > limit:
+            regressions.append(
+                f"{name}: p50 {current['p50_ms']:.3f} ms > {limit:.3f} ms "
+                f"(baseline {base['p50_ms']:.3f} ms)"
+            )
+    return regressions
+
+
+def print_report(report):
+    print(f"\n📊 Benchmark ({report['backend']}, {report['frames']} frames, seed={report['seed']})")
+    print(f"   {'stage':<26}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}  (ms)")
+    for name, stats in report['stages'].items():
+        print(f"   {name:<26}{stats['mean_ms']:9.3f}{stats['p50_ms']:9.3f}"
+              f"{stats['p95_ms']:9.3f}{stats['max_ms']:9.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deterministic frame-stage benchmark")
+    parser.add_argument('--backend', choices=['headless', 'egl'], default='headless',
+                        help="headless: simulation only, egl: full rendering offscreen")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--grid', type=int, default=3, help="roads per direction (N x N road network)")
+    parser.add_argument('--traffic', type=int, default=None, help="number of AI vehicles (default: one per lane segment)")
+    parser.add_argument('--output', help="write JSON report to this path")
+    parser.add_argument('--baseline', help="compare against a stored JSON report")
+    parser.add_argument('--save-baseline', help="write this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="allowed relative slowdown of a stage median (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.backend, args.frames, args.seed, args.warmup, grid_size=args.grid,
+                           traffic_count=args.traffic)
+    print_report(report)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"💾 Report written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('final_state') != report['final_state']:
+            print("⚠️  Final car state differs from baseline - scenario replay is not identical")
+        regressions = compare_reports(report, baseline, args.tolerance)
+        if regressions:
+            print("❌ Performance regressions:")
+            for message in regressions:
+                print(f"   {message}")
+            return 1
+        print("✅ No stage regressed beyond tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
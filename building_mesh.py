@@ -0,0 +1,181 @@
+# building_mesh.py - Batched building geometry (one VBO for all buildings)
+import numpy as np
+from OpenGL.GL import *
+from gl_buffers import VertexBuffer
+from frustum import aabb_visible
+from lod import (LODSelector, BUILDING_LOD_DISTANCES, IMPOSTOR_CELL_SIZE,
+                 camera_distances, merge_impostors)
+
+# Texture repeats every 5 world units (sama dengan draw_textured_cube)
+TEXTURE_REPEAT = 5.0
+CAP_COLOR = (0.2, 0.2, 0.2)
+
+# Side faces (front, back, right, left) as GL_QUADS, 4 vertices each.
+# Columns: sign x/y/z, normal x/y/z, u on, v on, u uses depth (else width)
+_SIDE_TEMPLATE = np.array([
+    # Front
+    (-1, -1,  1,  0, 0,  1,  0, 0, 0), ( 1, -1,  1,  0, 0,  1,  1, 0, 0),
+    ( 1,  1,  1,  0, 0,  1,  1, 1, 0), (-1,  1,  1,  0, 0,  1,  0, 1, 0),
+    # Back
+    ( 1, -1, -1,  0, 0, -1,  0, 0, 0), (-1, -1, -1,  0, 0, -1,  1, 0, 0),
+    (-1,  1, -1,  0, 0, -1,  1, 1, 0), ( 1,  1, -1,  0, 0, -1,  0, 1, 0),
+    # Right
+    ( 1, -1,  1,  1, 0,  0,  0, 0, 1), ( 1, -1, -1,  1, 0,  0,  1, 0, 1),
+    ( 1,  1, -1,  1, 0,  0,  1, 1, 1), ( 1,  1,  1,  1, 0,  0,  0, 1, 1),
+    # Left
+    (-1, -1, -1, -1, 0,  0,  0, 0, 1), (-1, -1,  1, -1, 0,  0,  1, 0, 1),
+    (-1,  1,  1, -1, 0,  0,  1, 1, 1), (-1,  1, -1, -1, 0,  0,  0, 1, 1),
+], dtype=np.float32)
+
+# Top and bottom faces (untextured), columns: sign x/y/z, normal x/y/z
+_CAP_TEMPLATE = np.array([
+    # Top
+    (-1,  1, -1, 0,  1, 0), (-1,  1,  1, 0,  1, 0),
+    ( 1,  1,  1, 0,  1, 0), ( 1,  1, -1, 0,  1, 0),
+    # Bottom
+    (-1, -1, -1, 0, -1, 0), ( 1, -1, -1, 0, -1, 0),
+    ( 1, -1,  1, 0, -1, 0), (-1, -1,  1, 0, -1, 0),
+], dtype=np.float32)
+
+SIDE_VERTICES = len(_SIDE_TEMPLATE)
+CAP_VERTICES = len(_CAP_TEMPLATE)
+
+
+def building_columns(buildings):
+    """Center, size and color arrays of a BuildingTable"""
+    centers = np.column_stack([buildings.x, buildings.height / 2.0, buildings.z]).astype(np.float32)
+    sizes = np.column_stack([buildings.width, buildings.height, buildings.depth]).astype(np.float32)
+    colors = buildings.color.astype(np.float32)
+    return centers, sizes, colors
+
+
+def build_building_arrays(buildings):
+    """Pack all buildings into interleaved side and cap vertex arrays
+
+    Side layout per vertex: position(3) normal(3) texcoord(2) color(4)
+    Cap layout per vertex:  position(3) normal(3)
+    """
+    centers, sizes, colors = building_columns(buildings)
+    count = len(centers)
+    half = sizes / 2.0
+
+    # Side faces
+    sides = np.empty((count, SIDE_VERTICES, 12), dtype=np.float32)
+    signs = _SIDE_TEMPLATE[:, 0:3]
+    sides[:, :, 0:3] = centers[:, None, :] + signs[None, :, :] * half[:, None, :]
+    sides[:, :, 3:6] = _SIDE_TEMPLATE[None, :, 3:6]
+    repeats = sizes / TEXTURE_REPEAT  # (rep_x, rep_y, rep_z)
+    u_repeat = np.where(_SIDE_TEMPLATE[None, :, 8] > 0, repeats[:, None, 2], repeats[:, None, 0])
+    sides[:, :, 6] = _SIDE_TEMPLATE[None, :, 6] * u_repeat
+    sides[:, :, 7] = _SIDE_TEMPLATE[None, :, 7] * repeats[:, None, 1]
+    sides[:, :, 8:12] = colors[:, None, :]
+
+    # Top/bottom faces
+    caps = np.empty((count, CAP_VERTICES, 6), dtype=np.float32)
+    signs = _CAP_TEMPLATE[:, 0:3]
+    caps[:, :, 0:3] = centers[:, None, :] + signs[None, :, :] * half[:, None, :]
+    caps[:, :, 3:6] = _CAP_TEMPLATE[None, :, 3:6]
+
+    return sides.reshape(-1, 12), caps.reshape(-1, 6)
+
+
+def visible_runs(visible):
+    """Convert a per-building visibility mask into (start, length) runs"""
+    padded = np.concatenate(([False], np.asarray(visible, dtype=bool), [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts = edges[0::2]
+    return starts, edges[1::2] - starts
+
+
+class BuildingMesh:
+    """All building faces uploaded once and drawn in two glDrawArrays calls"""
+
+    def __init__(self, buildings):
+        self.building_count = len(buildings)
+        side_data, cap_data = build_building_arrays(buildings)
+        self.side_buffer = VertexBuffer(side_data, ('position', 'normal', 'texcoord', 'color'))
+        self.cap_buffer = VertexBuffer(cap_data, ('position', 'normal'))
+
+        # Axis-aligned bounding boxes in the same order as the vertex data
+        centers, sizes, _ = building_columns(buildings)
+        self.bounds_min = centers - sizes / 2.0
+        self.bounds_max = centers + sizes / 2.0
+
+    def draw(self, texture_id=None, visible=None):
+        """Draw textured side batch, then untextured top/bottom batch
+
+        When a visibility mask is given only the visible buildings are
+        submitted, merged into contiguous runs for glMultiDrawArrays.
+        """
+        if self.building_count == 0:
+            return
+        if visible is not None:
+            starts, lengths = visible_runs(visible)
+            if len(starts) == 0:
+                return
+
+        # Batch 1: textured walls tinted by per-vertex building color
+        if texture_id:
+            glEnable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, texture_id)
+        if visible is None:
+            self.side_buffer.draw(GL_QUADS)
+        else:
+            self.side_buffer.draw_ranges(GL_QUADS, starts * SIDE_VERTICES, lengths * SIDE_VERTICES)
+        glDisable(GL_TEXTURE_2D)
+
+        # Batch 2: roofs and floors (dark gray, no texture)
+        glColor3f(*CAP_COLOR)
+        if visible is None:
+            self.cap_buffer.draw(GL_QUADS)
+        else:
+            self.cap_buffer.draw_ranges(GL_QUADS, starts * CAP_VERTICES, lengths * CAP_VERTICES)
+
+    def delete(self):
+        """Release GPU buffers"""
+        self.side_buffer.delete()
+        self.cap_buffer.delete()
+
+
+class BuildingLOD:
+    """Draws a BuildingMesh with distance LOD: textured -> flat-colored -> merged impostor"""
+
+    def __init__(self, buildings, mesh, distances=BUILDING_LOD_DISTANCES, cell_size=IMPOSTOR_CELL_SIZE):
+        self.mesh = mesh
+        impostors, self.group = merge_impostors(buildings, cell_size)
+        self.impostor_mesh = BuildingMesh(impostors) if impostors else None
+        self.centers = (mesh.bounds_min + mesh.bounds_max) / 2.0
+        self.building_selector = LODSelector(distances[:1])  # 0 textured, 1 flat
+        self.impostor_selector = LODSelector(distances[1:])  # 1 = cell drawn as impostor
+        if self.impostor_mesh is not None:
+            self.impostor_centers = (self.impostor_mesh.bounds_min + self.impostor_mesh.bounds_max) / 2.0
+
+    def draw(self, texture_id, camera_position, planes=None):
+        """Draw all levels, returns (tested, drawn) building counts for culling stats"""
+        mesh = self.mesh
+        if mesh.building_count == 0:
+            return 0, 0
+        camera_position = np.asarray(camera_position, dtype=np.float64)
+        flat = self.building_selector.update(camera_distances(self.centers, camera_position)) == 1
+        far_cells = self.impostor_selector.update(camera_distances(self.impostor_centers, camera_position)) == 1
+        near = ~far_cells[self.group]
+
+        visible = near
+        tested = 0
+        if planes is not None:
+            visible = near & aabb_visible(planes, mesh.bounds_min, mesh.bounds_max)
+            tested = mesh.building_count
+        mesh.draw(texture_id, visible & ~flat)
+        mesh.draw(None, visible & flat)
+
+        # Far cells: one merged box per cell instead of its buildings
+        impostors = far_cells
+        if planes is not None and far_cells.any():
+            impostors = far_cells & aabb_visible(planes, self.impostor_mesh.bounds_min, self.impostor_mesh.bounds_max)
+        self.impostor_mesh.draw(None, impostors)
+        return tested, int(np.count_nonzero(visible)) + int(np.count_nonzero(impostors))
+
+    def delete(self):
+        """Release impostor buffers (the wrapped mesh belongs to the caller)"""
+        if self.impostor_mesh is not None:
+            self.impostor_mesh.delete()
@@ -0,0 +1,125 @@
+# building_table.py - Array-backed building store (no GL)
+#
+# City.buildings is one NumPy structured array instead of a list of dicts.
+# Collision, culling and mesh building read whole columns (table.x,
+# table.width, ...); code that still handles single buildings gets a
+# BuildingRow view that answers row['x'] like the old dicts did.
+import numpy as np
+
+BUILDING_DTYPE = np.dtype([
+    ('x', 'f8'), ('z', 'f8'),
+    ('width', 'f8'), ('height', 'f8'), ('depth', 'f8'),
+    ('color', 'f8', (4,)),
+    ('theme', 'U16'),
+])
+BUILDING_FIELDS = BUILDING_DTYPE.names
+
+
+class BuildingRow:
+    """View of one building in a BuildingTable (dict-style, read-only)"""
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, name):
+        value = self.table.data[name][self.index]
+        return tuple(value.tolist()) if name == 'color' else value.item()
+
+    def get(self, name, default=None):
+        return self[name] if name in BUILDING_FIELDS else default
+
+    def keys(self):
+        return BUILDING_FIELDS
+
+    def as_dict(self):
+        return {name: self[name] for name in BUILDING_FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, BuildingRow):
+            other = other.as_dict()
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"BuildingRow({self.as_dict()})"
+
+
+class BuildingTable:
+    """Buildings as columns of one structured array (BUILDING_DTYPE)"""
+
+    def __init__(self, data=None):
+        """data: BUILDING_DTYPE array (may be a read-only memory map)"""
+        self.data = np.zeros(0, dtype=BUILDING_DTYPE) if data is None else data
+
+    @classmethod
+    def from_columns(cls, x, z, width, height, depth, color, theme):
+        """Table from equally long column arrays (theme may be a single name)"""
+        data = np.empty(len(x), dtype=BUILDING_DTYPE)
+        for name, column in zip(BUILDING_FIELDS, (x, z, width, height, depth, color, theme)):
+            data[name] = column
+        return cls(data)
+
+    @classmethod
+    def concatenate(cls, tables):
+        tables = [table.data for table in tables if len(table)]
+        return cls(np.concatenate(tables) if tables else None)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return (BuildingRow(self, i) for i in range(len(self.data)))
+
+    def __getitem__(self, index):
+        """Row view for an integer, sub-table for a slice, mask or index array"""
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self.data)
+            if not 0 <= index < len(self.data):
+                raise IndexError("building index out of range")
+            return BuildingRow(self, index)
+        return BuildingTable(self.data[index])
+
+    def __eq__(self, other):
+        if isinstance(other, BuildingTable):
+            return bool(np.array_equal(self.data, other.data))
+        if isinstance(other, list):
+            return len(other) == len(self) and all(row == building for row, building in zip(self, other))
+        return NotImplemented
+
+    # Column access
+    @property
+    def x(self):
+        return self.data['x']
+
+    @property
+    def z(self):
+        return self.data['z']
+
+    @property
+    def width(self):
+        return self.data['width']
+
+    @property
+    def height(self):
+        return self.data['height']
+
+    @property
+    def depth(self):
+        return self.data['depth']
+
+    @property
+    def color(self):
+        return self.data['color']
+
+    @property
+    def theme(self):
+        return self.data['theme']
+
+    def footprints(self):
+        """(min_x, min_z, max_x, max_z) column arrays of the building footprints"""
+        half_width, half_depth = self.width / 2.0, self.depth / 2.0
+        return self.x - half_width, self.z - half_depth, self.x + half_width, self.z + half_depth
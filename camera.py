@@ -1,5 +1,6 @@
 # camera.py
 import numpy as np
+from frustum import look_at_matrix
 
 class Camera:
     def __init__(self):
@@ -108,6 +109,13 @@ class Camera:
             self.target_y = car.y + 1.5
             self.target_z = car.z
     
+    def get_view_matrix(self):
+        """View matrix matching the gluLookAt call made with this camera"""
+        return look_at_matrix(
+            (self.x, self.y, self.z),
+            (self.target_x, self.target_y, self.target_z)
+        )
+    
     def move_forward(self):
         if self.mode == 'free':
             self.free_camera_height += 2.0
@@ -0,0 +1,231 @@
+# car_mesh.py - Car model baked into GPU buffers (static body + shared wheel mesh)
+#
+# The body parts never move relative to the car, so they are baked once into
+# one VBO, sorted by material. Only the wheels are drawn per frame, each as a
+# transform (steering, spin) plus one draw of the shared wheel mesh.
+import numpy as np
+from OpenGL.GL import *
+from gl_buffers import VertexBuffer, vbo_supported
+from primitives import cylinder_vertices, disc_vertices
+
+# Draw order; lights get an emission material while drawn
+MATERIALS = ('body', 'glass', 'trim', 'headlights', 'taillights')
+EMISSION = {
+    'headlights': (0.8, 0.8, 0.6, 1.0),
+    'taillights': (0.8, 0.0, 0.0, 1.0),
+}
+NO_EMISSION = (0.0, 0.0, 0.0, 1.0)
+
+TRIM_COLOR = (0.1, 0.1, 0.1, 1.0)
+DOOR_LINE_COLOR = (0.15, 0.15, 0.15, 1.0)
+MIRROR_GLASS_COLOR = (0.8, 0.85, 0.9, 1.0)
+PLATE_COLOR = (1.0, 1.0, 1.0, 1.0)
+PLATE_TEXT_COLOR = (0.0, 0.0, 0.0, 1.0)
+HUB_COLOR = (0.5, 0.5, 0.5, 1.0)
+
+# (x, z, steers) per wheel, relative to the car center
+WHEEL_POSITIONS = ((0.75, 0.9, True), (-0.75, 0.9, True), (0.75, -0.9, False), (-0.75, -0.9, False))
+WHEEL_HEIGHT = 0.3
+
+# Unit box faces as triangles: sign x/y/z, normal x/y/z
+_BOX_FACES = [
+    ((0, 0, 1), [(-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1)]),
+    ((0, 0, -1), [(-1, -1, -1), (-1, 1, -1), (1, 1, -1), (1, -1, -1)]),
+    ((0, 1, 0), [(-1, 1, -1), (-1, 1, 1), (1, 1, 1), (1, 1, -1)]),
+    ((0, -1, 0), [(-1, -1, -1), (1, -1, -1), (1, -1, 1), (-1, -1, 1)]),
+    ((1, 0, 0), [(1, -1, -1), (1, 1, -1), (1, 1, 1), (1, -1, 1)]),
+    ((-1, 0, 0), [(-1, -1, -1), (-1, -1, 1), (-1, 1, 1), (-1, 1, -1)]),
+]
+_BOX_TEMPLATE = np.array([corners[i] + normal for normal, corners in _BOX_FACES
+                          for i in (0, 1, 2, 0, 2, 3)], dtype=np.float32)
+
+
+def box_vertices(center, size, color):
+    """Box as (36, 10) position + normal + color triangle rows"""
+    rows = np.empty((len(_BOX_TEMPLATE), 10), dtype=np.float32)
+    rows[:, 0:3] = _BOX_TEMPLATE[:, 0:3] * (np.asarray(size, dtype=np.float32) / 2.0) + center
+    rows[:, 3:6] = _BOX_TEMPLATE[:, 3:6]
+    rows[:, 6:10] = color
+    return rows
+
+
+def car_parts(car):
+    """Body boxes per material as {material: [(center, size, color), ...]}
+
+    Same layout as the old immediate-mode CarRenderer.render.
+    """
+    body, window = tuple(car.body_color), tuple(car.window_color)
+    return {
+        'body': [
+            ((0, 0.25, 0), (1.6, 0.3, 3.2), body),       # Body bawah (chassis)
+            ((0, 0.7, 0), (1.4, 0.45, 2.4), body),       # Body atas
+            ((0, 1.05, 0), (1.2, 0.1, 1.8), body),       # Atap
+            ((0.85, 0.95, 0.4), (0.06, 0.1, 0.12), body),   # Spion kiri
+            ((-0.85, 0.95, 0.4), (0.06, 0.1, 0.12), body),  # Spion kanan
+        ],
+        'glass': [
+            ((0, 0.95, 0.8), (1.2, 0.25, 0.05), window),    # Kaca depan
+            ((0, 0.95, -0.8), (1.2, 0.25, 0.05), window),   # Kaca belakang
+            ((0.7, 0.95, 0), (0.05, 0.25, 1.0), window),    # Kaca samping kiri
+            ((-0.7, 0.95, 0), (0.05, 0.25, 1.0), window),   # Kaca samping kanan
+            ((0.88, 0.95, 0.4), (0.02, 0.08, 0.08), MIRROR_GLASS_COLOR),   # Kaca spion
+            ((-0.88, 0.95, 0.4), (0.02, 0.08, 0.08), MIRROR_GLASS_COLOR),
+        ],
+        'trim': [
+            ((0, 0.5, 1.45), (0.7, 0.15, 0.05), TRIM_COLOR),   # Grill depan
+            ((0, 0.3, 1.5), (1.4, 0.1, 0.05), TRIM_COLOR),     # Bemper depan
+            ((0, 0.3, -1.5), (1.4, 0.1, 0.05), TRIM_COLOR),    # Bemper belakang
+            ((0, 0.4, -1.52), (0.25, 0.09, 0.05), PLATE_COLOR),       # Plat belakang
+            ((0, 0.4, -1.51), (0.23, 0.07, 0.05), PLATE_TEXT_COLOR),
+        ],
+        'headlights': [
+            ((0.45, 0.5, 1.48), (0.12, 0.12, 0.1), tuple(car.headlight_color)),
+            ((-0.45, 0.5, 1.48), (0.12, 0.12, 0.1), tuple(car.headlight_color)),
+        ],
+        'taillights': [
+            ((0.4, 0.5, -1.48), (0.1, 0.18, 0.1), tuple(car.taillight_color)),
+            ((-0.4, 0.5, -1.48), (0.1, 0.18, 0.1), tuple(car.taillight_color)),
+        ],
+    }
+
+
+def door_line_vertices():
+    """Door seams and handles as GL_LINES rows (position, normal, color)"""
+    segments = [
+        ((0.7, 0.5, 0.3), (0.7, 0.9, 0.3)),      # Garis antara pintu depan dan belakang
+        ((-0.7, 0.5, 0.3), (-0.7, 0.9, 0.3)),
+        ((0.72, 0.65, 0.5), (0.72, 0.65, 0.6)),  # Handle pintu
+        ((-0.72, 0.65, 0.5), (-0.72, 0.65, 0.6)),
+    ]
+    rows = []
+    for start, end in segments:
+        normal = (1.0 if start[0] > 0 else -1.0, 0.0, 0.0)
+        for point in (start, end):
+            rows.append(point + normal + DOOR_LINE_COLOR)
+    return np.array(rows, dtype=np.float32)
+
+
+def with_color(rows, color):
+    colors = np.tile(np.asarray(color, dtype=np.float32), (len(rows), 1))
+    return np.hstack([rows, colors])
+
+
+def wheel_vertices(car, segments=24):
+    """Tyre, rims and hub caps of one wheel (axle along z) as (N, 10) rows"""
+    tyre = np.array(cylinder_vertices(segments))
+    tyre[:, 0:2] *= 0.35
+    tyre[:, 2] *= 0.22
+    parts = [with_color(tyre, car.wheel_color)]
+    hub_segments = max(3, segments * 2 // 3)
+    for radius, z, disc_segments, color in ((0.25, 0.12, segments, car.rim_color),
+                                            (0.08, 0.125, hub_segments, HUB_COLOR)):
+        for facing in (1.0, -1.0):
+            disc = np.array(disc_vertices(disc_segments, facing))
+            disc[:, 0:2] *= radius
+            disc[:, 2] = z * facing
+            parts.append(with_color(disc, color))
+    return np.vstack(parts).astype(np.float32)
+
+
+def build_car_arrays(car):
+    """Bake the body into (vertices, ranges, lines) with ranges[material] = (first, count)"""
+    parts = car_parts(car)
+    chunks = []
+    ranges = {}
+    first = 0
+    for material in MATERIALS:
+        rows = np.vstack([box_vertices(center, size, color) for center, size, color in parts[material]])
+        chunks.append(rows)
+        ranges[material] = (first, len(rows))
+        first += len(rows)
+    return np.vstack(chunks), ranges, door_line_vertices()
+
+
+def car_colors_key(car):
+    """Colors baked into the mesh; a change triggers a rebuild"""
+    return tuple(tuple(c) for c in (car.body_color, car.window_color, car.headlight_color,
+                                     car.taillight_color, car.wheel_color, car.rim_color))
+
+
+class CarMesh:
+    """GPU-resident car model: body by material, door lines and one wheel mesh
+
+    draw() costs a few draw calls per car regardless of part count.
+    """
+
+    LAYOUT = ('position', 'normal', 'color')
+
+    def __init__(self, car, wheel_segments=24):
+        """wheel_segments: tyre tessellation (wheels are most of the vertex count)"""
+        self.colors_key = car_colors_key(car)
+        body, self.ranges, lines = build_car_arrays(car)
+        # Non-emissive materials are contiguous: body, glass and trim in one range
+        self.opaque_first = self.ranges['body'][0]
+        self.opaque_count = sum(self.ranges['trim']) - self.opaque_first
+        wheel = wheel_vertices(car, wheel_segments)
+        self.line_count = len(lines)
+        self.wheel_count = len(wheel)
+        # Body, lines and wheel share one buffer: [body | lines | wheel]
+        self.line_first = len(body)
+        self.wheel_first = len(body) + len(lines)
+        self.vertices = np.vstack([body, lines, wheel])
+        self.buffer = VertexBuffer(self.vertices, self.LAYOUT) if vbo_supported() else None
+
+    def bind(self):
+        if self.buffer is not None:
+            self.buffer.bind()
+        else:
+            # Client-side arrays (no buffer objects)
+            stride = self.vertices.strides[0]
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(3, GL_FLOAT, stride, self.vertices)
+            glNormalPointer(GL_FLOAT, stride, self.vertices[:, 3:])
+            glColorPointer(4, GL_FLOAT, stride, self.vertices[:, 6:])
+
+    def unbind(self):
+        if self.buffer is not None:
+            self.buffer.unbind()
+        else:
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_NORMAL_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+
+    def draw(self, x, y, z, direction, wheel_angle=0.0, wheel_rotation=0.0):
+        """Draw one car at (x, y, z) facing `direction` degrees"""
+        glPushMatrix()
+        glTranslatef(x, y, z)
+        glRotatef(direction, 0, 1, 0)
+        self.bind()
+
+        # One draw for body, glass and trim
+        glDrawArrays(GL_TRIANGLES, self.opaque_first, self.opaque_count)
+
+        for material in ('headlights', 'taillights'):
+            glMaterialfv(GL_FRONT, GL_EMISSION, EMISSION[material])
+            glDrawArrays(GL_TRIANGLES, *self.ranges[material])
+        glMaterialfv(GL_FRONT, GL_EMISSION, NO_EMISSION)
+
+        glLineWidth(2.0)
+        glDrawArrays(GL_LINES, self.line_first, self.line_count)
+        glLineWidth(1.0)
+
+        # Wheels: only steering and spin change per frame
+        for wheel_x, wheel_z, steers in WHEEL_POSITIONS:
+            glPushMatrix()
+            glTranslatef(wheel_x, WHEEL_HEIGHT, wheel_z)
+            if steers:
+                glRotatef(wheel_angle, 0, 1, 0)  # Roda depan bisa berbelok
+            glRotatef(90, 0, 1, 0)  # Axle along the car's x axis
+            glRotatef(wheel_rotation, 0, 0, 1)
+            glDrawArrays(GL_TRIANGLES, self.wheel_first, self.wheel_count)
+            glPopMatrix()
+
+        self.unbind()
+        glPopMatrix()
+
+    def delete(self):
+        if self.buffer is not None:
+            self.buffer.delete()
+            self.buffer = None
@@ -0,0 +1,31 @@
+# car_renderer.py - OpenGL front-end for Car (body, lights, wheels)
+from renderer import Renderer
+from car_mesh import CarMesh, car_colors_key
+
+class CarRenderer(Renderer):
+    def __init__(self, car):
+        self.car = car
+        self.mesh = None  # CarMesh, built after the GL context exists
+    
+    def setup_gl_resources(self):
+        """Bake the car model into GPU buffers"""
+        self.mesh = CarMesh(self.car)
+        print(f"   🚗 Car mesh baked: {len(self.mesh.vertices)} vertices")
+    
+    def render(self, alpha=1.0, pose=None):
+        """alpha: blend between the last two simulation steps (see Car.pose)
+        pose: draw this Pose instead (e.g. from a simulation-thread snapshot)"""
+        car = self.car
+        if self.mesh is None or self.mesh.colors_key != car_colors_key(car):
+            if self.mesh is not None:
+                self.mesh.delete()
+            self.mesh = CarMesh(car)
+        if pose is None:
+            pose = car.pose(alpha)
+        self.mesh.draw(pose.x, pose.y, pose.z, pose.direction, pose.wheel_angle, pose.wheel_rotation)
+    
+    def cleanup(self):
+        """Release the car mesh buffer"""
+        if self.mesh is not None:
+            self.mesh.delete()
+            self.mesh = None
@@ -0,0 +1,157 @@
+# chunks.py - World streaming in fixed-size chunks (no GL)
+#
+# The world is split into square chunks keyed by (chunk_x, chunk_z). Chunks
+# around the viewer are generated on a background thread, kept in an LRU
+# cache and evicted once the cache exceeds its budget. The GL side uploads
+# loaded chunks lazily (see CityRenderer).
+import math
+import queue
+import threading
+from collections import OrderedDict
+
+
+class Chunk:
+    """Generated content of one chunk"""
+    __slots__ = ('key', 'bounds', 'buildings', 'street_lights')
+
+    def __init__(self, key, bounds, buildings, street_lights):
+        self.key = key
+        self.bounds = bounds              # (min_x, min_z, max_x, max_z)
+        self.buildings = buildings        # BuildingTable, same format as City.buildings
+        self.street_lights = street_lights  # (N, 2) lamp ground positions
+
+
+class ChunkStreamer:
+    def __init__(self, generate_chunk, chunk_size=90.0, view_distance=2, max_chunks=None, background=True):
+        """generate_chunk(key, bounds) -> Chunk, called on the worker thread
+
+        view_distance: chunks kept loaded in each direction around the viewer
+        max_chunks: LRU budget, defaults to twice the view area
+        """
+        self.generate_chunk = generate_chunk
+        self.chunk_size = float(chunk_size)
+        self.view_distance = view_distance
+        view_area = (2 * view_distance + 1) ** 2
+        self.max_chunks = max(view_area, max_chunks or 2 * view_area)
+        self.background = background
+
+        self.chunks = OrderedDict()  # key -> Chunk, least recently wanted first
+        self.pending = set()         # Keys queued on the worker
+        self.failed = set()          # Keys whose generation raised, not retried while still wanted
+        self.version = 0             # Bumped whenever the loaded chunk set changes
+        self.center_key = (0, 0)     # Chunk of the last update() position
+
+        self._wanted = frozenset()  # Snapshot read by the worker to skip stale requests
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = None
+
+    def chunk_key(self, x, z):
+        size = self.chunk_size
+        return (math.floor(x / size), math.floor(z / size))
+
+    def chunk_bounds(self, key):
+        size = self.chunk_size
+        return (key[0] * size, key[1] * size, (key[0] + 1) * size, (key[1] + 1) * size)
+
+    def wanted_keys(self, x, z):
+        """Chunks within view distance, nearest first"""
+        cx, cz = self.chunk_key(x, z)
+        r = self.view_distance
+        keys = [(cx + dx, cz + dz) for dx in range(-r, r + 1) for dz in range(-r, r + 1)]
+        keys.sort(key=lambda k: (k[0] - cx) ** 2 + (k[1] - cz) ** 2)
+        return keys
+
+    def _start_worker(self):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work, name="chunk-worker", daemon=True)
+            self._worker.start()
+
+    def _work(self):
+        while True:
+            key = self._requests.get()
+            if key is None:
+                break
+            if key not in self._wanted:
+                self._results.put((key, None, False))  # Viewer moved on before we got here
+                continue
+            try:
+                chunk = self.generate_chunk(key, self.chunk_bounds(key))
+            except Exception as e:
+                print(f"⚠️  Chunk {key} generation failed: {e}")
+                self._results.put((key, None, True))
+                continue
+            self._results.put((key, chunk, False))
+
+    def _install(self, key, chunk, failed=False):
+        self.pending.discard(key)
+        if failed:
+            self.failed.add(key)
+        if chunk is not None:
+            self.chunks[key] = chunk
+            return True
+        return False
+
+    def update(self, x, z):
+        """Request missing chunks around (x, z), collect finished ones, evict by LRU
+
+        Never blocks when running in background mode. Returns True when the
+        loaded chunk set changed.
+        """
+        changed = False
+
+        # Collect everything the worker finished since the last call
+        while True:
+            try:
+                key, chunk, failed = self._results.get_nowait()
+            except queue.Empty:
+                break
+            changed |= self._install(key, chunk, failed)
+
+        self.center_key = self.chunk_key(x, z)
+        wanted = self.wanted_keys(x, z)
+        self._wanted = frozenset(wanted)
+        # A failed chunk is retried only after it left the view and comes back
+        self.failed &= self._wanted
+        for key in wanted:
+            if key in self.chunks:
+                self.chunks.move_to_end(key)  # Mark as recently used
+            elif key not in self.pending and key not in self.failed:
+                if self.background:
+                    self._start_worker()
+                    self.pending.add(key)
+                    self._requests.put(key)
+                else:
+                    changed |= self._install(key, self.generate_chunk(key, self.chunk_bounds(key)))
+
+        # Evict least recently used chunks beyond the budget (never a wanted one)
+        while len(self.chunks) > self.max_chunks:
+            oldest = next(iter(self.chunks))
+            if oldest in self._wanted:
+                break
+            del self.chunks[oldest]
+            changed = True
+
+        if changed:
+            self.version += 1
+        return changed
+
+    def load_now(self, x, z, radius=1):
+        """Synchronously generate the chunks closest to (x, z) (startup, teleports)"""
+        cx, cz = self.chunk_key(x, z)
+        changed = False
+        for dx in range(-radius, radius + 1):
+            for dz in range(-radius, radius + 1):
+                key = (cx + dx, cz + dz)
+                if key not in self.chunks and key not in self.pending and key not in self.failed:
+                    changed |= self._install(key, self.generate_chunk(key, self.chunk_bounds(key)))
+        if changed:
+            self.version += 1
+        return changed
+
+    def stop(self):
+        """Stop the background worker"""
+        if self._worker is not None:
+            self._requests.put(None)
+            self._worker.join(timeout=1.0)
+            self._worker = None
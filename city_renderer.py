@@ -0,0 +1,706 @@
+# city_renderer.py - OpenGL front-end for City (buildings, sky, street lights)
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+import pygame
+import os
+from renderer import Renderer
+from building_mesh import BuildingMesh, BuildingLOD
+from gl_buffers import vbo_supported
+from frustum import extract_planes, aabb_visible
+from lod import LODSelector, LAMP_LOD_DISTANCES, camera_distances
+from street_lights import InstancedStreetLights
+from instancing import instancing_supported
+from primitives import draw_sphere
+from sky_renderer import SkyRenderer
+
+LAMP_HEAD_HEIGHT = 4.0
+HALO_RADIUS = 3.0  # Same as the large halo sphere of the full lamp mesh
+
+
+def make_halo_image(size=64):
+    """RGBA halo for lamp billboards: bulb, bright halo, faint halo (as in draw_single_street_light)"""
+    coords = (np.arange(size) + 0.5) / size * 2.0 - 1.0
+    r = np.sqrt(coords[None, :] ** 2 + coords[:, None] ** 2)  # 1.0 = HALO_RADIUS
+    soft = lambda t: np.clip(t * 20.0, 0.0, 1.0)
+    bulb = soft(0.5 / HALO_RADIUS - r)
+    alpha = 0.1 * soft(1.0 - r) + 0.27 * soft(1.5 / HALO_RADIUS - r) + 0.63 * bulb
+    image = np.empty((size, size, 4), dtype=np.float32)
+    image[..., 0] = 1.0
+    image[..., 1] = 1.0
+    image[..., 2] = 0.5 * (1.0 - bulb)  # Bulb is pure yellow
+    image[..., 3] = alpha
+    return (image * 255).astype(np.uint8)
+
+
+class ChunkGeometry:
+    """GPU-side state of one streamed chunk"""
+    __slots__ = ('geometry', 'lod', 'box_min', 'box_max', 'street_lights', 'lamp_lod')
+
+    def __init__(self, geometry, lod, box_min, box_max, street_lights):
+        self.geometry = geometry            # BuildingMesh, display list id or None
+        self.lod = lod                      # BuildingLOD for BuildingMesh geometry
+        self.box_min = box_min
+        self.box_max = box_max
+        self.street_lights = street_lights  # (N, 2)
+        self.lamp_lod = LODSelector(LAMP_LOD_DISTANCES)
+
+class CityRenderer(Renderer):
+    def __init__(self, city, baked_sky=False):
+        """baked_sky: draw stars and moon from a cubemap baked once (see SkyRenderer)"""
+        self.city = city
+        self.sky = SkyRenderer(city, baked_sky)
+        self.city_display_list = None  # GPU-compiled geometry (fallback path)
+        self.building_mesh = None  # Batched VBO geometry for all buildings
+        self.building_lod = None  # Distance LOD over building_mesh
+        self.street_lights_display_list = None  # GPU-compiled street lights
+        
+        # Chunk streaming: geometry per loaded chunk, uploaded a few chunks per frame
+        self.chunk_geometry = {}  # chunk key -> ChunkGeometry
+        self.chunk_uploads_per_frame = 2
+        
+        # Street light LOD: full mesh (single compiled lamp) -> billboard halo -> point
+        self.street_light_unit_list = None  # Fixed-function fallback without instancing
+        self.street_light_instancer = None  # Instanced lamp mesh (GLSL)
+        self.street_light_positions = None  # (N, 2), non-streamed cities
+        self.lamp_lod = LODSelector(LAMP_LOD_DISTANCES)
+        self.halo_texture_id = None
+        
+        # Per-frame frustum culling counters (shown in debug output)
+        self.culling_stats = {'tested': 0, 'drawn': 0}
+        
+        # Load textures (Deferred to setup_gl_resources)
+        self.texture_id = None
+        
+    def setup_gl_resources(self):
+        """Initialize OpenGL resources after context creation"""
+        self.texture_id = self.load_texture("assets/building_texture.png")
+        self.halo_texture_id = self.create_halo_texture()
+        self.sky.setup_gl_resources()
+        if instancing_supported():
+            try:
+                self.street_light_instancer = InstancedStreetLights()
+                print("   💡 Street lights use instanced rendering")
+            except Exception as e:
+                print(f"⚠️ Street light instancing unavailable ({e}), using display lists")
+                self.street_light_instancer = None
+        print("   ✅ City GL resources loaded")
+
+    def load_texture(self, filename):
+        """Load texture from file"""
+        try:
+            if not os.path.exists(filename):
+                print(f"⚠️ Texture not found: {filename}")
+                return None
+                
+            texture_surface = pygame.image.load(filename)
+            texture_data = pygame.image.tostring(texture_surface, "RGB", 1)
+            width = texture_surface.get_width()
+            height = texture_surface.get_height()
+            
+            tex_id = glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D, tex_id)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+            
+            gluBuild2DMipmaps(GL_TEXTURE_2D, GL_RGB, width, height, GL_RGB, GL_UNSIGNED_BYTE, texture_data)
+            return tex_id
+        except Exception as e:
+            print(f"Error loading texture {filename}: {e}")
+            return None
+    
+    def create_halo_texture(self):
+        """Upload the lamp billboard halo texture"""
+        image = make_halo_image()
+        tex_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, image.shape[1], image.shape[0], 0,
+                     GL_RGBA, GL_UNSIGNED_BYTE, image)
+        return tex_id
+    
+    def draw_textured_cube(self, width, height, depth):
+        """Draw cube with texture coordinates"""
+        w = width / 2
+        h = height / 2
+        d = depth / 2
+        
+        # Calculate repetitions based on size (approx 5 units per repeat)
+        rep_x = width / 5.0
+        rep_y = height / 5.0
+        rep_z = depth / 5.0
+        
+        # OPTIMIZATION: Assume texture already bound by caller
+        # Removed: glEnable(GL_TEXTURE_2D) and glBindTexture() - now done once outside loop
+            
+        # Modulate texture with the tint color set by caller (draw_building)
+        
+        glBegin(GL_QUADS)
+        
+        # Front
+        glNormal3f(0, 0, 1)
+        glTexCoord2f(0, 0); glVertex3f(-w, -h, d)
+        glTexCoord2f(rep_x, 0); glVertex3f(w, -h, d)
+        glTexCoord2f(rep_x, rep_y); glVertex3f(w, h, d)
+        glTexCoord2f(0, rep_y); glVertex3f(-w, h, d)
+        
+        # Back
+        glNormal3f(0, 0, -1)
+        glTexCoord2f(0, 0); glVertex3f(w, -h, -d)
+        glTexCoord2f(rep_x, 0); glVertex3f(-w, -h, -d)
+        glTexCoord2f(rep_x, rep_y); glVertex3f(-w, h, -d)
+        glTexCoord2f(0, rep_y); glVertex3f(w, h, -d)
+        
+        # Right
+        glNormal3f(1, 0, 0)
+        glTexCoord2f(0, 0); glVertex3f(w, -h, d)
+        glTexCoord2f(rep_z, 0); glVertex3f(w, -h, -d)
+        glTexCoord2f(rep_z, rep_y); glVertex3f(w, h, -d)
+        glTexCoord2f(0, rep_y); glVertex3f(w, h, d)
+        
+        # Left
+        glNormal3f(-1, 0, 0)
+        glTexCoord2f(0, 0); glVertex3f(-w, -h, -d)
+        glTexCoord2f(rep_z, 0); glVertex3f(-w, -h, d)
+        glTexCoord2f(rep_z, rep_y); glVertex3f(-w, h, d)
+        glTexCoord2f(0, rep_y); glVertex3f(-w, h, -d)
+        
+        glEnd()
+        
+        # Draw Top/Bottom without texture (just dark gray)
+        glDisable(GL_TEXTURE_2D)  # Temporarily disable for non-textured surfaces
+        glColor3f(0.2, 0.2, 0.2)
+        glBegin(GL_QUADS)
+        # Top
+        glNormal3f(0, 1, 0)
+        glVertex3f(-w, h, -d); glVertex3f(-w, h, d)
+        glVertex3f(w, h, d); glVertex3f(w, h, -d)
+        # Bottom
+        glNormal3f(0, -1, 0)
+        glVertex3f(-w, -h, -d); glVertex3f(w, -h, -d)
+        glVertex3f(w, -h, d); glVertex3f(-w, -h, d)
+        glEnd()
+        
+        # Re-enable texture for next building
+        glEnable(GL_TEXTURE_2D)
+    
+    def draw_building(self, building):
+        glPushMatrix()
+        glTranslatef(building['x'], building['height']/2, building['z'])
+        
+        # Use tint color for texture
+        glColor4fv(building['color'])
+        
+        # Use textured cube for building body
+        self.draw_textured_cube(building['width'], building['height'], building['depth'])
+        
+        # Jendela-jendela (sederhana) - Optional now that we have textures, but keeping for extra detail
+        # self.draw_windows(building) # Disabling windows to let texture shine and save perf
+        
+        glPopMatrix()
+    
+    def draw_windows(self, building):
+        # Window settings
+        win_size = 0.6  
+        win_depth = 0.1
+        
+        # Iterate over 2 sides only: 0=Front, 2=Back
+        for side in [0, 2]:
+            glPushMatrix()
+            
+            # Rotate to the correct side
+            glRotatef(side * 90, 0, 1, 0)
+            
+            # Determine face dimensions based on side
+            # 0 & 2 (Front/Back) use width for horizontal spacing, depth for distance
+            if side % 2 == 0:
+                face_width = building['width']
+                face_dist = building['depth'] / 2.0
+            else:
+                face_width = building['depth']
+                face_dist = building['width'] / 2.0
+            
+            # Simple grid: 2 columns, N rows depending on height
+            cols = 2
+            rows = max(2, int(building['height'] / 2.5))
+            
+            for i in range(rows):
+                for j in range(cols):
+                    glPushMatrix()
+                    
+                    # Position on face
+                    # Spread columns across face_width
+                    # (j - 0.5) centers 2 columns. For more cols physics is different.
+                    x_pos = (j - 0.5) * (face_width * 0.5) 
+                    
+                    # Spread rows along height
+                    # Start from bottomish? 
+                    y_pos = (i - rows/2 + 0.5) * (building['height'] / rows) * 0.8
+                    
+                    # Translate to face surface
+                    glTranslatef(x_pos, y_pos, face_dist + 0.05)
+                    
+                    # Scale window (Enlarged)
+                    glScalef(win_size, win_size, win_depth)
+                    
+                    # Random "lights on" effect
+                    # Hash includes side to vary pattern per side
+                    import hashlib
+                    win_hash = int(hashlib.md5(f"{building['x']}{building['z']}{side}{i}{j}".encode()).hexdigest(), 16)
+                    
+                    if win_hash % 3 == 0:
+                        glMaterialfv(GL_FRONT, GL_EMISSION, [0.6, 0.6, 0.4, 1.0])
+                        glColor3f(1.0, 1.0, 0.6) # Brighter yellow
+                    else:
+                        glColor3f(0.1, 0.1, 0.2) # Dark window
+                        glMaterialfv(GL_FRONT, GL_EMISSION, [0.0, 0.0, 0.0, 1.0])
+                    
+                    self.draw_cube(1, 1, 1)
+                    
+                    # Reset emission
+                    glMaterialfv(GL_FRONT, GL_EMISSION, [0.0, 0.0, 0.0, 1.0])
+                    glPopMatrix()
+            
+            glPopMatrix()
+    
+    def draw_sphere(self, radius):
+        """Sphere from the shared unit mesh (primitives.py)"""
+        draw_sphere(radius)
+
+    def compile_static_geometry(self):
+        """Upload all static building geometry to the GPU (VBO batch, display list fallback)"""
+        self.release_building_geometry()
+        
+        # Near lamps replay one compiled lamp (LOD level 0)
+        self.compile_street_light_unit()
+        if self.city.streamer is not None:
+            # Buildings arrive chunk by chunk (sync_chunks)
+            return
+        
+        if vbo_supported():
+            try:
+                self.building_mesh = BuildingMesh(self.city.buildings)
+                self.building_lod = BuildingLOD(self.city.buildings, self.building_mesh)
+                print(f"   ⚡ Building VBO uploaded: {len(self.city.buildings)} buildings in 2 draw calls")
+            except Exception as e:
+                print(f"⚠️ VBO upload failed ({e}), falling back to display list")
+                self.building_mesh = None
+        
+        if self.building_mesh is None:
+            self.compile_building_display_list()
+        
+        # Also compile street lights to GPU for performance
+        self.compile_street_lights()
+        self.street_light_positions = np.array(self.city.get_street_light_positions(), dtype=np.float64).reshape(-1, 2)
+    
+    def compile_building_display_list(self):
+        """Compile all building geometry into a GPU display list (fallback path)"""
+        self.city_display_list = glGenLists(1)
+        glNewList(self.city_display_list, GL_COMPILE)
+        
+        # OPTIMIZATION: Set texture state ONCE before recording all buildings
+        # This eliminates ~1000+ redundant state changes per frame
+        glEnable(GL_TEXTURE_2D)
+        if self.texture_id:
+            glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        
+        # Record all building drawing commands (texture already bound)
+        for building in self.city.buildings:
+            self.draw_building(building)
+        
+        # Clean up texture state
+        glDisable(GL_TEXTURE_2D)
+        
+        glEndList()
+        print(f"   ⚡ GPU display list compiled: {len(self.city.buildings)} buildings optimized")
+        print(f"   🎨 Texture state optimized: 1 bind vs {len(self.city.buildings)} previous redundant binds")
+    
+    def release_building_geometry(self):
+        """Delete compiled building geometry (VBO or display list)"""
+        if self.building_lod is not None:
+            self.building_lod.delete()
+            self.building_lod = None
+        if self.building_mesh is not None:
+            self.building_mesh.delete()
+            self.building_mesh = None
+        if self.city_display_list is not None:
+            glDeleteLists(self.city_display_list, 1)
+            self.city_display_list = None
+    
+    def compile_street_lights(self):
+        """Compile street lights into a GPU display list for performance"""
+        if self.street_lights_display_list is not None:
+            glDeleteLists(self.street_lights_display_list, 1)
+        
+        self.street_lights_display_list = glGenLists(1)
+        glNewList(self.street_lights_display_list, GL_COMPILE)
+        self.draw_street_lights()
+        glEndList()
+        print(f"   💡 Street lights compiled to GPU display list")
+    
+    def compile_street_light_unit(self):
+        """Compile a single street light at the origin (near LOD level, streamed cities)"""
+        if self.street_light_unit_list is not None:
+            glDeleteLists(self.street_light_unit_list, 1)
+        self.street_light_unit_list = glGenLists(1)
+        glNewList(self.street_light_unit_list, GL_COMPILE)
+        self.draw_single_street_light()
+        glEndList()
+        print("   💡 Street light LOD mesh compiled")
+    
+    def compile_chunk_geometry(self, chunk):
+        """Upload one chunk's buildings, returns its ChunkGeometry"""
+        min_x, min_z, max_x, max_z = chunk.bounds
+        top = max(chunk.buildings.height.max(initial=0.0), 8.0)  # Lamps are 8 units tall
+        box_min = np.array([[min_x, 0.0, min_z]], dtype=np.float32)
+        box_max = np.array([[max_x, top, max_z]], dtype=np.float32)
+        
+        lod = None
+        if len(chunk.buildings) == 0:
+            geometry = None
+        elif vbo_supported():
+            geometry = BuildingMesh(chunk.buildings)
+            lod = BuildingLOD(chunk.buildings, geometry)
+        else:
+            geometry = glGenLists(1)
+            glNewList(geometry, GL_COMPILE)
+            glEnable(GL_TEXTURE_2D)
+            if self.texture_id:
+                glBindTexture(GL_TEXTURE_2D, self.texture_id)
+            for building in chunk.buildings:
+                self.draw_building(building)
+            glDisable(GL_TEXTURE_2D)
+            glEndList()
+        return ChunkGeometry(geometry, lod, box_min, box_max, chunk.street_lights)
+    
+    def delete_chunk_geometry(self, chunk_geometry):
+        geometry = chunk_geometry.geometry
+        if chunk_geometry.lod is not None:
+            chunk_geometry.lod.delete()
+        if isinstance(geometry, BuildingMesh):
+            geometry.delete()
+        elif geometry is not None:
+            glDeleteLists(geometry, 1)
+    
+    def sync_chunks(self):
+        """Drop geometry of evicted chunks, upload at most chunk_uploads_per_frame new ones"""
+        streamer = self.city.streamer
+        loaded = streamer.chunks
+        for key in [k for k in self.chunk_geometry if k not in loaded]:
+            self.delete_chunk_geometry(self.chunk_geometry.pop(key))
+        
+        missing = [key for key in loaded if key not in self.chunk_geometry]
+        if not missing:
+            return
+        cx, cz = streamer.center_key
+        missing.sort(key=lambda k: (k[0] - cx) ** 2 + (k[1] - cz) ** 2)  # Nearest first
+        for key in missing[:self.chunk_uploads_per_frame]:
+            self.chunk_geometry[key] = self.compile_chunk_geometry(loaded[key])
+    
+    def render_chunks(self, view_projection=None, camera_position=None):
+        """Draw uploaded chunks (buildings + street lights), culled per chunk and per building"""
+        self.sync_chunks()
+        planes = extract_planes(view_projection) if view_projection is not None else None
+        tested = drawn = 0
+        lamp_positions, lamp_levels = [], []
+        
+        for key, chunk in self.chunk_geometry.items():
+            if planes is not None and not aabb_visible(planes, chunk.box_min, chunk.box_max)[0]:
+                continue
+            geometry = chunk.geometry
+            if chunk.lod is not None and camera_position is not None:
+                chunk_tested, chunk_drawn = chunk.lod.draw(self.texture_id, camera_position, planes)
+                tested += chunk_tested
+                drawn += chunk_drawn
+            elif isinstance(geometry, BuildingMesh):
+                visible = None
+                if planes is not None:
+                    visible = aabb_visible(planes, geometry.bounds_min, geometry.bounds_max)
+                    tested += geometry.building_count
+                    drawn += int(np.count_nonzero(visible))
+                else:
+                    drawn += geometry.building_count
+                geometry.draw(self.texture_id, visible)
+            elif geometry is not None:
+                drawn += len(self.city.streamer.chunks[key].buildings)
+                glCallList(geometry)
+            
+            if len(chunk.street_lights):
+                lamp_positions.append(chunk.street_lights)
+                if camera_position is not None:
+                    lamp_levels.append(chunk.lamp_lod.update(self.lamp_distances(chunk.street_lights, camera_position)))
+        self.culling_stats['tested'] = tested
+        self.culling_stats['drawn'] = drawn
+        
+        # Street lights of visible chunks
+        if lamp_positions:
+            positions = np.concatenate(lamp_positions)
+            levels = np.concatenate(lamp_levels) if lamp_levels else np.zeros(len(positions), dtype=np.int8)
+            self.draw_street_lights_lod(positions, levels)
+    
+    def lamp_distances(self, positions, camera_position):
+        heads = np.column_stack([positions[:, 0], np.full(len(positions), LAMP_HEAD_HEIGHT), positions[:, 1]])
+        return camera_distances(heads, camera_position)
+    
+    def draw_street_lights_lod(self, positions, levels):
+        """Full lamp mesh near the camera, billboard halos further out, points far away"""
+        near = positions[levels == 0]
+        if self.street_light_instancer is not None:
+            self.street_light_instancer.draw(near)
+        else:
+            if self.street_light_unit_list is None:
+                self.compile_street_light_unit()
+            glColor3f(0.3, 0.3, 0.3)
+            for x, z in near.tolist():
+                glPushMatrix()
+                glTranslatef(x, 0, z)
+                glCallList(self.street_light_unit_list)
+                glPopMatrix()
+        
+        billboards = positions[levels == 1]
+        points = positions[levels == 2]
+        if len(billboards) == 0 and len(points) == 0:
+            return
+        
+        glDisable(GL_LIGHTING)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        if len(billboards):
+            self.draw_lamp_billboards(billboards)
+        if len(points):
+            # Single bright point per lamp head
+            heads = np.column_stack([points[:, 0], np.full(len(points), LAMP_HEAD_HEIGHT), points[:, 1]])
+            heads = heads.astype(np.float32)
+            glPointSize(3.0)
+            glColor3f(1.0, 1.0, 0.6)
+            glVertexPointer(3, GL_FLOAT, 0, heads)
+            glDrawArrays(GL_POINTS, 0, len(heads))
+            glPointSize(1.0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glEnable(GL_LIGHTING)
+    
+    def draw_lamp_billboards(self, positions):
+        """Pole as a line plus a camera-facing halo quad per lamp (vertex array already enabled)"""
+        count = len(positions)
+        heads = np.column_stack([positions[:, 0], np.full(count, LAMP_HEAD_HEIGHT), positions[:, 1]])
+        
+        # Poles
+        poles = np.empty((count, 2, 3), dtype=np.float32)
+        poles[:, 0] = heads
+        poles[:, 0, 1] = 0.0
+        poles[:, 1] = heads
+        glColor3f(0.3, 0.3, 0.3)
+        glLineWidth(2.0)
+        glVertexPointer(3, GL_FLOAT, 0, poles.reshape(-1, 3))
+        glDrawArrays(GL_LINES, 0, count * 2)
+        glLineWidth(1.0)
+        
+        # Halo quads spanned by the camera right/up vectors (rows of the modelview rotation)
+        modelview = np.asarray(glGetFloatv(GL_MODELVIEW_MATRIX), dtype=np.float64).reshape(4, 4)
+        right = modelview[:3, 0] * HALO_RADIUS
+        up = modelview[:3, 1] * HALO_RADIUS
+        corners = np.array([-right - up, right - up, right + up, -right + up])
+        quads = (heads[:, None, :] + corners[None, :, :]).astype(np.float32).reshape(-1, 3)
+        texcoords = np.tile(np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=np.float32), (count, 1))
+        
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self.halo_texture_id)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glDepthMask(GL_FALSE)  # Don't write to depth buffer for transparent glow
+        glColor4f(1.0, 1.0, 1.0, 1.0)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, quads)
+        glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+        glDrawArrays(GL_QUADS, 0, count * 4)
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDepthMask(GL_TRUE)
+        glDisable(GL_BLEND)
+        glDisable(GL_TEXTURE_2D)
+    
+    def release_chunk_geometry(self):
+        for chunk_geometry in self.chunk_geometry.values():
+            self.delete_chunk_geometry(chunk_geometry)
+        self.chunk_geometry = {}
+    
+    def cull_buildings(self, view_projection):
+        """Test building AABBs against the view frustum, returns visibility mask"""
+        mesh = self.building_mesh
+        planes = extract_planes(view_projection)
+        visible = aabb_visible(planes, mesh.bounds_min, mesh.bounds_max)
+        self.culling_stats['tested'] = mesh.building_count
+        self.culling_stats['drawn'] = int(np.count_nonzero(visible))
+        return visible
+    
+    def render(self, view_projection=None, camera_position=None):
+        """Render all city elements using GPU-accelerated geometry
+        
+        view_projection: optional 4x4 clip matrix used for frustum culling
+        camera_position: optional (x, y, z) enabling distance LOD for buildings and lamps
+        """
+        # Draw stars and sky first (background)
+        self.draw_sky(camera_position)
+        
+        if self.city.streamer is not None:
+            self.render_chunks(view_projection, camera_position)
+            return
+        
+        # Draw all buildings: batched VBO first, compiled display list as fallback
+        if self.building_lod is not None and camera_position is not None:
+            planes = extract_planes(view_projection) if view_projection is not None else None
+            tested, drawn = self.building_lod.draw(self.texture_id, camera_position, planes)
+            self.culling_stats['tested'] = tested
+            self.culling_stats['drawn'] = drawn
+        elif self.building_mesh is not None:
+            visible = None
+            if view_projection is not None:
+                visible = self.cull_buildings(view_projection)
+            else:
+                self.culling_stats['tested'] = 0
+                self.culling_stats['drawn'] = self.building_mesh.building_count
+            self.building_mesh.draw(self.texture_id, visible)
+        elif self.city_display_list is not None:
+            # Display list cannot be partially submitted - no culling
+            self.culling_stats['tested'] = 0
+            self.culling_stats['drawn'] = len(self.city.buildings)
+            glCallList(self.city_display_list)
+        else:
+            # Fallback to immediate mode if display list not compiled
+            for building in self.city.buildings:
+                self.draw_building(building)
+        
+        # Street lights: per-lamp LOD when the camera is known, else the compiled display list
+        if camera_position is not None and self.street_light_positions is not None:
+            positions = self.street_light_positions
+            levels = self.lamp_lod.update(self.lamp_distances(positions, camera_position))
+            self.draw_street_lights_lod(positions, levels)
+        elif self.street_lights_display_list is not None:
+            glCallList(self.street_lights_display_list)
+        else:
+            # Fallback to immediate mode
+            self.draw_street_lights()
+    
+    def cleanup(self):
+        """Clean up GPU resources (building buffers, display lists)"""
+        if self.building_mesh is not None or self.city_display_list is not None:
+            self.release_building_geometry()
+            print("🧹 City building geometry cleaned up")
+        
+        if self.street_lights_display_list is not None:
+            glDeleteLists(self.street_lights_display_list, 1)
+            self.street_lights_display_list = None
+            print("💡 Street lights display list cleaned up")
+        
+        if self.chunk_geometry:
+            self.release_chunk_geometry()
+            print("🧹 Streamed chunk geometry cleaned up")
+        
+        if self.street_light_unit_list is not None:
+            glDeleteLists(self.street_light_unit_list, 1)
+            self.street_light_unit_list = None
+        if self.street_light_instancer is not None:
+            self.street_light_instancer.delete()
+            self.street_light_instancer = None
+        
+        if self.halo_texture_id is not None:
+            glDeleteTextures([self.halo_texture_id])
+            self.halo_texture_id = None
+        
+        self.sky.cleanup()
+
+    def draw_sky(self, camera_position=None):
+        """Draw stars and moon"""
+        self.sky.render(camera_position)
+
+    def draw_street_lights(self):
+        """Draw street lights along roads (positions from City.get_street_light_positions)"""
+        glColor3f(0.3, 0.3, 0.3)
+        
+        for x, z in self.city.get_street_light_positions():
+            glPushMatrix()
+            glTranslatef(x, 0, z)
+            self.draw_single_street_light()
+            glPopMatrix()
+    
+    def draw_single_street_light(self):
+        # Tiang
+        glColor3f(0.3, 0.3, 0.3)
+        glPushMatrix()
+        glScalef(0.1, 8.0, 0.1)
+        self.draw_cube(1, 1, 1)
+        glPopMatrix()
+        
+        # Kepala lampu
+        glPushMatrix()
+        glTranslatef(0, 4.0, 0)
+        
+        # Efek menyala kuning (Emissive)
+        glMaterialfv(GL_FRONT, GL_EMISSION, [1.0, 1.0, 0.0, 1.0])
+        glColor3f(1.0, 1.0, 0.0)
+        
+        self.draw_sphere(0.5)
+        
+        # Reset emission
+        glMaterialfv(GL_FRONT, GL_EMISSION, [0.0, 0.0, 0.0, 1.0])
+        
+        # Render Glow Aura (halo)
+        glEnable(GL_BLEND)
+        glDepthMask(GL_FALSE) # Don't write to depth buffer for transparent glow
+        
+        glColor4f(1.0, 1.0, 0.5, 0.3) # Semi-transparent yellow
+        
+        # First halo
+        self.draw_sphere(1.5)
+        
+        # Large faint halo
+        glColor4f(1.0, 1.0, 0.5, 0.1)
+        self.draw_sphere(3.0)
+        
+        glDepthMask(GL_TRUE)
+        glDisable(GL_BLEND)
+        
+        glPopMatrix()
+        
+    def draw_cube(self, width, height, depth):
+        """Draw cube manually"""
+        w = width / 2
+        h = height / 2
+        d = depth / 2
+        
+        glBegin(GL_QUADS)
+        
+        # Front
+        glNormal3f(0, 0, 1)
+        glVertex3f(-w, -h, d); glVertex3f(w, -h, d)
+        glVertex3f(w, h, d); glVertex3f(-w, h, d)
+        
+        # Back
+        glNormal3f(0, 0, -1)
+        glVertex3f(-w, -h, -d); glVertex3f(-w, h, -d)
+        glVertex3f(w, h, -d); glVertex3f(w, -h, -d)
+        
+        # Top
+        glNormal3f(0, 1, 0)
+        glVertex3f(-w, h, -d); glVertex3f(-w, h, d)
+        glVertex3f(w, h, d); glVertex3f(w, h, -d)
+        
+        # Bottom
+        glNormal3f(0, -1, 0)
+        glVertex3f(-w, -h, -d); glVertex3f(w, -h, -d)
+        glVertex3f(w, -h, d); glVertex3f(-w, -h, d)
+        
+        # Right
+        glNormal3f(1, 0, 0)
+        glVertex3f(w, -h, -d); glVertex3f(w, h, -d)
+        glVertex3f(w, h, d); glVertex3f(w, -h, d)
+        
+        # Left
+        glNormal3f(-1, 0, 0)
+        glVertex3f(-w, -h, -d); glVertex3f(-w, -h, d)
+        glVertex3f(-w, h, d); glVertex3f(-w, h, -d)
+        
+        glEnd()
@@ -0,0 +1,50 @@
+# city_snapshot.py - Binary snapshots of generated city layouts (no GL)
+#
+# A seeded city always generates the same buildings, so the layout is saved
+# once as its BuildingTable array (.npy) keyed by the seed and every
+# generator parameter. Later startups memory-map the file instead of running
+# the generator again; the table reads straight from the mapping.
+import hashlib
+import os
+import numpy as np
+from building_table import BUILDING_DTYPE, BuildingTable
+
+SNAPSHOT_VERSION = 1  # Bump when the generator changes its output for the same parameters
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'city')
+
+
+def snapshot_key(seed, road_system, building_themes):
+    """Hex digest of everything the generated layout depends on"""
+    parameters = (
+        SNAPSHOT_VERSION, seed,
+        road_system.columns, road_system.rows, road_system.spacing,
+        road_system.road_width, road_system.world_size,
+        sorted((name, sorted(theme.items())) for name, theme in building_themes.items()),
+    )
+    return hashlib.sha1(repr(parameters).encode()).hexdigest()[:20]
+
+
+def snapshot_path(key, directory=CACHE_DIR):
+    return os.path.join(directory, f"buildings-{key}.npy")
+
+
+def load_snapshot(key, directory=CACHE_DIR):
+    """BuildingTable over the memory-mapped snapshot, or None if there is no usable one"""
+    try:
+        array = np.load(snapshot_path(key, directory), mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if array.dtype != BUILDING_DTYPE:
+        return None
+    return BuildingTable(array)
+
+
+def save_snapshot(key, buildings, directory=CACHE_DIR):
+    """Write a BuildingTable atomically (a concurrent reader never sees half a file)"""
+    path = snapshot_path(key, directory)
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        np.save(f, buildings.data)
+    os.replace(temporary, path)
+    return path
@@ -0,0 +1,64 @@
+# frustum.py - View-frustum math for CPU-side culling (NumPy only, no GL calls)
+import numpy as np
+
+
+def perspective_matrix(fovy, aspect, near, far):
+    """Projection matrix identical to gluPerspective (row-major, column vectors)"""
+    f = 1.0 / np.tan(np.radians(fovy) / 2.0)
+    return np.array([
+        [f / aspect, 0.0, 0.0, 0.0],
+        [0.0, f, 0.0, 0.0],
+        [0.0, 0.0, (far + near) / (near - far), (2.0 * far * near) / (near - far)],
+        [0.0, 0.0, -1.0, 0.0],
+    ])
+
+
+def look_at_matrix(eye, target, up=(0.0, 1.0, 0.0)):
+    """View matrix identical to gluLookAt (row-major, column vectors)"""
+    eye = np.asarray(eye, dtype=float)
+    forward = np.asarray(target, dtype=float) - eye
+    forward /= np.linalg.norm(forward)
+    side = np.cross(forward, up)
+    side /= np.linalg.norm(side)
+    true_up = np.cross(side, forward)
+
+    view = np.identity(4)
+    view[0, :3] = side
+    view[1, :3] = true_up
+    view[2, :3] = -forward
+    view[:3, 3] = -view[:3, :3] @ eye
+    return view
+
+
+def extract_planes(view_projection):
+    """Extract the six normalized frustum planes (a, b, c, d) from a clip matrix
+
+    Order: left, right, bottom, top, near, far. A point p is inside a plane
+    when a*x + b*y + c*z + d >= 0.
+    """
+    m = np.asarray(view_projection, dtype=float)
+    planes = np.array([
+        m[3] + m[0],  # Left
+        m[3] - m[0],  # Right
+        m[3] + m[1],  # Bottom
+        m[3] - m[1],  # Top
+        m[3] + m[2],  # Near
+        m[3] - m[2],  # Far
+    ])
+    planes /= np.linalg.norm(planes[:, :3], axis=1)[:, None]
+    return planes
+
+
+def aabb_visible(planes, mins, maxs):
+    """Vectorized AABB vs frustum test, returns a boolean mask per box
+
+    For every plane the box corner furthest along the plane normal (the
+    "positive vertex") is tested; if it is outside any plane the box is culled.
+    """
+    mins = np.asarray(mins, dtype=float)
+    maxs = np.asarray(maxs, dtype=float)
+    normals = planes[:, :3]
+    # (boxes, planes, 3): pick max coord where normal is positive, else min
+    positive = np.where(normals[None, :, :] >= 0.0, maxs[:, None, :], mins[:, None, :])
+    distances = np.einsum('bpk,pk->bp', positive, normals) + planes[None, :, 3]
+    return np.all(distances >= 0.0, axis=1)
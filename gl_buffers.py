@@ -0,0 +1,102 @@
+# gl_buffers.py - GPU vertex buffer helpers for the fixed-function pipeline
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+# Number of float32 components per vertex attribute
+ATTRIBUTE_SIZES = {
+    'position': 3,
+    'normal': 3,
+    'texcoord': 2,
+    'color': 4,
+}
+
+
+def vbo_supported():
+    """Check whether the current GL context exposes buffer objects"""
+    try:
+        return bool(glGenBuffers) and bool(glBufferData)
+    except Exception:
+        return False
+
+
+class VertexBuffer:
+    """Interleaved float32 vertex data uploaded once to a GPU buffer object"""
+
+    def __init__(self, data, layout, usage=GL_STATIC_DRAW):
+        # layout: urutan atribut dalam satu vertex, misal ('position', 'normal', 'texcoord')
+        self.layout = tuple(layout)
+        self.components = sum(ATTRIBUTE_SIZES[name] for name in self.layout)
+        self.stride = self.components * 4  # float32
+        self.usage = usage
+        self.vertex_count = 0
+        self.buffer_id = glGenBuffers(1)
+        self.upload(data)
+
+    def upload(self, data):
+        """Replace buffer contents with a new (N, components) float32 array"""
+        data = np.ascontiguousarray(data, dtype=np.float32).reshape(-1, self.components)
+        self.vertex_count = len(data)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_id)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data if data.size else None, self.usage)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def bind(self):
+        """Bind buffer and set client-state pointers for every attribute"""
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_id)
+        offset = 0
+        for name in self.layout:
+            size = ATTRIBUTE_SIZES[name]
+            pointer = ctypes.c_void_p(offset)
+            if name == 'position':
+                glEnableClientState(GL_VERTEX_ARRAY)
+                glVertexPointer(size, GL_FLOAT, self.stride, pointer)
+            elif name == 'normal':
+                glEnableClientState(GL_NORMAL_ARRAY)
+                glNormalPointer(GL_FLOAT, self.stride, pointer)
+            elif name == 'texcoord':
+                glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+                glTexCoordPointer(size, GL_FLOAT, self.stride, pointer)
+            elif name == 'color':
+                glEnableClientState(GL_COLOR_ARRAY)
+                glColorPointer(size, GL_FLOAT, self.stride, pointer)
+            offset += size * 4
+
+    def unbind(self):
+        """Disable client states enabled by bind()"""
+        for name in self.layout:
+            if name == 'position':
+                glDisableClientState(GL_VERTEX_ARRAY)
+            elif name == 'normal':
+                glDisableClientState(GL_NORMAL_ARRAY)
+            elif name == 'texcoord':
+                glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+            elif name == 'color':
+                glDisableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, mode, first=0, count=None):
+        """Bind, draw a contiguous vertex range and unbind"""
+        if count is None:
+            count = self.vertex_count - first
+        if count <= 0:
+            return
+        self.bind()
+        glDrawArrays(mode, first, count)
+        self.unbind()
+
+    def draw_ranges(self, mode, firsts, counts):
+        """Draw many vertex ranges from this buffer with one glMultiDrawArrays call"""
+        if len(firsts) == 0:
+            return
+        firsts = np.ascontiguousarray(firsts, dtype=np.int32)
+        counts = np.ascontiguousarray(counts, dtype=np.int32)
+        self.bind()
+        glMultiDrawArrays(mode, firsts, counts, len(firsts))
+        self.unbind()
+
+    def delete(self):
+        """Release the GPU buffer"""
+        if self.buffer_id is not None:
+            glDeleteBuffers(1, [self.buffer_id])
+            self.buffer_id = None
@@ -0,0 +1,114 @@
+# headless.py - Simulation core without a window or OpenGL context
+#
+# Runs Car, WeatherSystem and Camera updates at a fixed simulation rate as
+# fast as the CPU allows. Useful on CI machines without a GPU:
+#     python main.py --headless --steps 5000
+import argparse
+import time
+from car import Car
+from traffic import Traffic
+from city import City
+from road import Road
+from camera import Camera
+from weather import WeatherSystem
+from stages import NULL_STAGE
+from timestep import REFERENCE_RATE
+
+
+class HeadlessSimulation:
+    def __init__(self, sim_rate=60.0, seed=None, num_particles=3570, grid_size=3, traffic_count=None):
+        self.sim_rate = sim_rate
+        self.dt = 1.0 / sim_rate
+        self.sim_time = 0.0
+        self.step_count = 0
+
+        # Optional per-stage timer: callable(stage_name) -> context manager
+        self.stage_timer = None
+
+        # Same initialization order as CitySimulation
+        self.road = Road(grid_size)
+        self.car = Car()
+        self.city = City(seed=seed)
+        self.traffic = Traffic(self.road, traffic_count, seed=seed)
+        self.camera = Camera()
+        self.weather = WeatherSystem(num_particles, seed=seed)
+
+        self.car.set_road_system(self.road)
+        self.city.set_road_system(self.road)
+
+    def stage(self, name):
+        """Context manager around one step stage (no-op unless stage_timer is set)"""
+        if self.stage_timer is None:
+            return NULL_STAGE
+        return self.stage_timer(name)
+
+    def step(self, controls=()):
+        """Advance the simulation by one fixed step
+
+        controls: names of Car input methods to apply this step,
+        e.g. ('move_forward', 'turn_left')
+        """
+        for control in controls:
+            getattr(self.car, control)()
+
+        # Same update order as CitySimulation.render
+        with self.stage('camera.update'):
+            self.camera.update(self.car)
+        with self.stage('city.stream'):
+            self.city.update_streaming(self.car.x, self.car.z)
+        with self.stage('car.update'):
+            self.car.update(self.city.get_buildings_for_collision(), self.dt)
+            self.car.update_wheel_rotation(self.dt)
+        with self.stage('traffic.update'):
+            self.traffic.update(self.dt)
+        with self.stage('weather.update'):
+            self.weather.update(self.camera, self.dt)
+
+        self.step_count += 1
+        self.sim_time += self.dt
+
+    def run(self, steps=3600, throttle_interval=15):
+        """Run a fixed number of steps with simple cruise input, returns steps/second"""
+        # throttle_interval is in 60 Hz steps, so the input is the same at any sim_rate
+        interval = max(1, round(throttle_interval * self.sim_rate / REFERENCE_RATE))
+        start = time.perf_counter()
+        for i in range(steps):
+            controls = ('move_forward',) if i % interval == 0 and not self.car.auto_mode else ()
+            self.step(controls)
+        elapsed = time.perf_counter() - start
+        return steps / elapsed if elapsed > 0 else float('inf')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the city simulation without OpenGL")
+    parser.add_argument('--headless', action='store_true', help="(accepted for main.py compatibility)")
+    parser.add_argument('--steps', type=int, default=3600, help="number of fixed simulation steps")
+    parser.add_argument('--rate', type=float, default=60.0, help="simulation rate in Hz")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for the city layout, traffic and weather")
+    parser.add_argument('--particles', type=int, default=3570, help="number of snowflakes")
+    parser.add_argument('--grid', type=int, default=3, help="roads per direction (N x N road network)")
+    parser.add_argument('--traffic', type=int, default=None, help="number of AI vehicles (default: one per lane segment)")
+    parser.add_argument('--auto', action='store_true', help="drive the car with the autopilot")
+    args = parser.parse_args(argv)
+
+    simulation = HeadlessSimulation(sim_rate=args.rate, seed=args.seed, num_particles=args.particles,
+                                    grid_size=args.grid, traffic_count=args.traffic)
+    if args.auto:
+        simulation.car.toggle_auto_mode()
+    steps_per_second = simulation.run(steps=args.steps)
+
+    print(f"\n🧪 Headless run: {args.steps} steps at {args.rate:.0f} Hz "
+          f"({simulation.sim_time:.1f}s simulated)")
+    print(f"⚡ Throughput: {steps_per_second:.1f} steps/s "
+          f"({steps_per_second / args.rate:.1f}x real time)")
+    print(f"🚗 Car: Position=({simulation.car.x:.1f}, {simulation.car.z:.1f}), "
+          f"Speed={simulation.car.speed:.1f} km/h")
+    print(f"🚙 Traffic: {simulation.traffic.count} AI vehicles")
+    if args.auto:
+        print(f"🧭 Autopilot routes: {simulation.car.autopilot.graph.stats}")
+    simulation.car.stop_autopilot()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
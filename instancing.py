@@ -0,0 +1,124 @@
+# instancing.py - Shared pieces for instanced GLSL rendering
+#
+# Instanced meshes (street lights, traffic) keep the fixed-function look:
+# the shaders read the current GL_LIGHTi, light model and fog state, so
+# they light and fog exactly like the geometry drawn without shaders.
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+from gl_buffers import vbo_supported
+
+MAX_LIGHTS = 8  # GL_LIGHT0..7 (moonlight + nearest street lights)
+
+# GLSL 1.20 helper: global ambient + every enabled light, vertex color as material.
+# Normals are used as given (no renormalization), like GL_NORMALIZE off.
+LIGHTING_GLSL = """
+#define MAX_LIGHTS %d
+uniform int light_enabled[MAX_LIGHTS];
+
+vec4 fixed_function_lighting(vec4 eye, vec3 N, vec4 material) {
+    vec4 lit = gl_LightModel.ambient;
+    for (int i = 0; i < MAX_LIGHTS; i++) {
+        if (light_enabled[i] == 0) continue;
+        vec4 light = gl_LightSource[i].position;
+        vec3 L = light.xyz - eye.xyz * light.w;
+        float d = length(L);
+        float attenuation = 1.0;
+        if (light.w != 0.0) {
+            attenuation = 1.0 / (gl_LightSource[i].constantAttenuation +
+                                 gl_LightSource[i].linearAttenuation * d +
+                                 gl_LightSource[i].quadraticAttenuation * d * d);
+        }
+        lit += attenuation * (gl_LightSource[i].ambient +
+                              gl_LightSource[i].diffuse * max(dot(N, L / d), 0.0));
+    }
+    return vec4(min(lit.rgb, vec3(1.0)) * material.rgb, material.a);
+}
+""" % MAX_LIGHTS
+
+FOG_FRAGMENT_SHADER = """
+#version 120
+uniform float fog_enabled;
+varying vec4 color;
+varying float fog_depth;
+
+void main() {
+    // GL_EXP2 fog, same parameters as the fixed-function pipeline
+    float f = exp(-pow(gl_Fog.density * fog_depth, 2.0));
+    f = mix(1.0, clamp(f, 0.0, 1.0), fog_enabled);
+    gl_FragColor = vec4(mix(gl_Fog.color.rgb, color.rgb, f), color.a);
+}
+"""
+
+
+def instancing_supported():
+    """Check for shaders, buffer objects and instanced draws in the current context"""
+    try:
+        return (vbo_supported() and bool(glDrawArraysInstanced) and
+                bool(glVertexAttribDivisor) and bool(glCreateShader))
+    except Exception:
+        return False
+
+
+class InstancedProgram:
+    """Vertex + fog fragment shader with fixed generic attribute slots"""
+
+    def __init__(self, name, vertex_source, attributes, fragment_source=FOG_FRAGMENT_SHADER):
+        """attributes: {glsl attribute name: slot}; slots should stay off 0,
+        which some drivers alias with gl_Vertex"""
+        self.program = glCreateProgram()
+        for source, kind in ((vertex_source, GL_VERTEX_SHADER), (fragment_source, GL_FRAGMENT_SHADER)):
+            glAttachShader(self.program, shaders.compileShader(source, kind))
+        for attribute, slot in attributes.items():
+            glBindAttribLocation(self.program, slot, attribute)
+        glLinkProgram(self.program)
+        if glGetProgramiv(self.program, GL_LINK_STATUS) != GL_TRUE:
+            raise RuntimeError(f"{name} shader link failed: {glGetProgramInfoLog(self.program)}")
+        self.fog_location = glGetUniformLocation(self.program, 'fog_enabled')
+        self.lights_location = glGetUniformLocation(self.program, 'light_enabled')
+
+    def uniform(self, name):
+        return glGetUniformLocation(self.program, name)
+
+    def use(self):
+        """Bind the program and mirror the current fog/light enable state"""
+        glUseProgram(self.program)
+        glUniform1f(self.fog_location, 1.0 if glIsEnabled(GL_FOG) else 0.0)
+        if self.lights_location != -1:
+            enabled = [1 if glIsEnabled(GL_LIGHT0 + i) else 0 for i in range(MAX_LIGHTS)]
+            glUniform1iv(self.lights_location, MAX_LIGHTS, np.array(enabled, dtype=np.int32))
+
+    def release(self):
+        glUseProgram(0)
+
+    def delete(self):
+        glDeleteProgram(self.program)
+
+
+class InstanceAttribute:
+    """Per-instance vertex attribute (divisor 1) streamed from a GPU buffer"""
+
+    def __init__(self, location, components=4):
+        self.location = location
+        self.components = components
+        self.buffer_id = glGenBuffers(1)
+
+    def upload(self, data):
+        """Stream an (N, components) array and enable the attribute for drawing"""
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer_id)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+        glEnableVertexAttribArray(self.location)
+        glVertexAttribPointer(self.location, self.components, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        glVertexAttribDivisor(self.location, 1)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def disable(self):
+        glVertexAttribDivisor(self.location, 0)
+        glDisableVertexAttribArray(self.location)
+
+    def delete(self):
+        if self.buffer_id is not None:
+            glDeleteBuffers(1, [self.buffer_id])
+            self.buffer_id = None
@@ -0,0 +1,98 @@
+# lighting.py - Street-light selection for GL fixed-function point lights
+import numpy as np
+from OpenGL.GL import *
+
+# Yellowish street light color and falloff (distinct pools of light)
+LAMP_COLOR = [1.0, 0.8, 0.4, 1.0]
+LAMP_ATTENUATION = (0.1, 0.1, 0.02)  # constant, linear, quadratic
+
+
+class LightManager:
+    """Activates the street lights nearest to a point on GL_LIGHT1..GL_LIGHTn
+
+    Lamp positions are kept in a NumPy array plus a uniform grid, and the k
+    nearest lamps are found with argpartition over the grid candidates.
+    """
+
+    def __init__(self, positions, max_lights=6, lamp_height=4.0, cell_size=25.0):
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.max_lights = max_lights
+        self.lamp_height = lamp_height
+        self.cell_size = float(cell_size)
+        self.active = ()  # Indices of lamps currently bound to GL lights
+
+        # Grid index: (cell_x, cell_z) -> array of lamp indices
+        cells = np.floor(self.positions / self.cell_size).astype(np.int64)
+        self.grid = {}
+        for index, key in enumerate(map(tuple, cells)):
+            self.grid.setdefault(key, []).append(index)
+        self.grid = {key: np.array(indices) for key, indices in self.grid.items()}
+        if len(cells):
+            self.cell_min = cells.min(axis=0)
+            self.cell_max = cells.max(axis=0)
+
+    def nearest(self, x, z, k=None):
+        """Indices of the k lamps closest to (x, z), nearest first"""
+        k = min(self.max_lights if k is None else k, len(self.positions))
+        if k == 0:
+            return np.empty(0, dtype=np.int64)
+
+        cx = int(np.floor(x / self.cell_size))
+        cz = int(np.floor(z / self.cell_size))
+        # Rings needed before every cell of the grid has been visited
+        max_ring = int(max(abs(cx - self.cell_min[0]), abs(cx - self.cell_max[0]),
+                           abs(cz - self.cell_min[1]), abs(cz - self.cell_max[1])))
+
+        found = []
+        ring = 0
+        while True:
+            # Collect cells on the square ring at Chebyshev distance `ring`
+            for gx in range(cx - ring, cx + ring + 1):
+                for gz in range(cz - ring, cz + ring + 1):
+                    if max(abs(gx - cx), abs(gz - cz)) == ring:
+                        indices = self.grid.get((gx, gz))
+                        if indices is not None:
+                            found.append(indices)
+
+            if found:
+                candidates = np.concatenate(found)
+                if len(candidates) >= k:
+                    deltas = self.positions[candidates] - (x, z)
+                    dist_sq = np.einsum('ij,ij->i', deltas, deltas)
+                    nearest = np.argpartition(dist_sq, k - 1)[:k]
+                    # Anything outside the visited square is at least `ring` cells away
+                    if dist_sq[nearest].max() <= (ring * self.cell_size) ** 2 or ring >= max_ring:
+                        order = nearest[np.argsort(dist_sq[nearest])]
+                        return candidates[order]
+            ring += 1
+
+    def setup_gl(self):
+        """Constant lamp parameters, set once after the GL context exists"""
+        for i in range(self.max_lights):
+            light_id = GL_LIGHT1 + i
+            glLightfv(light_id, GL_DIFFUSE, LAMP_COLOR)
+            glLightfv(light_id, GL_SPECULAR, LAMP_COLOR)
+            glLightf(light_id, GL_CONSTANT_ATTENUATION, LAMP_ATTENUATION[0])
+            glLightf(light_id, GL_LINEAR_ATTENUATION, LAMP_ATTENUATION[1])
+            glLightf(light_id, GL_QUADRATIC_ATTENUATION, LAMP_ATTENUATION[2])
+            glDisable(light_id)
+
+    def update(self, x, z):
+        """Select lamps nearest to (x, z); enable/disable GL lights only on change
+
+        Must be called after the view transform: GL stores light positions in
+        eye space, so positions are re-specified every frame (one call per
+        active light), everything else only when the active set changes.
+        """
+        active = tuple(sorted(int(i) for i in self.nearest(x, z)))
+        if active != self.active:
+            for i in range(self.max_lights):
+                if i < len(active):
+                    glEnable(GL_LIGHT1 + i)
+                else:
+                    glDisable(GL_LIGHT1 + i)
+            self.active = active
+
+        for i, index in enumerate(self.active):
+            lamp_x, lamp_z = self.positions[index]
+            glLightfv(GL_LIGHT1 + i, GL_POSITION, [lamp_x, self.lamp_height, lamp_z, 1.0])
@@ -0,0 +1,84 @@
+# lod.py - Distance-based level-of-detail selection (NumPy, no GL)
+import numpy as np
+from building_table import BUILDING_DTYPE, BuildingTable
+
+# Level boundaries in world units (level i is used up to distance[i])
+BUILDING_LOD_DISTANCES = (120.0, 260.0)  # textured -> flat-colored -> merged impostor
+LAMP_LOD_DISTANCES = (45.0, 140.0)       # full mesh -> billboard halo -> point
+LOD_HYSTERESIS = 8.0                     # Dead band around each boundary
+IMPOSTOR_CELL_SIZE = 30.0                # Buildings merged per impostor cell
+
+
+class LODSelector:
+    """Per-object LOD levels with hysteresis
+
+    An object only switches to a coarser level once it is `hysteresis`
+    beyond a boundary, and back to a finer one once it is `hysteresis`
+    inside it, so objects near a boundary do not flicker between levels.
+    """
+
+    def __init__(self, distances, hysteresis=LOD_HYSTERESIS):
+        self.distances = np.asarray(distances, dtype=np.float64)
+        self.hysteresis = hysteresis
+        self.levels = np.zeros(0, dtype=np.int8)
+
+    def update(self, distances):
+        """New level per object for this frame's camera distances"""
+        distances = np.asarray(distances, dtype=np.float64)
+        coarsest = np.searchsorted(self.distances - self.hysteresis, distances)  # Allowed at most
+        finest = np.searchsorted(self.distances + self.hysteresis, distances)    # Required at least
+        if len(self.levels) != len(distances):
+            # New object set: start at the level matching the plain distance
+            self.levels = np.searchsorted(self.distances, distances).astype(np.int8)
+        else:
+            self.levels = np.clip(self.levels, finest, coarsest).astype(np.int8)
+        return self.levels
+
+
+def camera_distances(points, camera_position):
+    """Euclidean distance from camera to each (N, 3) point"""
+    return np.sqrt(((np.asarray(points, dtype=np.float64) - camera_position) ** 2).sum(axis=1))
+
+
+def merge_impostors(buildings, cell_size=IMPOSTOR_CELL_SIZE):
+    """Merge buildings into one skyline box per grid cell
+
+    Returns (impostors, group): impostor BuildingTable (same format as
+    City.buildings) and, per building, the index of its impostor.
+    """
+    if len(buildings) == 0:
+        return BuildingTable(), np.zeros(0, dtype=np.int64)
+    x, z = buildings.x, buildings.z
+    width, depth, height = buildings.width, buildings.depth, buildings.height
+    color = buildings.color
+
+    cells = np.floor(np.stack([x, z], axis=1) / cell_size).astype(np.int64)
+    _, group = np.unique(cells, axis=0, return_inverse=True)
+    group = group.reshape(-1)
+    count = group.max() + 1
+
+    min_x = np.full(count, np.inf)
+    max_x = np.full(count, -np.inf)
+    min_z = np.full(count, np.inf)
+    max_z = np.full(count, -np.inf)
+    np.minimum.at(min_x, group, x - width / 2)
+    np.maximum.at(max_x, group, x + width / 2)
+    np.minimum.at(min_z, group, z - depth / 2)
+    np.maximum.at(max_z, group, z + depth / 2)
+
+    # Footprint-weighted mean height and color keep the skyline silhouette
+    area = width * depth
+    total_area = np.bincount(group, area, count)
+    mean_height = np.bincount(group, area * height, count) / total_area
+    mean_color = np.stack([np.bincount(group, area * color[:, i], count) for i in range(4)], axis=1)
+    mean_color /= total_area[:, None]
+
+    impostors = np.empty(count, dtype=BUILDING_DTYPE)
+    impostors['x'] = (min_x + max_x) / 2.0
+    impostors['z'] = (min_z + max_z) / 2.0
+    impostors['width'] = max_x - min_x
+    impostors['depth'] = max_z - min_z
+    impostors['height'] = mean_height
+    impostors['color'] = mean_color
+    impostors['theme'] = 'impostor'
+    return BuildingTable(impostors), group
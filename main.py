@@ -1,84 +1,115 @@
 # main.py
+import sys
+
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    # Headless mode: run simulation core without pygame window or PyOpenGL
+    from headless import main as headless_main
+    sys.exit(headless_main(sys.argv[1:]))
+
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
 import numpy as np
 from car import Car
+from traffic import Traffic
 from city import City
 from road import Road
 from camera import Camera
 from weather import WeatherSystem
+from car_renderer import CarRenderer
+from traffic_renderer import TrafficRenderer
+from city_renderer import CityRenderer
+from road_renderer import RoadRenderer
+from weather_renderer import WeatherRenderer
+from primitives import delete_primitive_buffers
+from text_renderer import TextRenderer
+from profiler import FrameProfiler
+from frustum import perspective_matrix
+from lighting import LightManager
+from stages import NULL_STAGE
+from timestep import FixedTimestep, REFERENCE_RATE, MAX_CATCH_UP_STEPS
+from sim_thread import SimulationThread
 
 class CitySimulation:
-    def __init__(self, width=1280, height=720):
+    def __init__(self, width=1280, height=720, offscreen=False, seed=None, grid_size=3, traffic_count=None,
+                 sim_rate=REFERENCE_RATE, max_catch_up=MAX_CATCH_UP_STEPS, baked_sky=False):
+        """offscreen=True: caller already made an (EGL) GL context current, no window is opened
+        seed: fixes the random streams of the simulation (benchmarks)
+        grid_size: number of roads in each direction (grid_size x grid_size network)
+        traffic_count: number of AI vehicles (default: one per lane segment)
+        sim_rate: fixed simulation steps per second, independent of the frame rate
+        max_catch_up: most simulation steps run for one frame (avoids a spiral of death)
+        baked_sky: draw stars and moon from a cubemap rendered once (one draw call)"""
         self.width = width
         self.height = height
         
+        # Projection parameters (shared by gluPerspective and frustum culling)
+        self.fov = 45.0
+        self.near_plane = 0.1
+        self.far_plane = 1000.0
+        self.projection_matrix = perspective_matrix(self.fov, width / height, self.near_plane, self.far_plane)
+        
         # Initialize systems in correct order
-        self.road = Road()  # Road system first
+        self.road = Road(grid_size)  # Road system first
         self.car = Car()    # Car second
-        self.city = City()  # City last
+        self.city = City(seed=seed)  # City last
+        self.traffic = Traffic(self.road, traffic_count, seed=seed)  # AI vehicles
         self.camera = Camera()
-        self.weather = WeatherSystem()  # Weather system for atmosphere
+        self.weather = WeatherSystem(seed=seed)  # Weather system for atmosphere
         
         # Link systems together for proper integration
         self.car.set_road_system(self.road)
         self.city.set_road_system(self.road)
         
+        # OpenGL front-ends (simulation objects above never touch GL)
+        self.road_renderer = RoadRenderer(self.road)
+        self.car_renderer = CarRenderer(self.car)
+        self.traffic_renderer = TrafficRenderer(self.traffic)
+        self.city_renderer = CityRenderer(self.city, baked_sky)
+        self.weather_renderer = WeatherRenderer(self.weather)
+        
+        # Nearest street lights -> GL_LIGHT1..6 (same positions City draws)
+        self.light_manager = LightManager(self.city.get_street_light_positions())
+        
         self.light_position = [50.0, 50.0, 50.0, 1.0]
         self.light_color = [1.0, 1.0, 1.0, 1.0]
         self.frame_count = 0
         self.running = True
         
+        # Fixed-step simulation clock; frames render between the last two steps
+        self.timestep = FixedTimestep(sim_rate, max_catch_up)
+        self.sim_thread = None  # SimulationThread while run(threaded=True) is active
+        
+        # Optional per-stage timer: callable(stage_name) -> context manager
+        self.stage_timer = None
+        
+        # Stage history for the F3 overlay (attached as stage_timer by run())
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        
         # Simple FPS tracking
         self.current_fps = 60.0
         
-        # UI text texture cache for performance optimization
-        self.text_texture_cache = {}
-        self.cached_fps = 0
-        self.cached_speed = 0
-        self.cached_position = (0, 0)
-        self.cached_camera_info = ""
+        # HUD text: one glyph atlas texture, one vertex buffer per frame
+        self.text_renderer = TextRenderer('Arial', 20)
         
         # Initialize PyGame
         pygame.init()
-        pygame.display.set_mode(
-            (width, height), 
-            pygame.OPENGL | pygame.DOUBLEBUF
-        )
-        pygame.display.set_caption("Simulasi Kota 3D - Kelompok 7")
-        
-        # Initialize font untuk info
+        if not offscreen:
+            pygame.display.set_mode(
+                (width, height), 
+                pygame.OPENGL | pygame.DOUBLEBUF
+            )
+            pygame.display.set_caption("Simulasi Kota 3D - Kelompok 7")
+        
+        # Initialize font untuk info (glyph atlas is built in init_opengl)
         pygame.font.init()
-        self.font = pygame.font.SysFont('Arial', 20)
         
         self.init_opengl()
-        
-    def get_or_create_text_texture(self, cache_key, text, color=(255, 255, 255)):
-        """Get cached texture or create new one if text changed - Performance optimization"""
-        if cache_key in self.text_texture_cache:
-            cached_tex_id, cached_text = self.text_texture_cache[cache_key]
-            if cached_text == text:
-                return cached_tex_id
-            else:
-                # Text changed, delete old texture
-                glDeleteTextures([cached_tex_id])
-        
-        # Create new texture
-        text_surface = self.font.render(text, True, color)
-        text_data = pygame.image.tostring(text_surface, "RGBA", True)
-        w, h = text_surface.get_size()
-        
-        tex_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, tex_id)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, w, h, 0, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-        
-        self.text_texture_cache[cache_key] = (tex_id, text)
-        return tex_id
-        
+    
+    def print_controls(self):
+        """Print the keyboard and mouse controls"""
         print("\n" + "="*80)
         print("3D CITY SIMULATION - ENHANCED MAZE CITY")
         print("="*80)
@@ -99,6 +130,7 @@ class CitySimulation:
         print("Panah Kiri/Kanan - Putar Kamera (Free mode)")
         print("PageUp/PageDown - Zoom In/Out (Free mode)")
         print("")
+        print("F3 - Profiler overlay (p50/p95/p99 per stage)")
         print("ESC - Keluar")
         print("="*80)
         
@@ -112,57 +144,31 @@ class CitySimulation:
         glClearColor(0.05, 0.05, 0.2, 1.0)  # Warna langit malam (biru gelap)
         
         # Enable fog for atmospheric effect
-        # Enable fog for atmospheric effect
-        self.weather.enable_fog()
+        self.weather_renderer.setup_gl_resources()
         
         # Initialize City GL resources (Texture, etc)
-        self.city.setup_gl_resources()
-    
-
+        self.city_renderer.setup_gl_resources()
+        self.road_renderer.setup_gl_resources()
+        self.car_renderer.setup_gl_resources()
+        self.traffic_renderer.setup_gl_resources()
+        self.light_manager.setup_gl()
+        self.text_renderer.setup_gl_resources()
+        self.profiler.setup_gl_resources()
     
     def draw_fps_display(self):
-        """Draw real-time FPS counter with color coding"""
+        """Queue real-time FPS counter with color coding (drawn with the HUD text batch)"""
         # Determine FPS color based on performance
         if self.current_fps >= 55:
-            fps_color = (0, 255, 0)      # Green - Good performance
+            fps_color = (0.0, 1.0, 0.0)      # Green - Good performance
         elif self.current_fps >= 45:
-            fps_color = (255, 255, 0)    # Yellow - Acceptable
+            fps_color = (1.0, 1.0, 0.0)      # Yellow - Acceptable
         else:
-            fps_color = (255, 0, 0)      # Red - Poor performance
-        
-        # Format FPS text
-        fps_text = f"FPS: {self.current_fps:.1f}"
-        fps_surface = self.font.render(fps_text, True, fps_color)
-        fps_data = pygame.image.tostring(fps_surface, "RGBA", True)
-        fps_w, fps_h = fps_surface.get_size()
+            fps_color = (1.0, 0.0, 0.0)      # Red - Poor performance
         
         # Position in top-right corner
-        fps_x = self.width - fps_w - 20
-        fps_y = 20
-        
-        # Create and bind texture
-        tex_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, tex_id)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, fps_w, fps_h, 0, 
-                    GL_RGBA, GL_UNSIGNED_BYTE, fps_data)
-        
-        glEnable(GL_TEXTURE_2D)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        
-        glColor3f(1, 1, 1)
-        glBegin(GL_QUADS)
-        glTexCoord2f(0, 1); glVertex2f(fps_x, fps_y)
-        glTexCoord2f(1, 1); glVertex2f(fps_x + fps_w, fps_y)
-        glTexCoord2f(1, 0); glVertex2f(fps_x + fps_w, fps_y + fps_h)
-        glTexCoord2f(0, 0); glVertex2f(fps_x, fps_y + fps_h)
-        glEnd()
-        
-        glDisable(GL_BLEND)
-        glDisable(GL_TEXTURE_2D)
-        glDeleteTextures([tex_id])
+        fps_text = f"FPS: {self.current_fps:.1f}"
+        fps_w, fps_h = self.text_renderer.measure(fps_text)
+        self.text_renderer.add(fps_text, self.width - fps_w - 20, 20, fps_color + (1.0,))
 
     def handle_events(self):
         """Handle keyboard and mouse events dengan PyGame"""
@@ -195,21 +201,23 @@ class CitySimulation:
                     self.running = False
                     return
                 elif event.key == pygame.K_o:
-                    self.car.toggle_auto_mode()
+                    self.car_command('toggle_auto_mode')
+                elif event.key == pygame.K_F3:
+                    self.show_profiler = not self.show_profiler
                 
                 # Kontrol mobil
                 elif event.key == pygame.K_w:
-                    self.car.move_forward()
+                    self.car_command('move_forward')
                 elif event.key == pygame.K_s:
-                    self.car.move_backward()
+                    self.car_command('move_backward')
                 elif event.key == pygame.K_a:
-                    self.car.turn_left()
+                    self.car_command('turn_left')
                 elif event.key == pygame.K_d:
-                    self.car.turn_right()
+                    self.car_command('turn_right')
                 elif event.key == pygame.K_SPACE:
-                    self.car.brake()
+                    self.car_command('brake')
                 elif event.key == pygame.K_r:
-                    self.car.reset_position()
+                    self.car_command('reset_position')
                 
                 # Kontrol kamera (updated order)
                 elif event.key == pygame.K_1:
@@ -243,7 +251,7 @@ class CitySimulation:
     def setup_projection(self):
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
-        gluPerspective(45, self.width/self.height, 0.1, 1000.0)
+        gluPerspective(self.fov, self.width/self.height, self.near_plane, self.far_plane)
         glMatrixMode(GL_MODELVIEW)
     
     def setup_lighting(self):
@@ -253,70 +261,57 @@ class CitySimulation:
         glLightfv(GL_LIGHT0, GL_AMBIENT, [0.1, 0.1, 0.2, 1.0]) # Ambient gelap
         glLightfv(GL_LIGHT0, GL_SPECULAR, [0.3, 0.3, 0.3, 1.0])
     
-    def update_dynamic_lighting(self):
+    def update_dynamic_lighting(self, car_pose):
         """Dynamic lighting manager: Activates street lights closest to car"""
-        # Collect all street light positions (based on road grid known in City/Road)
-        # Replicating logic from City.draw_street_lights for efficiency
-        light_candidates = []
-        
-        # Horizontal roads: z = -30, 0, 30
-        for road_z in [-30, 0, 30]:
-            for x in range(-100, 101, 25): # Loop range matching city.py
-                # Skip intersection areas (approximate)
-                if not any(abs(x - rx) <= 10 for rx in [-30, 0, 30]):
-                    light_candidates.append([x, 4.0, road_z - 8])
-                    light_candidates.append([x, 4.0, road_z + 8])
-                    
-        # Vertical roads: x = -30, 0, 30
-        for road_x in [-30, 0, 30]:
-            for z in range(-80, 81, 25):
-                if not any(abs(z - rz) <= 10 for rz in [-30, 0, 30]):
-                    light_candidates.append([road_x - 8, 4.0, z])
-                    light_candidates.append([road_x + 8, 4.0, z])
-        
-        # Sort by distance to car
-        car_pos = np.array([self.car.x, self.car.y, self.car.z])
-        
-        # Calculate squared distances for speed
-        def dist_sq(pos):
-            return (pos[0]-car_pos[0])**2 + (pos[2]-car_pos[2])**2
-            
-        light_candidates.sort(key=dist_sq)
-        
-        # Use up to 6 closest lights (GL_LIGHT1 to GL_LIGHT6)
-        max_lights = 6
-        active_lights = light_candidates[:max_lights]
-        
-        for i in range(max_lights):
-            light_id = GL_LIGHT1 + i
-            if i < len(active_lights):
-                pos = active_lights[i]
-                glEnable(light_id)
-                
-                # Position (w=1 for point light)
-                glLightfv(light_id, GL_POSITION, [pos[0], pos[1], pos[2], 1.0])
-                
-                # Yellowish street light color
-                glLightfv(light_id, GL_DIFFUSE, [1.0, 0.8, 0.4, 1.0])
-                glLightfv(light_id, GL_SPECULAR, [1.0, 0.8, 0.4, 1.0])
-                
-                # Attenuation (falloff) - distinct pools of light
-                glLightf(light_id, GL_CONSTANT_ATTENUATION, 0.1)
-                glLightf(light_id, GL_LINEAR_ATTENUATION, 0.1)
-                glLightf(light_id, GL_QUADRATIC_ATTENUATION, 0.02)
-            else:
-                glDisable(light_id)
+        # Called after gluLookAt so lamp positions are in world space
+        self.light_manager.update(car_pose.x, car_pose.z)
     
-    def render(self):
+    def car_command(self, command):
+        """Apply a Car input method now, or queue it for the simulation thread"""
+        if self.sim_thread is not None:
+            self.sim_thread.send(command)
+        else:
+            getattr(self.car, command)()
+    
+    def stage(self, name):
+        """Context manager around one frame stage (no-op unless stage_timer is set)"""
+        if self.stage_timer is None:
+            return NULL_STAGE
+        return self.stage_timer(name)
+    
+    def update_simulation(self, dt):
+        """Advance car, traffic and weather by one fixed step of dt seconds"""
+        # PASS BUILDINGS FOR COLLISION
+        with self.stage('car.update'):
+            self.car.update(self.city.get_buildings_for_collision(), dt)
+            self.car.update_wheel_rotation(dt)
+        with self.stage('traffic.update'):
+            self.traffic.update(dt)
+        with self.stage('weather.update'):
+            self.weather.update(self.camera, dt)
+    
+    def advance(self, frame_time):
+        """Run the simulation steps owed for frame_time seconds, return the render alpha"""
+        for _ in range(self.timestep.advance(frame_time)):
+            self.update_simulation(self.timestep.dt)
+        return self.timestep.alpha
+    
+    def render(self, alpha=1.0, snapshot=None):
+        """Draw one frame; alpha blends car and traffic between the last two steps
+        
+        snapshot: draw from a SimulationThread snapshot instead of the live objects
+        """
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glLoadIdentity()
         
-        self.setup_projection()
-        self.setup_lighting()
-        self.update_dynamic_lighting()
+        with self.stage('setup_lighting'):
+            self.setup_projection()
+            self.setup_lighting()
         
         # Update kamera
-        self.camera.update(self.car)
+        car_pose = snapshot.car_pose(alpha) if snapshot else self.car.pose(alpha)
+        with self.stage('camera.update'):
+            self.camera.update(car_pose)
         
         # Terapkan transformasi kamera
         gluLookAt(
@@ -325,25 +320,39 @@ class CitySimulation:
             0, 1, 0
         )
         
-        # Gambar scene
-        self.draw_grid()
-        self.road.render()
-        self.city.render()
+        with self.stage('update_dynamic_lighting'):
+            self.update_dynamic_lighting(car_pose)
         
-        # Update dan gambar mobil - PASS BUILDINGS FOR COLLISION
-        self.car.update(self.city.get_buildings_for_collision())
-        self.car.render()
+        # View-projection matrix for frustum culling (same as GL state above)
+        view_projection = self.projection_matrix @ self.camera.get_view_matrix()
         
-        # Update and render weather (snowfall particles)
-        self.weather.update(self.camera)
-        self.weather.render()
+        # Gambar scene
+        with self.stage('road.render'):
+            self.draw_grid()
+            self.road_renderer.render()
+        with self.stage('city.stream'):
+            self.city.update_streaming(car_pose.x, car_pose.z)
+        with self.stage('city.render'):
+            self.city_renderer.render(view_projection, (self.camera.x, self.camera.y, self.camera.z))
+        
+        # Gambar mobil dan AI traffic
+        with self.stage('car.render'):
+            self.car_renderer.render(alpha, car_pose)
+        with self.stage('traffic.render'):
+            self.traffic_renderer.render(view_projection, alpha,
+                                         snapshot.traffic_state(alpha) if snapshot else None)
+        
+        # Render weather (snowfall particles)
+        with self.stage('weather.render'):
+            self.weather_renderer.render(snapshot.particles if snapshot else None)
         
         # UI informasi
-        self.draw_ui()
+        with self.stage('draw_ui'):
+            self.draw_ui(alpha, snapshot)
         
         # Debug info di terminal
         if self.frame_count % 180 == 0:  # Setiap 3 detik
-            self.print_debug_info()
+            self.print_debug_info(alpha, snapshot)
     
     def draw_grid(self, size=100, step=10):
         """Draw grid untuk membantu visualisasi 3D"""
@@ -358,8 +367,23 @@ class CitySimulation:
             glVertex3f(size, 0, i)
         glEnd()
     
-    def draw_ui(self):
-        """Draw UI with optimized text caching - reduces texture operations from 10-12 to 1-2 per frame"""
+    def hud_car_state(self, alpha=1.0, snapshot=None):
+        """(x, z, direction, speed) of the car for HUD and debug output
+        
+        With a snapshot everything comes from that one step (the simulation
+        thread keeps changing the live car while the GL thread reads it).
+        """
+        if snapshot is None:
+            return self.car.x, self.car.z, self.car.direction, self.car.speed
+        pose = snapshot.car_pose(alpha)
+        return pose.x, pose.z, pose.direction, snapshot.car_speed
+    
+    def draw_ui(self, alpha=1.0, snapshot=None):
+        """Draw UI: bars as plain quads, all text from the glyph atlas in one draw call
+        
+        snapshot: SimulationThread snapshot the frame was drawn from (None: live car)
+        """
+        car_x, car_z, car_direction, car_speed = self.hud_car_state(alpha, snapshot)
         # Switch ke orthographic projection untuk 2D UI
         glMatrixMode(GL_PROJECTION)
         glPushMatrix()
@@ -373,26 +397,6 @@ class CitySimulation:
         glDisable(GL_LIGHTING)
         glDisable(GL_DEPTH_TEST)
         
-        # Build dynamic text only when values change significantly
-        # FPS - update if changed by ≥0.5
-        fps_text = f"FPS: {self.current_fps:.1f}"
-        if abs(self.current_fps - self.cached_fps) >= 0.5:
-            self.cached_fps = self.current_fps
-        else:
-            fps_text = f"FPS: {self.cached_fps:.1f}"
-        
-        # Position - update if changed by ≥5 units
-        pos_x, pos_z = self.car.x, self.car.z
-        if abs(pos_x - self.cached_position[0]) >= 5 or abs(pos_z - self.cached_position[1]) >= 5:
-            self.cached_position = (pos_x, pos_z)
-        pos_text = f"Posisi: X={self.cached_position[0]:6.1f}, Z={self.cached_position[1]:6.1f}"
-        
-        # Speed - update if changed by ≥1.0
-        speed = abs(self.car.speed)
-        if abs(speed - self.cached_speed) >= 1.0:
-            self.cached_speed = speed
-        speed_text = f"Kecepatan: {self.cached_speed:5.1f} km/h"
-        
         # Camera info
         camera_info = ""
         if self.camera.mode == 'orbital':
@@ -402,57 +406,36 @@ class CitySimulation:
         elif self.camera.mode == 'free':
             camera_info = f"Free Cam: Sudut={self.camera.free_camera_angle:.1f}°, Tinggi={self.camera.free_camera_height:.1f}"
         
-        # Build info lines - static lines are cached, dynamic updated only when changed
+        # Text is laid out from the atlas every frame, so values can stay live
         info_lines = [
-            (f"fps_{self.cached_fps:.1f}", fps_text),
-            (f"pos_{self.cached_position[0]:.0f}_{self.cached_position[1]:.0f}", pos_text),
-            (f"speed_{self.cached_speed:.0f}", speed_text),
-            (f"cam_{self.camera.mode}", f"Kamera: {self.camera.mode.upper()}"),
-            (f"dir_{self.car.direction:.0f}", f"Arah: {self.car.direction:.1f}°"),
-            ("buildings_static", f"Grid Road System - {len(self.city.buildings)} Buildings"),
-            ("controls_static", "WASD: Mengemudi | 1/2/3/4/5: Kamera | R: Reset | ESC: Keluar")
+            f"FPS: {self.current_fps:.1f}",
+            f"Posisi: X={car_x:6.1f}, Z={car_z:6.1f}",
+            f"Kecepatan: {abs(car_speed):5.1f} km/h",
+            f"Kamera: {self.camera.mode.upper()}",
+            f"Arah: {car_direction:.1f}°",
+            f"Grid Road System - {len(self.city.buildings)} Buildings",
+            "WASD: Mengemudi | 1/2/3/4/5: Kamera | R: Reset | ESC: Keluar",
         ]
         
         # Add navigation help if off road
-        if not self.car.is_on_road(self.car.x, self.car.z):
-            info_lines.append(("offroad_warning", "⚠️ OFF ROAD - Return to road!"))
+        if not self.car.is_on_road(car_x, car_z):
+            info_lines.append("⚠️ OFF ROAD - Return to road!")
         
         # Show mode-specific camera info
         if camera_info:
-            info_lines.append((f"cam_info_{self.camera.mode}", camera_info))
+            info_lines.append(camera_info)
             if self.camera.mode == 'orbital':
-                info_lines.append(("mouse_help_static", "Mouse: Drag to rotate | Wheel to zoom"))
-            
-        # Render cached textures
-        for i, (cache_key, line_text) in enumerate(info_lines):
-            tex_id = self.get_or_create_text_texture(cache_key, line_text)
-            
-            # Get text dimensions from font (lightweight, no texture creation)
-            text_surface = self.font.render(line_text, True, (255, 255, 255))
-            w, h = text_surface.get_size()
-            
-            # Bind cached texture
-            glBindTexture(GL_TEXTURE_2D, tex_id)
-            
-            glEnable(GL_TEXTURE_2D)
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            
-            glColor3f(1, 1, 1)
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 1); glVertex2f(10, 10 + i*25)
-            glTexCoord2f(1, 1); glVertex2f(10 + w, 10 + i*25)
-            glTexCoord2f(1, 0); glVertex2f(10 + w, 10 + i*25 + h)
-            glTexCoord2f(0, 0); glVertex2f(10, 10 + i*25 + h)
-            glEnd()
-            
-            glDisable(GL_BLEND)
-            glDisable(GL_TEXTURE_2D)
-            
-            # Note: Texture NOT deleted here - it's cached for reuse!
+                info_lines.append("Mouse: Drag to rotate | Wheel to zoom")
+        
+        for i, line_text in enumerate(info_lines):
+            self.text_renderer.add(line_text, 10, 10 + i*25)
+        
+        # Stage timings below the info lines (F3)
+        if self.show_profiler:
+            self.profiler.draw_overlay(self.text_renderer, 10, 20 + len(info_lines)*25)
         
         # Speed bar (progress bar visual)
-        speed_percent = min(abs(self.car.speed) / self.car.max_speed, 1.0)
+        speed_percent = min(abs(car_speed) / self.car.max_speed, 1.0)
         bar_width = 200
         bar_height = 15
         
@@ -477,33 +460,10 @@ class CitySimulation:
         glEnd()
         
         # Speed text di samping bar
-        speed_text = f"{abs(self.car.speed):.1f} km/h"
-        speed_surface = self.font.render(speed_text, True, (255, 255, 255))
-        speed_data = pygame.image.tostring(speed_surface, "RGBA", True)
-        speed_w, speed_h = speed_surface.get_size()
-        
-        tex_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, tex_id)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, speed_w, speed_h, 0, 
-                    GL_RGBA, GL_UNSIGNED_BYTE, speed_data)
-        
-        glEnable(GL_TEXTURE_2D)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        
-        glColor3f(1, 1, 1)
-        glBegin(GL_QUADS)
-        glTexCoord2f(0, 1); glVertex2f(self.width - bar_width - 20, 50)
-        glTexCoord2f(1, 1); glVertex2f(self.width - bar_width - 20 + speed_w, 50)
-        glTexCoord2f(1, 0); glVertex2f(self.width - bar_width - 20 + speed_w, 50 + speed_h)
-        glTexCoord2f(0, 0); glVertex2f(self.width - bar_width - 20, 50 + speed_h)
-        glEnd()
+        self.text_renderer.add(f"{abs(car_speed):.1f} km/h", self.width - bar_width - 20, 50)
         
-        glDisable(GL_BLEND)
-        glDisable(GL_TEXTURE_2D)
-        glDeleteTextures([tex_id])
+        # All HUD text in one draw from the glyph atlas
+        self.text_renderer.draw()
         
         # Restore 3D settings
         glEnable(GL_DEPTH_TEST)
@@ -514,42 +474,74 @@ class CitySimulation:
         glMatrixMode(GL_MODELVIEW)
         glPopMatrix()
     
-    def print_debug_info(self):
+    def print_debug_info(self, alpha=1.0, snapshot=None):
         """Print debug info ke terminal untuk troubleshooting"""
+        car_x, car_z, _, car_speed = self.hud_car_state(alpha, snapshot)
         print(f"\n=== ENHANCED CITY SIMULATION INFO ===")
-        print(f"🚗 Car: Position=({self.car.x:.1f}, {self.car.z:.1f}), Speed={self.car.speed:.1f} km/h")
-        print(f"🛣️  Road: On road = {self.car.is_on_road(self.car.x, self.car.z)}")
+        print(f"🚗 Car: Position=({car_x:.1f}, {car_z:.1f}), Speed={car_speed:.1f} km/h")
+        print(f"🛣️  Road: On road = {self.car.is_on_road(car_x, car_z)}")
         print(f"🏢 Buildings: {len(self.city.buildings)} total in {len(self.road.city_blocks)} blocks")
         print(f"📷 Camera: {self.camera.mode} mode")
+        stats = self.city_renderer.culling_stats
+        print(f"🔭 Culling: {stats['tested']} buildings tested, {stats['drawn']} drawn this frame")
+        traffic_stats = self.traffic_renderer.stats
+        print(f"🚙 Traffic: {traffic_stats['drawn']}/{traffic_stats['vehicles']} AI vehicles drawn")
         print(f"⚡ Performance: {self.frame_count//60}s runtime")
     
-    def run(self):
-        """Main game loop with FPS monitoring"""
+    def run(self, threaded=True):
+        """Main game loop with FPS monitoring
+        
+        threaded=True: simulation steps run on a SimulationThread while this
+        thread handles input and GL; False runs both here
+        """
         clock = pygame.time.Clock()
         last_time = pygame.time.get_ticks() / 1000.0  # Convert to seconds
         
         print("\n🚗 Enhanced 3D Maze City Simulation")
-        print("🔧 Loading complete! Navigate the optimized 3x3 road grid...")
+        print(f"🔧 Loading complete! Navigate the {self.road.columns}x{self.road.rows} road grid...")
         print(f"🏙️ City ready: {len(self.city.buildings)} buildings in themed districts")
-        print(f"🛣️ Road network: 3x3 grid with 9 intersections (64% fewer calculations)")
+        print(f"🛣️ Road network: {self.road.columns}x{self.road.rows} grid with "
+              f"{len(self.road.get_intersections())} intersections")
         print("📊 Real-time FPS monitoring enabled!")
+        self.print_controls()
         
         # Compile city geometry to GPU display list for performance
         print("⚡ Compiling static geometry to GPU...")
-        self.city.compile_static_geometry()
+        self.city_renderer.compile_static_geometry()
+        
+        # Always record stage history so the overlay can explain a past hitch
+        if self.stage_timer is None:
+            self.stage_timer = self.profiler
+        
+        if threaded:
+            self.sim_thread = SimulationThread(self)
+            self.sim_thread.start()
+            print("🧵 Simulation running on its own thread")
         
         while self.running:
             # Simple FPS tracking
             self.current_fps = clock.get_fps()
             
+            self.profiler.begin_frame()
+            
             # Handle input events
-            self.handle_events()
+            with self.stage('handle_events'):
+                self.handle_events()
             
             # Update frame count
             self.frame_count += 1
             
-            # Render frame
-            self.render()
+            if self.sim_thread is not None:
+                # Latest published simulation step, blended toward the present
+                snapshot = self.sim_thread.acquire()
+                self.render(self.sim_thread.alpha(snapshot), snapshot)
+            else:
+                # Fixed-step simulation for the time since the last frame
+                now = pygame.time.get_ticks() / 1000.0
+                alpha = self.advance(now - last_time)
+                last_time = now
+                self.render(alpha)
+            self.profiler.end_frame()
             
             # Swap buffers
             pygame.display.flip()
@@ -557,16 +549,22 @@ class CitySimulation:
             # Cap at 60 FPS
             clock.tick(60)
         
-        # Cleanup GPU resources
-        self.city.cleanup()
-        self.road.cleanup()
-        self.weather.cleanup()
-        
-        # Cleanup text texture cache
-        for tex_id, _ in self.text_texture_cache.values():
-            glDeleteTextures([tex_id])
-        self.text_texture_cache.clear()
-        print("🧹 UI text texture cache cleaned up")
+        # Stop worker threads and cleanup GPU resources
+        if self.sim_thread is not None:
+            self.sim_thread.stop()
+            self.sim_thread = None
+        self.city.stop_streaming()
+        self.car.stop_autopilot()
+        self.city_renderer.cleanup()
+        self.road_renderer.cleanup()
+        self.car_renderer.cleanup()
+        self.traffic_renderer.cleanup()
+        self.weather_renderer.cleanup()
+        delete_primitive_buffers()
+        
+        self.text_renderer.cleanup()
+        self.profiler.cleanup()
+        print("🧹 HUD glyph atlas cleaned up")
         
         pygame.quit()
         print(f"\n✅ Optimized simulation closed! Average FPS: {self.current_fps:.1f}")
@@ -574,8 +572,8 @@ class CitySimulation:
 if __name__ == "__main__":
     simulation = None
     try:
-        simulation = CitySimulation()
-        simulation.run()
+        simulation = CitySimulation(baked_sky="--baked-sky" in sys.argv[1:])
+        simulation.run(threaded="--single-thread" not in sys.argv[1:])
     except Exception as e:
         print(f"\n❌ Error: {e}")
         print("Pastikan semua library terinstall:")
@@ -584,11 +582,15 @@ if __name__ == "__main__":
         # Ensure cleanup even if error occurs
         if simulation is not None:
             try:
-                simulation.city.cleanup()
-                simulation.road.cleanup()
-                simulation.weather.cleanup()
-                # Cleanup text cache
-                for tex_id, _ in simulation.text_texture_cache.values():
-                    glDeleteTextures([tex_id])
+                if simulation.sim_thread is not None:
+                    simulation.sim_thread.stop()
+                simulation.city_renderer.cleanup()
+                simulation.road_renderer.cleanup()
+                simulation.car_renderer.cleanup()
+                simulation.traffic_renderer.cleanup()
+                simulation.weather_renderer.cleanup()
+                delete_primitive_buffers()
+                simulation.text_renderer.cleanup()
+                simulation.profiler.cleanup()
             except:
                 pass
\ No newline at end of file
@@ -0,0 +1,137 @@
+# primitives.py - Shared unit meshes (sphere, cylinder, disc) cached in GPU buffers
+#
+# Vertex and normal arrays are built once per tessellation key with
+# vectorized NumPy and uploaded to a VertexBuffer on first use. Drawing a
+# primitive is then a scale transform plus one glDrawArrays call, instead
+# of per-vertex trigonometry and immediate-mode calls every frame.
+from functools import lru_cache
+import numpy as np
+from OpenGL.GL import *
+from gl_buffers import VertexBuffer, vbo_supported
+
+_buffers = {}  # (kind, key...) -> VertexBuffer, valid for the current GL context
+
+
+@lru_cache(maxsize=None)
+def sphere_vertices(slices=16, stacks=16):
+    """Unit UV sphere as (N, 6) position + normal triangle rows
+
+    Same tessellation as the old immediate-mode draw_sphere: stacks run
+    from -z to +z, slices around the z axis.
+    """
+    lat = np.pi * (-0.5 + np.arange(stacks + 1) / stacks)
+    lng = 2 * np.pi * np.arange(slices + 1) / slices
+    ring_r = np.cos(lat)[:, None]
+    grid = np.stack([np.cos(lng)[None, :] * ring_r,
+                     np.sin(lng)[None, :] * ring_r,
+                     np.broadcast_to(np.sin(lat)[:, None], (stacks + 1, slices + 1))], axis=-1)
+    v00 = grid[:-1, :-1]
+    v01 = grid[:-1, 1:]
+    v10 = grid[1:, :-1]
+    v11 = grid[1:, 1:]
+    points = np.stack([v00, v10, v11, v00, v11, v01], axis=2).reshape(-1, 3)
+    vertices = np.hstack([points, points]).astype(np.float32)
+    vertices.flags.writeable = False  # Shared by every caller
+    return vertices
+
+
+def _ring(segments):
+    angle = 2.0 * np.pi * np.arange(segments + 1) / segments
+    return np.cos(angle), np.sin(angle)
+
+
+@lru_cache(maxsize=None)
+def disc_vertices(segments=16, facing=1.0):
+    """Unit disc in the z=0 plane as a triangle fan unrolled to (N, 6) rows
+
+    facing: +1.0 or -1.0, the normal direction along z. The winding is the
+    same for both sides, as in the immediate-mode wheel rims.
+    """
+    cos_a, sin_a = _ring(segments)
+    rim = np.column_stack([cos_a, sin_a, np.zeros(segments + 1)])
+    tris = np.zeros((segments, 3, 3))
+    tris[:, 1] = rim[:-1]
+    tris[:, 2] = rim[1:]
+    points = tris.reshape(-1, 3)
+    normals = np.tile([0.0, 0.0, facing], (len(points), 1))
+    vertices = np.hstack([points, normals]).astype(np.float32)
+    vertices.flags.writeable = False
+    return vertices
+
+
+@lru_cache(maxsize=None)
+def cylinder_vertices(segments=16):
+    """Closed unit cylinder (radius 1, z from -0.5 to 0.5) as (N, 6) rows"""
+    cos_a, sin_a = _ring(segments)
+    front = np.column_stack([cos_a, sin_a, np.full(segments + 1, 0.5)])
+    back = np.column_stack([cos_a, sin_a, np.full(segments + 1, -0.5)])
+    side_normals = np.column_stack([cos_a, sin_a, np.zeros(segments + 1)])
+
+    # Side wall: quad strip front/back pairs as two triangles per segment
+    quad = np.stack([front[:-1], back[:-1], back[1:], front[:-1], back[1:], front[1:]], axis=1)
+    quad_normals = np.stack([side_normals[:-1], side_normals[:-1], side_normals[1:],
+                             side_normals[:-1], side_normals[1:], side_normals[1:]], axis=1)
+    side = np.hstack([quad.reshape(-1, 3), quad_normals.reshape(-1, 3)])
+
+    caps = []
+    for facing in (1.0, -1.0):
+        cap = np.array(disc_vertices(segments, facing))
+        cap[:, 2] = 0.5 * facing
+        caps.append(cap)
+    vertices = np.vstack([side] + caps).astype(np.float32)
+    vertices.flags.writeable = False
+    return vertices
+
+
+def _draw(kind, builder, *key):
+    """Draw a cached unit mesh with the current modelview"""
+    vertices = builder(*key)
+    # Normals of the unit mesh are scaled by the draw transform
+    glEnable(GL_NORMALIZE)
+    if vbo_supported():
+        buffer = _buffers.get((kind,) + key)
+        if buffer is None:
+            buffer = _buffers[(kind,) + key] = VertexBuffer(vertices, ('position', 'normal'))
+        buffer.draw(GL_TRIANGLES)
+    else:
+        # Client-side arrays (no buffer objects)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 24, vertices)
+        glNormalPointer(GL_FLOAT, 24, vertices[:, 3:])
+        glDrawArrays(GL_TRIANGLES, 0, len(vertices))
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+    glDisable(GL_NORMALIZE)
+
+
+def draw_sphere(radius, slices=16, stacks=16):
+    """Sphere centered on the origin"""
+    glPushMatrix()
+    glScalef(radius, radius, radius)
+    _draw('sphere', sphere_vertices, slices, stacks)
+    glPopMatrix()
+
+
+def draw_cylinder(radius, height, segments=16):
+    """Closed cylinder along z, centered on the origin"""
+    glPushMatrix()
+    glScalef(radius, radius, height)
+    _draw('cylinder', cylinder_vertices, segments)
+    glPopMatrix()
+
+
+def draw_disc(radius, z=0.0, segments=16, facing=1.0):
+    """Flat disc parallel to the xy plane at height z, normal +z or -z"""
+    glPushMatrix()
+    glTranslatef(0, 0, z)
+    glScalef(radius, radius, 1.0)
+    _draw('disc', disc_vertices, segments, facing)
+    glPopMatrix()
+
+
+def delete_primitive_buffers():
+    """Release every cached primitive buffer (before the GL context goes away)"""
+    for buffer in _buffers.values():
+        buffer.delete()
+    _buffers.clear()
@@ -0,0 +1,290 @@
+# profiler.py - Frame-stage profiler with ring-buffer history and HUD overlay
+#
+# FrameProfiler is a stage timer (see stages.py): every simulation.stage(name)
+# block on the GL thread is timed on the CPU with perf_counter_ns and, where
+# timer queries exist, on the GPU with GL_TIME_ELAPSED. Per-frame totals go
+# into fixed-size NumPy ring buffers; the overlay draws the recent frames as
+# stacked bars and lists p50/p95/p99 per stage.
+import ctypes
+import threading
+import time
+from collections import deque
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.raw.GL.VERSION.GL_3_3 import glGetQueryObjectui64v as _query_result_ui64
+from gl_buffers import VertexBuffer, vbo_supported
+from stages import NULL_STAGE
+
+HISTORY_FRAMES = 240  # Ring buffer length (4 s at 60 FPS)
+MAX_STAGES = 32       # Ring buffer columns; later stage names are not recorded
+QUERY_LATENCY = 3     # Frames before GPU results are read (no pipeline stall)
+PERCENTILES = (50, 95, 99)
+
+OVERLAY_FRAMES = 120     # Bars drawn in the graph
+BAR_WIDTH = 3            # Pixels per frame bar
+GRAPH_HEIGHT = 100       # Pixels for GRAPH_RANGE_MS
+GRAPH_RANGE_MS = 50.0
+FRAME_BUDGET_MS = 1000.0 / 60.0
+OVERLAY_REFRESH = 15     # Frames between percentile text updates (readable numbers)
+LINE_HEIGHT = 20
+COLUMN_OFFSETS = (0, 210, 270, 330, 400)  # Stage, CPU p50, p95, p99, GPU p50 (proportional font)
+
+STAGE_COLORS = (
+    (0.35, 0.75, 1.0), (1.0, 0.6, 0.2), (0.4, 0.9, 0.4), (1.0, 0.35, 0.35),
+    (0.8, 0.5, 1.0), (1.0, 0.9, 0.3), (0.3, 0.9, 0.85), (1.0, 0.5, 0.8),
+)
+OTHER_COLOR = (0.5, 0.5, 0.5)  # Frame time outside any stage
+
+
+def timer_queries_supported():
+    """Check for GL_TIME_ELAPSED queries in the current context"""
+    try:
+        query = glGenQueries(1)[0]
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        glEndQuery(GL_TIME_ELAPSED)
+        glDeleteQueries(1, [query])
+        return True
+    except Exception:
+        return False
+
+
+class FrameProfiler:
+    """Stage timer keeping the last HISTORY_FRAMES frames per stage
+
+    Attach with ``simulation.stage_timer = profiler`` and bracket every frame
+    with begin_frame() / end_frame(). Stages entered on other threads (the
+    simulation worker) are not recorded.
+    """
+
+    def __init__(self, history=HISTORY_FRAMES):
+        self.history = history
+        self.names = []
+        self.columns = {}  # stage name -> ring buffer column
+        self.cpu_ms = np.zeros((history, MAX_STAGES))
+        self.gpu_ms = np.full((history, MAX_STAGES), np.nan)  # NaN until the query result arrives
+        self.frame_ms = np.zeros(history)
+        self.frames = 0  # Frames recorded so far
+        self.current = np.zeros(MAX_STAGES, dtype=np.int64)  # ns of the frame in progress
+        self.frame_start = None
+        self.gl_thread = threading.get_ident()
+
+        # GPU timer queries: recycled query objects, results read QUERY_LATENCY frames later
+        self.gpu_timing = False
+        self.free_queries = []
+        self.frame_queries = []  # (column, query) issued this frame
+        self.pending = deque()   # (frame, [(column, query), ...])
+        self.query_active = False
+
+        self.overlay_buffer = None  # Streamed bar quads
+        self.summary = []  # (cells, color) lines of the overlay
+        self.summary_frame = -OVERLAY_REFRESH
+        self.summary_text = None  # Text vertex rows of self.summary
+        self.summary_key = None   # (x, y, atlas uploads) the rows were built for
+
+    def setup_gl_resources(self):
+        """Call on the GL thread once the context is current"""
+        self.gl_thread = threading.get_ident()
+        self.gpu_timing = timer_queries_supported()
+        if vbo_supported():
+            self.overlay_buffer = VertexBuffer(np.zeros((0, 7), dtype=np.float32), ('position', 'color'),
+                                               GL_STREAM_DRAW)
+
+    def __call__(self, name):
+        if threading.get_ident() != self.gl_thread:
+            return NULL_STAGE
+        column = self.columns.get(name)
+        if column is None:
+            if len(self.names) >= MAX_STAGES:
+                return NULL_STAGE
+            column = self.columns[name] = len(self.names)
+            self.names.append(name)
+        return _ProfileScope(self, column)
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Store the frame's stage totals in the ring buffer"""
+        if self.frame_start is None:
+            return
+        row = self.frames % self.history
+        self.cpu_ms[row] = self.current / 1e6
+        self.gpu_ms[row] = np.nan
+        self.frame_ms[row] = (time.perf_counter_ns() - self.frame_start) / 1e6
+        self.current[:] = 0
+        self.frame_start = None
+        if self.frame_queries:
+            self.pending.append((self.frames, self.frame_queries))
+            self.frame_queries = []
+        self.frames += 1
+        self.collect_gpu_results()
+
+    def begin_query(self, column):
+        """GL_TIME_ELAPSED query for a stage (None when unavailable or nested)"""
+        if not self.gpu_timing or self.query_active:
+            return None
+        if not self.free_queries:
+            self.free_queries.extend(int(query) for query in glGenQueries(16))
+        query = self.free_queries.pop()
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        self.query_active = True
+        self.frame_queries.append((column, query))
+        return query
+
+    def end_query(self):
+        glEndQuery(GL_TIME_ELAPSED)
+        self.query_active = False
+
+    def collect_gpu_results(self):
+        """Read back the query results of frames at least QUERY_LATENCY old"""
+        result = ctypes.c_uint64()
+        while self.pending and self.frames - self.pending[0][0] >= QUERY_LATENCY:
+            frame, queries = self.pending[0]
+            if not glGetQueryObjectuiv(queries[-1][1], GL_QUERY_RESULT_AVAILABLE):
+                return  # GPU still behind; try again next frame
+            self.pending.popleft()
+            totals = np.zeros(MAX_STAGES)
+            for column, query in queries:
+                _query_result_ui64(query, GL_QUERY_RESULT, ctypes.byref(result))
+                totals[column] += result.value / 1e6
+                self.free_queries.append(query)
+            if self.frames - frame <= self.history:
+                self.gpu_ms[frame % self.history] = totals
+
+    def recorded(self):
+        """Ring buffer rows holding frames, oldest first"""
+        count = min(self.frames, self.history)
+        return np.arange(self.frames - count, self.frames) % self.history
+
+    def percentiles(self):
+        """{stage: (cpu p50, p95, p99), gpu p50/p95/p99 or None} over the history,
+        plus 'frame' for the whole frame"""
+        rows = self.recorded()
+        if len(rows) == 0:
+            return {}
+        stages = len(self.names)
+        cpu = np.percentile(self.cpu_ms[rows, :stages], PERCENTILES, axis=0)
+        gpu = self.gpu_ms[rows, :stages]
+        measured = ~np.isnan(gpu).all(axis=1)
+        gpu = np.percentile(gpu[measured], PERCENTILES, axis=0) if measured.any() else None
+        result = {name: (tuple(cpu[:, i]), tuple(gpu[:, i]) if gpu is not None else None)
+                  for i, name in enumerate(self.names)}
+        result['frame'] = (tuple(np.percentile(self.frame_ms[rows], PERCENTILES)), None)
+        return result
+
+    def stage_color(self, column):
+        return STAGE_COLORS[column % len(STAGE_COLORS)]
+
+    def graph_vertices(self, x, y):
+        """(N * 4, 7) quads: one stacked bar per recent frame, bottom at y"""
+        rows = self.recorded()[-OVERLAY_FRAMES:]
+        stages = len(self.names)
+        if len(rows) == 0 or stages == 0:
+            return np.zeros((0, 7), dtype=np.float32)
+        values = np.empty((len(rows), stages + 1))
+        values[:, :stages] = self.cpu_ms[rows, :stages]
+        values[:, stages] = np.maximum(self.frame_ms[rows] - values[:, :stages].sum(axis=1), 0.0)
+        tops = np.minimum(np.cumsum(values, axis=1), GRAPH_RANGE_MS) * (GRAPH_HEIGHT / GRAPH_RANGE_MS)
+        bottoms = tops - np.minimum(values, tops)
+
+        frame_index, stage_index = np.indices(tops.shape)
+        left = x + frame_index * BAR_WIDTH
+        right = left + BAR_WIDTH - 1
+        colors = np.array([self.stage_color(i) for i in range(stages)] + [OTHER_COLOR])
+
+        quads = np.empty(tops.shape + (4, 7), dtype=np.float32)
+        quads[..., 0, 0], quads[..., 0, 1] = left, y - bottoms
+        quads[..., 1, 0], quads[..., 1, 1] = right, y - bottoms
+        quads[..., 2, 0], quads[..., 2, 1] = right, y - tops
+        quads[..., 3, 0], quads[..., 3, 1] = left, y - tops
+        quads[..., 2] = 0.0
+        quads[..., 3:6] = colors[stage_index][:, :, None, :]
+        quads[..., 6] = 0.9
+        return quads.reshape(-1, 7)
+
+    def refresh_summary(self):
+        self.summary = [(("Stage (ms)", "p50", "p95", "p99", "GPU p50"), (1.0, 1.0, 1.0))]
+        for name, (cpu, gpu) in self.percentiles().items():
+            column = self.columns.get(name)
+            color = self.stage_color(column) if column is not None else (1.0, 1.0, 1.0)
+            gpu_text = f"{gpu[0]:.2f}" if gpu is not None else "-"
+            self.summary.append(((name, f"{cpu[0]:.2f}", f"{cpu[1]:.2f}", f"{cpu[2]:.2f}", gpu_text), color))
+        self.summary_frame = self.frames
+        self.summary_text = None
+
+    def draw_overlay(self, text_renderer, x, y):
+        """Draw the frame graph now and queue the percentile table on text_renderer
+
+        Expects the 2D orthographic HUD projection of CitySimulation.draw_ui.
+        """
+        if self.frames - self.summary_frame >= OVERLAY_REFRESH:
+            self.refresh_summary()
+        # The table only changes every OVERLAY_REFRESH frames: queue the same vertices until then
+        key = (x, y, text_renderer.atlas.uploads if text_renderer.atlas is not None else None)
+        if self.summary_text is None or self.summary_key != key:
+            rows = [text_renderer.vertices(text, x + offset, y + i * LINE_HEIGHT, color + (1.0,))
+                    for i, (cells, color) in enumerate(self.summary)
+                    for offset, text in zip(COLUMN_OFFSETS, cells)]
+            self.summary_text = np.vstack(rows)
+            self.summary_key = (x, y, text_renderer.atlas.uploads)
+        text_renderer.add_vertices(self.summary_text)
+
+        bottom = y + len(self.summary) * LINE_HEIGHT + GRAPH_HEIGHT + 10
+        width = OVERLAY_FRAMES * BAR_WIDTH
+        budget = bottom - FRAME_BUDGET_MS * GRAPH_HEIGHT / GRAPH_RANGE_MS
+        frame_lines = np.array([
+            # Graph background, then the 60 FPS budget line
+            (x, bottom, 0, 0.0, 0.0, 0.0, 0.5), (x + width, bottom, 0, 0.0, 0.0, 0.0, 0.5),
+            (x + width, bottom - GRAPH_HEIGHT, 0, 0.0, 0.0, 0.0, 0.5), (x, bottom - GRAPH_HEIGHT, 0, 0.0, 0.0, 0.0, 0.5),
+            (x, budget, 0, 1.0, 1.0, 1.0, 0.8), (x + width, budget, 0, 1.0, 1.0, 1.0, 0.8),
+            (x + width, budget + 1, 0, 1.0, 1.0, 1.0, 0.8), (x, budget + 1, 0, 1.0, 1.0, 1.0, 0.8),
+        ], dtype=np.float32)
+        vertices = np.vstack([frame_lines[:4], self.graph_vertices(x, bottom), frame_lines[4:]])
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        if self.overlay_buffer is not None:
+            self.overlay_buffer.upload(vertices)
+            self.overlay_buffer.draw(GL_QUADS)
+        else:
+            # Client-side arrays (no buffer objects)
+            stride = vertices.strides[0]
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(3, GL_FLOAT, stride, vertices)
+            glColorPointer(4, GL_FLOAT, stride, vertices[:, 3:])
+            glDrawArrays(GL_QUADS, 0, len(vertices))
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+        glDisable(GL_BLEND)
+
+    def cleanup(self):
+        """Release query objects and the overlay buffer"""
+        queries = self.free_queries + [query for _, frame in self.pending for _, query in frame]
+        queries += [query for _, query in self.frame_queries]
+        if queries:
+            glDeleteQueries(len(queries), queries)
+        self.free_queries, self.frame_queries = [], []
+        self.pending.clear()
+        if self.overlay_buffer is not None:
+            self.overlay_buffer.delete()
+            self.overlay_buffer = None
+
+
+class _ProfileScope:
+    __slots__ = ('profiler', 'column', 'start', 'query')
+
+    def __init__(self, profiler, column):
+        self.profiler = profiler
+        self.column = column
+
+    def __enter__(self):
+        self.query = self.profiler.begin_query(self.column)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.current[self.column] += time.perf_counter_ns() - self.start
+        if self.query is not None:
+            self.profiler.end_query()
+        return False
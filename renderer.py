@@ -0,0 +1,21 @@
+# renderer.py - Common interface for OpenGL front-ends of simulation systems
+#
+# Simulation modules (car, city, road, weather, camera) never import OpenGL.
+# Each one has a matching *_renderer module that owns every GL resource and
+# draw call, so the simulation core can run headless (see headless.py).
+
+
+class Renderer:
+    """Base class for GL front-ends: create resources, draw, release"""
+
+    def setup_gl_resources(self):
+        """Create textures/buffers after the GL context exists"""
+        pass
+
+    def render(self):
+        """Draw the subsystem for the current frame"""
+        pass
+
+    def cleanup(self):
+        """Release GPU resources"""
+        pass
@@ -1,325 +1,200 @@
-# road.py - Enhanced Grid-Based Road System
-from OpenGL.GL import *
-from OpenGL.GLU import *
-import random
+# road.py - Enhanced Grid-Based Road System (network data, no GL calls)
+#
+# Road is the single source of truth for the street layout: road positions,
+# city blocks, intersections, spawn points and street lamp positions are all
+# derived from (columns, rows, spacing, road_width, world_size).
+from bisect import bisect_left
 import numpy as np
 
+# Street lamps: every LAMP_SPACING units along each road, LAMP_OFFSET from its center
+LAMP_SPACING = 25
+LAMP_OFFSET = 8
+LAMP_INTERSECTION_CLEARANCE = 10
+# Empty belt between the outermost roads and the world edge (perimeter buildings)
+WORLD_MARGIN = 100
+
+
+def grid_positions(count, spacing):
+    """Road center coordinates for `count` roads, centered on the origin"""
+    offset = (count - 1) / 2.0
+    return [(i - offset) * spacing for i in range(count)]
+
+
+def nearest_distance(sorted_values, value):
+    """Distance from value to the closest entry of a sorted list"""
+    if not sorted_values:
+        return float('inf')
+    i = bisect_left(sorted_values, value)
+    best = float('inf')
+    if i < len(sorted_values):
+        best = sorted_values[i] - value
+    if i > 0:
+        best = min(best, value - sorted_values[i - 1])
+    return best
+
+
+def nearest_distances(sorted_values, values):
+    """nearest_distance for an array of values (same floating point results)"""
+    values = np.asarray(values, dtype=np.float64)
+    if not len(sorted_values):
+        return np.full(values.shape, np.inf)
+    roads = np.asarray(sorted_values, dtype=np.float64)
+    i = np.searchsorted(roads, values, 'left')
+    above = np.where(i < len(roads), roads[np.minimum(i, len(roads) - 1)] - values, np.inf)
+    below = np.where(i > 0, values - roads[np.maximum(i - 1, 0)], np.inf)
+    return np.minimum(above, below)
+
+
 class Road:
-    def __init__(self):
-        # Optimized 3x3 grid system for better performance
-        self.road_width = 15
-        self.world_size = 160  # Reduced from 200 for tighter city
-        
-        # Simplified road network coordinates (3x3 grid)
-        self.horizontal_roads = [-30, 0, 30]  # Z-coordinates (3 roads)
-        self.vertical_roads = [-30, 0, 30]    # X-coordinates (3 roads)
-        
-        # City block definitions (4 larger blocks: 50x50 units each)
+    def __init__(self, columns=3, rows=None, spacing=30, road_width=15, world_size=None):
+        """columns x rows grid: `columns` vertical (x) roads, `rows` horizontal (z) roads"""
+        if columns < 1 or (rows is not None and rows < 1):
+            raise ValueError("Road grid needs at least one road in each direction")
+        self.columns = columns
+        self.rows = columns if rows is None else rows
+        self.spacing = spacing
+        self.road_width = road_width
+
+        # Road network coordinates (default 3x3 grid: [-30, 0, 30])
+        self.horizontal_roads = grid_positions(self.rows, spacing)  # Z-coordinates
+        self.vertical_roads = grid_positions(columns, spacing)      # X-coordinates
+
+        if world_size is None:
+            span = max(self.horizontal_roads[-1], self.vertical_roads[-1]) * 2
+            world_size = span + WORLD_MARGIN  # 160 for the default 3x3 grid
+        self.world_size = world_size
+
+        self._street_lights = None  # Cached (N, 2) lamp array, see street_light_array()
+
+        # City blocks: one per cell between neighbouring roads (4 blocks for 3x3)
         self.city_blocks = []
-        block_size = 50
-        block_positions = [(-15, -15), (15, -15), (-15, 15), (15, 15)]  # Plus pattern centers
-        
-        for center_x, center_z in block_positions:
-            self.city_blocks.append({
-                'center_x': center_x,
-                'center_z': center_z, 
-                'size': block_size
-            })
-        
-        # Performance optimization
-        self.road_display_list = None
-        self.marking_display_list = None
-        
-        print(f"🛣️  Optimized road system initialized:")
-        print(f"   Grid: 3x3 roads creating 4 large city blocks")
-        print(f"   Intersections: 9 (reduced from 25)")
+        for z0, z1 in zip(self.horizontal_roads, self.horizontal_roads[1:]):
+            for x0, x1 in zip(self.vertical_roads, self.vertical_roads[1:]):
+                self.city_blocks.append({
+                    'center_x': (x0 + x1) / 2.0,
+                    'center_z': (z0 + z1) / 2.0,
+                    'size': spacing
+                })
+
+        print(f"🛣️  Road system initialized:")
+        print(f"   Grid: {self.columns}x{self.rows} roads creating {len(self.city_blocks)} city blocks")
+        print(f"   Intersections: {self.columns * self.rows}")
         print(f"   World bounds: ±{self.world_size//2} units")
-        print(f"   Performance: 64% fewer intersection calculations")
-    
+
     def get_city_blocks(self):
         """Return city block information for building placement"""
         return self.city_blocks
-    
+
+    def get_city_blocks_in_rect(self, min_x, min_z, max_x, max_z):
+        """Blocks whose center lies in [min, max) - row-major, same order as city_blocks"""
+        x_centers = [(a + b) / 2.0 for a, b in zip(self.vertical_roads, self.vertical_roads[1:])]
+        z_centers = [(a + b) / 2.0 for a, b in zip(self.horizontal_roads, self.horizontal_roads[1:])]
+        x0, x1 = bisect_left(x_centers, min_x), bisect_left(x_centers, max_x)
+        z0, z1 = bisect_left(z_centers, min_z), bisect_left(z_centers, max_z)
+        blocks_per_row = len(x_centers)
+        return [self.city_blocks[iz * blocks_per_row + ix] for iz in range(z0, z1) for ix in range(x0, x1)]
+
+    def get_intersections(self):
+        """(x, z) center of every intersection"""
+        return [(x, z) for x in self.vertical_roads for z in self.horizontal_roads]
+
+    def intersection_index(self, column, row):
+        """Node index of the intersection of vertical road `column` and horizontal road `row`"""
+        return row * self.columns + column
+
+    def get_intersection_graph(self):
+        """Intersections as a graph: (positions, neighbors)
+
+        positions: (N, 2) x/z per node, row-major (see intersection_index)
+        neighbors: (N, 4) node indices along the roads (-x, +x, -z, +z), -1 where there is none
+        """
+        xs, zs = np.meshgrid(self.vertical_roads, self.horizontal_roads)
+        positions = np.column_stack([xs.ravel(), zs.ravel()]).astype(np.float64)
+        column = np.arange(len(positions)) % self.columns
+        row = np.arange(len(positions)) // self.columns
+        index = np.arange(len(positions))
+        neighbors = np.column_stack([
+            np.where(column > 0, index - 1, -1),
+            np.where(column < self.columns - 1, index + 1, -1),
+            np.where(row > 0, index - self.columns, -1),
+            np.where(row < self.rows - 1, index + self.columns, -1),
+        ])
+        return positions, neighbors
+
     def is_road_area(self, x, z, buffer=2.0):
         """Check if coordinates are in road area (with buffer for safety)"""
         road_half_width = (self.road_width / 2.0) + buffer
-        
-        # Check if in any horizontal road
-        for road_z in self.horizontal_roads:
-            if abs(z - road_z) <= road_half_width:
-                return True
-        
-        # Check if in any vertical road  
-        for road_x in self.vertical_roads:
-            if abs(x - road_x) <= road_half_width:
-                return True
-                
-        return False
-    
+        return (nearest_distance(self.horizontal_roads, z) <= road_half_width or
+                nearest_distance(self.vertical_roads, x) <= road_half_width)
+
+    def road_area_mask(self, x, z, buffer=2.0):
+        """is_road_area for arrays of coordinates"""
+        road_half_width = (self.road_width / 2.0) + buffer
+        return ((nearest_distances(self.horizontal_roads, z) <= road_half_width) |
+                (nearest_distances(self.vertical_roads, x) <= road_half_width))
+
     def is_intersection(self, x, z, buffer=5.0):
         """Check if coordinates are at an intersection"""
-        near_vertical = any(abs(x - road_x) <= buffer for road_x in self.vertical_roads)
-        near_horizontal = any(abs(z - road_z) <= buffer for road_z in self.horizontal_roads)
-        return near_vertical and near_horizontal
-    
+        return (nearest_distance(self.vertical_roads, x) <= buffer and
+                nearest_distance(self.horizontal_roads, z) <= buffer)
+
     def get_spawn_position(self):
-        """Get a good spawn position in middle of a road segment for 3x3 grid"""
-        # Spawn in center road (index 1), between intersections
-        spawn_x = self.vertical_roads[1]  # Center vertical road (0)
-        spawn_z = (self.horizontal_roads[0] + self.horizontal_roads[1]) / 2  # Between first two roads (-15)
+        """Spawn on the center vertical road, midway between two intersections"""
+        spawn_x = self.vertical_roads[self.columns // 2]
+        spawn_z = self.horizontal_roads[self.rows // 2] - self.spacing / 2.0  # (-15 for 3x3)
         return spawn_x, 0.3, spawn_z
 
-    def draw_cube(self, size):
-        """Draw cube manually tanpa GLUT"""
-        s = size / 2.0
-        glBegin(GL_QUADS)
-        # Front
-        glNormal3f(0, 0, 1)
-        glVertex3f(-s, -s, s); glVertex3f(s, -s, s); glVertex3f(s, s, s); glVertex3f(-s, s, s)
-        # Back
-        glNormal3f(0, 0, -1)
-        glVertex3f(-s, -s, -s); glVertex3f(-s, s, -s); glVertex3f(s, s, -s); glVertex3f(s, -s, -s)
-        # Top
-        glNormal3f(0, 1, 0)
-        glVertex3f(-s, s, -s); glVertex3f(-s, s, s); glVertex3f(s, s, s); glVertex3f(s, s, -s)
-        # Bottom
-        glNormal3f(0, -1, 0)
-        glVertex3f(-s, -s, -s); glVertex3f(s, -s, -s); glVertex3f(s, -s, s); glVertex3f(-s, -s, s)
-        # Right
-        glNormal3f(1, 0, 0)
-        glVertex3f(s, -s, -s); glVertex3f(s, s, -s); glVertex3f(s, s, s); glVertex3f(s, -s, s)
-        # Left
-        glNormal3f(-1, 0, 0)
-        glVertex3f(-s, -s, -s); glVertex3f(-s, -s, s); glVertex3f(-s, s, s); glVertex3f(-s, s, -s)
-        glEnd()
-    
-    def generate_asphalt_texture(self):
-        """Generate procedural noise texture for asphalt"""
-        width, height = 128, 128
-        texture_data = bytearray()
-        
-        # Simple noise generation
-        import random
-        for i in range(width * height):
-            # Abu-abu gelap dengan noise
-            base = 60
-            noise = random.randint(-15, 15)
-            c = max(0, min(255, base + noise))
-            texture_data.append(c) # R
-            texture_data.append(c) # G
-            texture_data.append(c) # B
-        
-        # Create GL Texture
-        tex_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, tex_id)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
-        
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, width, height, 0, 
-                     GL_RGB, GL_UNSIGNED_BYTE, texture_data)
-        
-        return tex_id
-
-    def draw_grid_roads(self):
-        """Draw the complete 4x4 road grid with optimized rendering"""
-        if not hasattr(self, 'road_texture'):
-            self.road_texture = self.generate_asphalt_texture()
-        
-        glEnable(GL_TEXTURE_2D)
-        glBindTexture(GL_TEXTURE_2D, self.road_texture)
-        glColor3f(1.0, 1.0, 1.0)  # White to show texture properly
-        
-        # Draw horizontal roads
-        for road_z in self.horizontal_roads:
-            self.draw_single_road(
-                center_x=0, center_z=road_z,
-                width=self.world_size, length=self.road_width,
-                horizontal=True
-            )
-        
-        # Draw vertical roads  
-        for road_x in self.vertical_roads:
-            self.draw_single_road(
-                center_x=road_x, center_z=0,
-                width=self.road_width, length=self.world_size,
-                horizontal=False
-            )
-            
-        glDisable(GL_TEXTURE_2D)
-    
-    def draw_single_road(self, center_x, center_z, width, length, horizontal=True):
-        """Draw a single road segment with proper texture mapping"""
-        w = width / 2.0
-        l = length / 2.0
-        
-        # Texture repetition based on road dimensions
-        if horizontal:
-            tex_u = width / 10.0  # Repeat every 10 units
-            tex_v = length / 10.0
-        else:
-            tex_u = width / 10.0
-            tex_v = length / 10.0
-        
-        glPushMatrix()
-        glTranslatef(center_x, 0.01, center_z)  # Slight elevation to prevent z-fighting
-        
-        glBegin(GL_QUADS)
-        glNormal3f(0, 1, 0)
-        glTexCoord2f(0, 0);      glVertex3f(-w, 0, -l)
-        glTexCoord2f(tex_u, 0);  glVertex3f(w, 0, -l) 
-        glTexCoord2f(tex_u, tex_v); glVertex3f(w, 0, l)
-        glTexCoord2f(0, tex_v);     glVertex3f(-w, 0, l)
-        glEnd()
-        
-        glPopMatrix()
-
-    def draw_realistic_lane_markings(self):
-        """Draw realistic road markings: yellow center lines, white edges, crosswalks"""
-        glDisable(GL_TEXTURE_2D)  # No texture for markings
-        glLineWidth(3.0)  # Thicker lines for visibility
-        
-        # Yellow dashed center lines on all roads
-        glColor3f(1.0, 1.0, 0.0)  # Yellow
-        self.draw_dashed_center_lines()
-        
-        # White solid edge lines
-        glColor3f(1.0, 1.0, 1.0)  # White
-        self.draw_solid_edge_lines()
-        
-        # Crosswalk markings at intersections
-        self.draw_crosswalk_markings()
-        
-        glLineWidth(1.0)  # Reset line width
-    
-    def draw_dashed_center_lines(self):
-        """Draw yellow dashed center lines on all roads"""
-        dash_length = 3.0
-        gap_length = 2.0
-        total_length = dash_length + gap_length
-        
-        glBegin(GL_LINES)
-        
-        # Horizontal road center lines
-        for road_z in self.horizontal_roads:
-            y = 0.02  # Slightly above road surface
-            for x in range(-int(self.world_size//2), int(self.world_size//2), int(total_length)):
-                # Only draw if not at intersection
-                if not any(abs(x - road_x) <= self.road_width/2 for road_x in self.vertical_roads):
-                    glVertex3f(x, y, road_z)
-                    glVertex3f(x + dash_length, y, road_z)
-        
-        # Vertical road center lines
-        for road_x in self.vertical_roads:
-            y = 0.02
-            for z in range(-int(self.world_size//2), int(self.world_size//2), int(total_length)):
-                # Only draw if not at intersection
-                if not any(abs(z - road_z) <= self.road_width/2 for road_z in self.horizontal_roads):
-                    glVertex3f(road_x, y, z)
-                    glVertex3f(road_x, y, z + dash_length)
-        
-        glEnd()
-    
-    def draw_solid_edge_lines(self):
-        """Draw white solid edge lines for all roads"""
-        edge_offset = self.road_width / 2.0 - 0.5  # Slightly inside road edge
-        y = 0.02
-        
-        glBegin(GL_LINES)
-        
-        # Horizontal roads - top and bottom edges
+    def get_spawn_points(self):
+        """Midpoint (x, y, z) of every road segment between two intersections"""
+        points = []
+        for x in self.vertical_roads:
+            for z0, z1 in zip(self.horizontal_roads, self.horizontal_roads[1:]):
+                points.append((x, 0.3, (z0 + z1) / 2.0))
+        for z in self.horizontal_roads:
+            for x0, x1 in zip(self.vertical_roads, self.vertical_roads[1:]):
+                points.append(((x0 + x1) / 2.0, 0.3, z))
+        return points
+
+    def get_street_light_positions(self):
+        """Ground (x, z) of every street lamp on both sides of every road"""
+        return [tuple(p) for p in self.street_light_array().tolist()]
+
+    def get_street_lights_in_rect(self, min_x, min_z, max_x, max_z):
+        """(N, 2) lamp positions inside [min, max)"""
+        lamps = self.street_light_array()
+        inside = ((lamps[:, 0] >= min_x) & (lamps[:, 0] < max_x) &
+                  (lamps[:, 1] >= min_z) & (lamps[:, 1] < max_z))
+        return lamps[inside]
+
+    def street_light_array(self):
+        """All lamp positions as a cached (N, 2) float array"""
+        if self._street_lights is None:
+            self._street_lights = self._generate_street_lights()
+        return self._street_lights
+
+    def _generate_street_lights(self):
+        half_world = int(self.world_size // 2)
+        steps = np.arange(-half_world, half_world + 1, LAMP_SPACING, dtype=np.float64)
+
+        def clear_of(roads):
+            # Skip intersection areas
+            if not roads:
+                return steps
+            distance = np.abs(steps[:, None] - np.asarray(roads, dtype=np.float64)[None, :]).min(axis=1)
+            return steps[distance > LAMP_INTERSECTION_CLEARANCE]
+
+        positions = []
+        # Street lights along horizontal roads (both sides)
+        along_x = clear_of(self.vertical_roads).tolist()
         for road_z in self.horizontal_roads:
-            # Top edge
-            glVertex3f(-self.world_size//2, y, road_z + edge_offset)
-            glVertex3f(self.world_size//2, y, road_z + edge_offset)
-            # Bottom edge  
-            glVertex3f(-self.world_size//2, y, road_z - edge_offset)
-            glVertex3f(self.world_size//2, y, road_z - edge_offset)
-        
-        # Vertical roads - left and right edges
-        for road_x in self.vertical_roads:
-            # Right edge
-            glVertex3f(road_x + edge_offset, y, -self.world_size//2)
-            glVertex3f(road_x + edge_offset, y, self.world_size//2)
-            # Left edge
-            glVertex3f(road_x - edge_offset, y, -self.world_size//2)
-            glVertex3f(road_x - edge_offset, y, self.world_size//2)
-        
-        glEnd()
-    
-    def draw_crosswalk_markings(self):
-        """Draw zebra crossing markings at intersections"""
-        stripe_width = 1.0
-        stripe_gap = 0.5
-        crosswalk_width = self.road_width - 2.0  # Leave some margin
-        y = 0.03  # Above other markings
-        
-        glColor3f(1.0, 1.0, 1.0)  # White crosswalks
-        
-        # Draw crosswalks at each intersection
+            for x in along_x:
+                positions.append((x, road_z - LAMP_OFFSET))
+                positions.append((x, road_z + LAMP_OFFSET))
+
+        # Street lights along vertical roads (both sides)
+        along_z = clear_of(self.horizontal_roads).tolist()
         for road_x in self.vertical_roads:
-            for road_z in self.horizontal_roads:
-                # Horizontal crosswalk (across vertical road)
-                self.draw_single_crosswalk(
-                    road_x, road_z, 
-                    width=self.road_width, length=crosswalk_width,
-                    horizontal=True
-                )
-                
-                # Vertical crosswalk (across horizontal road)  
-                self.draw_single_crosswalk(
-                    road_x, road_z,
-                    width=crosswalk_width, length=self.road_width, 
-                    horizontal=False
-                )
-    
-    def draw_single_crosswalk(self, center_x, center_z, width, length, horizontal):
-        """Draw a single crosswalk with zebra stripes"""
-        stripe_width = 1.0
-        stripe_gap = 0.5
-        y = 0.03
-        
-        if horizontal:
-            # Stripes run along width (x-direction)
-            num_stripes = int(width // (stripe_width + stripe_gap))
-            start_x = center_x - (num_stripes * (stripe_width + stripe_gap)) / 2
-            
-            glBegin(GL_QUADS)
-            for i in range(num_stripes):
-                x = start_x + i * (stripe_width + stripe_gap)
-                glVertex3f(x, y, center_z - length/2)
-                glVertex3f(x + stripe_width, y, center_z - length/2)
-                glVertex3f(x + stripe_width, y, center_z + length/2)
-                glVertex3f(x, y, center_z + length/2)
-            glEnd()
-        else:
-            # Stripes run along length (z-direction)
-            num_stripes = int(length // (stripe_width + stripe_gap))
-            start_z = center_z - (num_stripes * (stripe_width + stripe_gap)) / 2
-            
-            glBegin(GL_QUADS)
-            for i in range(num_stripes):
-                z = start_z + i * (stripe_width + stripe_gap)
-                glVertex3f(center_x - width/2, y, z)
-                glVertex3f(center_x + width/2, y, z)
-                glVertex3f(center_x + width/2, y, z + stripe_width)
-                glVertex3f(center_x - width/2, y, z + stripe_width)
-            glEnd()
-
-    def render(self):
-        """Render the complete road system with markings"""
-        # Draw the grid of roads with textures
-        self.draw_grid_roads()
-        
-        # Draw realistic lane markings over the roads
-        self.draw_realistic_lane_markings()
-        
-    def cleanup(self):
-        """Clean up OpenGL resources"""
-        if hasattr(self, 'road_texture'):
-            glDeleteTextures([self.road_texture])
-        if hasattr(self, 'road_display_list') and self.road_display_list:
-            glDeleteLists(self.road_display_list, 1)
-        if hasattr(self, 'marking_display_list') and self.marking_display_list:
-            glDeleteLists(self.marking_display_list, 1)
\ No newline at end of file
+            for z in along_z:
+                positions.append((road_x - LAMP_OFFSET, z))
+                positions.append((road_x + LAMP_OFFSET, z))
+        return np.array(positions, dtype=np.float64).reshape(-1, 2)
@@ -0,0 +1,178 @@
+# road_graph.py - Intersection graph, A* routing and background path planning (no GL)
+#
+# Nodes are the intersections of the Road grid, edges the road segments
+# between neighbouring intersections. Routes are memoized in an LRU cache
+# keyed by (source, destination); long queries run on a worker thread so
+# planning never stalls a frame.
+import heapq
+import math
+import queue
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+import numpy as np
+
+PATH_CACHE_SIZE = 512  # Routes kept in the LRU cache
+INLINE_PLAN_HOPS = 12  # Queries spanning at most this many segments are planned inline
+
+
+def lane_directions(headings):
+    """Right-hand side unit vector (x, z) for (N, 2) unit headings"""
+    return np.column_stack([-headings[:, 1], headings[:, 0]])
+
+
+class RoadGraph:
+    def __init__(self, road, cache_size=PATH_CACHE_SIZE):
+        self.road = road
+        self.positions, self.neighbors = road.get_intersection_graph()
+        self.columns = road.columns
+        self.cache_size = cache_size
+        self._paths = OrderedDict()  # (source, destination) -> tuple of nodes, LRU order
+        self._lock = threading.Lock()  # Cache is shared with the planner thread
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @property
+    def node_count(self):
+        return len(self.positions)
+
+    def grid_cell(self, node):
+        """(column, row) of a node"""
+        return node % self.columns, node // self.columns
+
+    def hops(self, source, destination):
+        """Segments on the shortest grid route (Manhattan distance in nodes)"""
+        (c0, r0), (c1, r1) = self.grid_cell(source), self.grid_cell(destination)
+        return abs(c1 - c0) + abs(r1 - r0)
+
+    def nearest_node(self, x, z):
+        """Intersection closest to (x, z)"""
+        road = self.road
+        column = min(range(road.columns), key=lambda i: abs(road.vertical_roads[i] - x))
+        row = min(range(road.rows), key=lambda j: abs(road.horizontal_roads[j] - z))
+        return road.intersection_index(column, row)
+
+    def segment_at(self, x, z, direction):
+        """(from_node, to_node) of the road segment under (x, z), oriented along
+        `direction` (degrees, Car convention); None outside the intersection grid"""
+        road = self.road
+        heading_x, heading_z = math.sin(math.radians(direction)), math.cos(math.radians(direction))
+        column = min(range(road.columns), key=lambda i: abs(road.vertical_roads[i] - x))
+        row = min(range(road.rows), key=lambda j: abs(road.horizontal_roads[j] - z))
+        on_vertical = abs(road.vertical_roads[column] - x) <= abs(road.horizontal_roads[row] - z)
+        if on_vertical:
+            # Between two horizontal roads, driving along z
+            upper = bisect_left(road.horizontal_roads, z)
+            if upper == 0 or upper == road.rows:
+                return None
+            ends = (road.intersection_index(column, upper - 1), road.intersection_index(column, upper))
+            forward = heading_z >= 0
+        else:
+            upper = bisect_left(road.vertical_roads, x)
+            if upper == 0 or upper == road.columns:
+                return None
+            ends = (road.intersection_index(upper - 1, row), road.intersection_index(upper, row))
+            forward = heading_x >= 0
+        return ends if forward else ends[::-1]
+
+    def cached_path(self, source, destination):
+        """Memoized route or None"""
+        key = (source, destination)
+        with self._lock:
+            path = self._paths.get(key)
+            if path is not None:
+                self._paths.move_to_end(key)
+                self.stats['hits'] += 1
+            return path
+
+    def shortest_path(self, source, destination):
+        """A* route as a tuple of nodes from source to destination (LRU memoized)"""
+        path = self.cached_path(source, destination)
+        if path is not None:
+            return path
+
+        positions = self.positions
+        goal = positions[destination]
+
+        def heuristic(node):
+            # Manhattan distance: exact lower bound on a grid of axis-aligned roads
+            return abs(positions[node][0] - goal[0]) + abs(positions[node][1] - goal[1])
+
+        came_from = {source: None}
+        cost = {source: 0.0}
+        frontier = [(heuristic(source), source)]
+        while frontier:
+            _, node = heapq.heappop(frontier)
+            if node == destination:
+                break
+            for neighbor in self.neighbors[node]:
+                if neighbor < 0:
+                    continue
+                neighbor = int(neighbor)
+                new_cost = cost[node] + float(np.abs(positions[neighbor] - positions[node]).sum())
+                if new_cost < cost.get(neighbor, float('inf')):
+                    cost[neighbor] = new_cost
+                    came_from[neighbor] = node
+                    heapq.heappush(frontier, (new_cost + heuristic(neighbor), neighbor))
+
+        if destination not in came_from:
+            path = ()
+        else:
+            nodes = [destination]
+            while nodes[-1] != source:
+                nodes.append(came_from[nodes[-1]])
+            path = tuple(reversed(nodes))
+
+        with self._lock:
+            self.stats['misses'] += 1
+            self._paths[(source, destination)] = path
+            while len(self._paths) > self.cache_size:
+                self._paths.popitem(last=False)
+        return path
+
+
+class PathPlanner:
+    def __init__(self, graph, background=True):
+        """Route requests against `graph`; long queries go to a worker thread"""
+        self.graph = graph
+        self.background = background
+        self.pending = set()
+        self._requests = queue.Queue()
+        self._worker = None
+
+    def request(self, source, destination):
+        """Route from source to destination, or None while it is being planned
+
+        Call again on later frames; the worker stores finished routes in the
+        graph's LRU cache.
+        """
+        path = self.graph.cached_path(source, destination)
+        if path is not None:
+            return path
+        if not self.background or self.graph.hops(source, destination) <= INLINE_PLAN_HOPS:
+            return self.graph.shortest_path(source, destination)
+        key = (source, destination)
+        if key not in self.pending:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name="path-planner", daemon=True)
+                self._worker.start()
+            self.pending.add(key)
+            self._requests.put(key)
+        return None
+
+    def _work(self):
+        while True:
+            key = self._requests.get()
+            if key is None:
+                break
+            try:
+                self.graph.shortest_path(*key)
+            except Exception as e:
+                print(f"⚠️  Route {key} planning failed: {e}")
+            self.pending.discard(key)
+
+    def stop(self):
+        """Stop the background worker"""
+        if self._worker is not None:
+            self._requests.put(None)
+            self._worker.join(timeout=1.0)
+            self._worker = None
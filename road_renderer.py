@@ -0,0 +1,427 @@
+# road_renderer.py - OpenGL front-end for Road (asphalt, lane markings)
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from renderer import Renderer
+from gl_buffers import VertexBuffer, vbo_supported
+from asphalt_texture import load_asphalt_mipmaps
+
+ROAD_Y = 0.01       # Slight elevation to prevent z-fighting
+MARKING_Y = 0.02    # Lane lines above asphalt
+CROSSWALK_Y = 0.03  # Above other markings
+YELLOW = (1.0, 1.0, 0.0, 1.0)
+WHITE = (1.0, 1.0, 1.0, 1.0)
+ASPHALT_TEXTURE_SIZE = 128
+
+
+def road_geometry_key(road):
+    """Everything the compiled road geometry depends on"""
+    return (tuple(road.horizontal_roads), tuple(road.vertical_roads), road.road_width, road.world_size)
+
+
+def build_asphalt_vertices(road):
+    """Road quads as (N, 8) array: position(3) normal(3) texcoord(2)"""
+    quads = []
+    for road_z in road.horizontal_roads:
+        quads.append((0.0, road_z, road.world_size, road.road_width))
+    for road_x in road.vertical_roads:
+        quads.append((road_x, 0.0, road.road_width, road.world_size))
+    if not quads:
+        return np.zeros((0, 8), dtype=np.float32)
+
+    quads = np.array(quads, dtype=np.float32)  # center_x, center_z, width, length
+    center_x, center_z, width, length = quads.T
+    w, l = width / 2.0, length / 2.0
+    # Texture repeats every 10 units
+    tex_u, tex_v = width / 10.0, length / 10.0
+
+    vertices = np.zeros((len(quads), 4, 8), dtype=np.float32)
+    corners = np.array([(-1, -1, 0, 0), (1, -1, 1, 0), (1, 1, 1, 1), (-1, 1, 0, 1)], dtype=np.float32)
+    vertices[:, :, 0] = center_x[:, None] + corners[None, :, 0] * w[:, None]
+    vertices[:, :, 1] = ROAD_Y
+    vertices[:, :, 2] = center_z[:, None] + corners[None, :, 1] * l[:, None]
+    vertices[:, :, 4] = 1.0  # Normal (0, 1, 0)
+    vertices[:, :, 6] = corners[None, :, 2] * tex_u[:, None]
+    vertices[:, :, 7] = corners[None, :, 3] * tex_v[:, None]
+    return vertices.reshape(-1, 8)
+
+
+def build_marking_vertices(road):
+    """Lane markings as (line_vertices, quad_vertices), each (N, 7): position(3) color(4)"""
+    half_world = road.world_size // 2
+    half_road = road.road_width / 2.0
+    lines = []
+
+    # Yellow dashed center lines (dash 3, gap 2), skipped inside intersections
+    dash_length, total_length = 3.0, 5
+    steps = np.arange(-int(half_world), int(half_world), int(total_length), dtype=np.float32)
+    vertical = np.array(road.vertical_roads, dtype=np.float32)
+    horizontal = np.array(road.horizontal_roads, dtype=np.float32)
+    free_x = ~np.any(np.abs(steps[:, None] - vertical[None, :]) <= half_road, axis=1) if len(vertical) else np.ones(len(steps), bool)
+    free_z = ~np.any(np.abs(steps[:, None] - horizontal[None, :]) <= half_road, axis=1) if len(horizontal) else np.ones(len(steps), bool)
+    for road_z in road.horizontal_roads:
+        for x in steps[free_x]:
+            lines += [(x, MARKING_Y, road_z) + YELLOW, (x + dash_length, MARKING_Y, road_z) + YELLOW]
+    for road_x in road.vertical_roads:
+        for z in steps[free_z]:
+            lines += [(road_x, MARKING_Y, z) + YELLOW, (road_x, MARKING_Y, z + dash_length) + YELLOW]
+
+    # White solid edge lines, slightly inside road edge
+    edge_offset = half_road - 0.5
+    for road_z in road.horizontal_roads:
+        for offset in (edge_offset, -edge_offset):
+            lines += [(-half_world, MARKING_Y, road_z + offset) + WHITE,
+                      (half_world, MARKING_Y, road_z + offset) + WHITE]
+    for road_x in road.vertical_roads:
+        for offset in (edge_offset, -edge_offset):
+            lines += [(road_x + offset, MARKING_Y, -half_world) + WHITE,
+                      (road_x + offset, MARKING_Y, half_world) + WHITE]
+
+    # Zebra crossings at every intersection (same layout as draw_single_crosswalk)
+    quads = []
+    stripe_width, stripe_step = 1.0, 1.5
+    crosswalk_width = road.road_width - 2.0
+    for road_x in road.vertical_roads:
+        for road_z in road.horizontal_roads:
+            # Across vertical road: stripes along x
+            num_stripes = int(road.road_width // stripe_step)
+            start_x = road_x - (num_stripes * stripe_step) / 2
+            half_len = crosswalk_width / 2
+            for i in range(num_stripes):
+                x = start_x + i * stripe_step
+                quads += [(x, CROSSWALK_Y, road_z - half_len) + WHITE,
+                          (x + stripe_width, CROSSWALK_Y, road_z - half_len) + WHITE,
+                          (x + stripe_width, CROSSWALK_Y, road_z + half_len) + WHITE,
+                          (x, CROSSWALK_Y, road_z + half_len) + WHITE]
+            # Across horizontal road: stripes along z
+            num_stripes = int(road.road_width // stripe_step)
+            start_z = road_z - (num_stripes * stripe_step) / 2
+            half_w = crosswalk_width / 2
+            for i in range(num_stripes):
+                z = start_z + i * stripe_step
+                quads += [(road_x - half_w, CROSSWALK_Y, z) + WHITE,
+                          (road_x + half_w, CROSSWALK_Y, z) + WHITE,
+                          (road_x + half_w, CROSSWALK_Y, z + stripe_width) + WHITE,
+                          (road_x - half_w, CROSSWALK_Y, z + stripe_width) + WHITE]
+
+    return (np.array(lines, dtype=np.float32).reshape(-1, 7),
+            np.array(quads, dtype=np.float32).reshape(-1, 7))
+
+
+class RoadRenderer(Renderer):
+    def __init__(self, road, texture_size=ASPHALT_TEXTURE_SIZE):
+        self.road = road
+        self.texture_size = texture_size  # Power of two, up to 2048
+        self.road_texture = None  # Uploaded in setup_gl_resources
+        
+        # Compiled road geometry: VBOs, or display lists as fallback
+        self.asphalt_buffer = None
+        self.marking_buffer = None
+        self.marking_line_count = 0
+        self.road_display_list = None
+        self.marking_display_list = None
+        self.geometry_key = None  # road_geometry_key() the geometry was built for
+    
+    def setup_gl_resources(self):
+        """Upload asphalt texture and compile road geometry once the GL context exists"""
+        self.compile_geometry()
+    
+    def compile_geometry(self):
+        """Build asphalt and marking geometry (VBOs, display-list fallback)"""
+        self.release_geometry()
+        if self.road_texture is None:
+            self.road_texture = self.generate_asphalt_texture()
+        
+        if vbo_supported():
+            lines, quads = build_marking_vertices(self.road)
+            self.asphalt_buffer = VertexBuffer(build_asphalt_vertices(self.road), ('position', 'normal', 'texcoord'))
+            self.marking_buffer = VertexBuffer(np.concatenate([lines, quads]), ('position', 'color'))
+            self.marking_line_count = len(lines)
+            print(f"   ⚡ Road VBOs uploaded: {self.asphalt_buffer.vertex_count // 4} road quads, "
+                  f"{self.marking_buffer.vertex_count} marking vertices")
+        else:
+            self.road_display_list = glGenLists(1)
+            glNewList(self.road_display_list, GL_COMPILE)
+            self.draw_grid_roads()
+            glEndList()
+            
+            self.marking_display_list = glGenLists(1)
+            glNewList(self.marking_display_list, GL_COMPILE)
+            self.draw_realistic_lane_markings()
+            glEndList()
+            print("   ⚡ Road geometry compiled to display lists")
+        
+        self.geometry_key = road_geometry_key(self.road)
+    
+    def release_geometry(self):
+        """Delete compiled road geometry"""
+        for buffer in (self.asphalt_buffer, self.marking_buffer):
+            if buffer is not None:
+                buffer.delete()
+        self.asphalt_buffer = None
+        self.marking_buffer = None
+        for display_list in (self.road_display_list, self.marking_display_list):
+            if display_list:
+                glDeleteLists(display_list, 1)
+        self.road_display_list = None
+        self.marking_display_list = None
+        self.geometry_key = None
+    
+    def draw_compiled(self):
+        """Draw cached asphalt and markings"""
+        if self.asphalt_buffer is not None:
+            glEnable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, self.road_texture)
+            glColor3f(1.0, 1.0, 1.0)  # White to show texture properly
+            self.asphalt_buffer.draw(GL_QUADS)
+            glDisable(GL_TEXTURE_2D)
+            
+            glNormal3f(0, 1, 0)
+            glLineWidth(3.0)  # Thicker lines for visibility
+            self.marking_buffer.draw(GL_LINES, 0, self.marking_line_count)
+            glLineWidth(1.0)
+            self.marking_buffer.draw(GL_QUADS, self.marking_line_count)
+        else:
+            glCallList(self.road_display_list)
+            glCallList(self.marking_display_list)
+    
+    def draw_cube(self, size):
+        """Draw cube manually tanpa GLUT"""
+        s = size / 2.0
+        glBegin(GL_QUADS)
+        # Front
+        glNormal3f(0, 0, 1)
+        glVertex3f(-s, -s, s); glVertex3f(s, -s, s); glVertex3f(s, s, s); glVertex3f(-s, s, s)
+        # Back
+        glNormal3f(0, 0, -1)
+        glVertex3f(-s, -s, -s); glVertex3f(-s, s, -s); glVertex3f(s, s, -s); glVertex3f(s, -s, -s)
+        # Top
+        glNormal3f(0, 1, 0)
+        glVertex3f(-s, s, -s); glVertex3f(-s, s, s); glVertex3f(s, s, s); glVertex3f(s, s, -s)
+        # Bottom
+        glNormal3f(0, -1, 0)
+        glVertex3f(-s, -s, -s); glVertex3f(s, -s, -s); glVertex3f(s, -s, s); glVertex3f(-s, -s, s)
+        # Right
+        glNormal3f(1, 0, 0)
+        glVertex3f(s, -s, -s); glVertex3f(s, s, -s); glVertex3f(s, s, s); glVertex3f(s, -s, s)
+        # Left
+        glNormal3f(-1, 0, 0)
+        glVertex3f(-s, -s, -s); glVertex3f(-s, -s, s); glVertex3f(-s, s, s); glVertex3f(-s, s, -s)
+        glEnd()
+    
+    def generate_asphalt_texture(self):
+        """Upload procedural asphalt texture (with mipmaps) and return its GL id"""
+        levels = load_asphalt_mipmaps(size=self.texture_size)
+        
+        # Create GL Texture
+        tex_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+        
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)  # RGB rows are not 4-byte aligned at small mip levels
+        for level, image in enumerate(levels):
+            glTexImage2D(GL_TEXTURE_2D, level, GL_RGB, image.shape[1], image.shape[0], 0,
+                         GL_RGB, GL_UNSIGNED_BYTE, np.ascontiguousarray(image))
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+        
+        return tex_id
+
+    def draw_grid_roads(self):
+        """Draw the complete 4x4 road grid with optimized rendering"""
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self.road_texture)
+        glColor3f(1.0, 1.0, 1.0)  # White to show texture properly
+        
+        # Draw horizontal roads
+        for road_z in self.road.horizontal_roads:
+            self.draw_single_road(
+                center_x=0, center_z=road_z,
+                width=self.road.world_size, length=self.road.road_width,
+                horizontal=True
+            )
+        
+        # Draw vertical roads  
+        for road_x in self.road.vertical_roads:
+            self.draw_single_road(
+                center_x=road_x, center_z=0,
+                width=self.road.road_width, length=self.road.world_size,
+                horizontal=False
+            )
+            
+        glDisable(GL_TEXTURE_2D)
+    
+    def draw_single_road(self, center_x, center_z, width, length, horizontal=True):
+        """Draw a single road segment with proper texture mapping"""
+        w = width / 2.0
+        l = length / 2.0
+        
+        # Texture repetition based on road dimensions
+        if horizontal:
+            tex_u = width / 10.0  # Repeat every 10 units
+            tex_v = length / 10.0
+        else:
+            tex_u = width / 10.0
+            tex_v = length / 10.0
+        
+        glPushMatrix()
+        glTranslatef(center_x, 0.01, center_z)  # Slight elevation to prevent z-fighting
+        
+        glBegin(GL_QUADS)
+        glNormal3f(0, 1, 0)
+        glTexCoord2f(0, 0);      glVertex3f(-w, 0, -l)
+        glTexCoord2f(tex_u, 0);  glVertex3f(w, 0, -l) 
+        glTexCoord2f(tex_u, tex_v); glVertex3f(w, 0, l)
+        glTexCoord2f(0, tex_v);     glVertex3f(-w, 0, l)
+        glEnd()
+        
+        glPopMatrix()
+
+    def draw_realistic_lane_markings(self):
+        """Draw realistic road markings: yellow center lines, white edges, crosswalks"""
+        glDisable(GL_TEXTURE_2D)  # No texture for markings
+        glLineWidth(3.0)  # Thicker lines for visibility
+        
+        # Yellow dashed center lines on all roads
+        glColor3f(1.0, 1.0, 0.0)  # Yellow
+        self.draw_dashed_center_lines()
+        
+        # White solid edge lines
+        glColor3f(1.0, 1.0, 1.0)  # White
+        self.draw_solid_edge_lines()
+        
+        # Crosswalk markings at intersections
+        self.draw_crosswalk_markings()
+        
+        glLineWidth(1.0)  # Reset line width
+    
+    def draw_dashed_center_lines(self):
+        """Draw yellow dashed center lines on all roads"""
+        dash_length = 3.0
+        gap_length = 2.0
+        total_length = dash_length + gap_length
+        
+        glBegin(GL_LINES)
+        
+        # Horizontal road center lines
+        for road_z in self.road.horizontal_roads:
+            y = 0.02  # Slightly above road surface
+            for x in range(-int(self.road.world_size//2), int(self.road.world_size//2), int(total_length)):
+                # Only draw if not at intersection
+                if not any(abs(x - road_x) <= self.road.road_width/2 for road_x in self.road.vertical_roads):
+                    glVertex3f(x, y, road_z)
+                    glVertex3f(x + dash_length, y, road_z)
+        
+        # Vertical road center lines
+        for road_x in self.road.vertical_roads:
+            y = 0.02
+            for z in range(-int(self.road.world_size//2), int(self.road.world_size//2), int(total_length)):
+                # Only draw if not at intersection
+                if not any(abs(z - road_z) <= self.road.road_width/2 for road_z in self.road.horizontal_roads):
+                    glVertex3f(road_x, y, z)
+                    glVertex3f(road_x, y, z + dash_length)
+        
+        glEnd()
+    
+    def draw_solid_edge_lines(self):
+        """Draw white solid edge lines for all roads"""
+        edge_offset = self.road.road_width / 2.0 - 0.5  # Slightly inside road edge
+        y = 0.02
+        
+        glBegin(GL_LINES)
+        
+        # Horizontal roads - top and bottom edges
+        for road_z in self.road.horizontal_roads:
+            # Top edge
+            glVertex3f(-self.road.world_size//2, y, road_z + edge_offset)
+            glVertex3f(self.road.world_size//2, y, road_z + edge_offset)
+            # Bottom edge  
+            glVertex3f(-self.road.world_size//2, y, road_z - edge_offset)
+            glVertex3f(self.road.world_size//2, y, road_z - edge_offset)
+        
+        # Vertical roads - left and right edges
+        for road_x in self.road.vertical_roads:
+            # Right edge
+            glVertex3f(road_x + edge_offset, y, -self.road.world_size//2)
+            glVertex3f(road_x + edge_offset, y, self.road.world_size//2)
+            # Left edge
+            glVertex3f(road_x - edge_offset, y, -self.road.world_size//2)
+            glVertex3f(road_x - edge_offset, y, self.road.world_size//2)
+        
+        glEnd()
+    
+    def draw_crosswalk_markings(self):
+        """Draw zebra crossing markings at intersections"""
+        stripe_width = 1.0
+        stripe_gap = 0.5
+        crosswalk_width = self.road.road_width - 2.0  # Leave some margin
+        y = 0.03  # Above other markings
+        
+        glColor3f(1.0, 1.0, 1.0)  # White crosswalks
+        
+        # Draw crosswalks at each intersection
+        for road_x in self.road.vertical_roads:
+            for road_z in self.road.horizontal_roads:
+                # Horizontal crosswalk (across vertical road)
+                self.draw_single_crosswalk(
+                    road_x, road_z, 
+                    width=self.road.road_width, length=crosswalk_width,
+                    horizontal=True
+                )
+                
+                # Vertical crosswalk (across horizontal road)  
+                self.draw_single_crosswalk(
+                    road_x, road_z,
+                    width=crosswalk_width, length=self.road.road_width, 
+                    horizontal=False
+                )
+    
+    def draw_single_crosswalk(self, center_x, center_z, width, length, horizontal):
+        """Draw a single crosswalk with zebra stripes"""
+        stripe_width = 1.0
+        stripe_gap = 0.5
+        y = 0.03
+        
+        if horizontal:
+            # Stripes run along width (x-direction)
+            num_stripes = int(width // (stripe_width + stripe_gap))
+            start_x = center_x - (num_stripes * (stripe_width + stripe_gap)) / 2
+            
+            glBegin(GL_QUADS)
+            for i in range(num_stripes):
+                x = start_x + i * (stripe_width + stripe_gap)
+                glVertex3f(x, y, center_z - length/2)
+                glVertex3f(x + stripe_width, y, center_z - length/2)
+                glVertex3f(x + stripe_width, y, center_z + length/2)
+                glVertex3f(x, y, center_z + length/2)
+            glEnd()
+        else:
+            # Stripes run along length (z-direction)
+            num_stripes = int(length // (stripe_width + stripe_gap))
+            start_z = center_z - (num_stripes * (stripe_width + stripe_gap)) / 2
+            
+            glBegin(GL_QUADS)
+            for i in range(num_stripes):
+                z = start_z + i * (stripe_width + stripe_gap)
+                glVertex3f(center_x - width/2, y, z)
+                glVertex3f(center_x + width/2, y, z)
+                glVertex3f(center_x + width/2, y, z + stripe_width)
+                glVertex3f(center_x - width/2, y, z + stripe_width)
+            glEnd()
+
+    def render(self):
+        """Render the complete road system with markings"""
+        # Rebuild cached geometry only when the road layout changed
+        if self.geometry_key != road_geometry_key(self.road):
+            self.compile_geometry()
+        self.draw_compiled()
+        
+    def cleanup(self):
+        """Clean up OpenGL resources"""
+        if self.road_texture is not None:
+            glDeleteTextures([self.road_texture])
+            self.road_texture = None
+        self.release_geometry()
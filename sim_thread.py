@@ -0,0 +1,135 @@
+# sim_thread.py - Simulation worker thread with double-buffered snapshots (no GL)
+#
+# The worker runs CitySimulation.update_simulation on its own fixed-step
+# clock and copies the state the renderers need into one of two Snapshot
+# buffers. The GL thread takes the most recently published snapshot at the
+# start of a frame; publishing is a reference swap, so neither side takes a
+# lock on the hot path. Car input goes the other way through a command queue.
+import queue
+import threading
+import time
+import numpy as np
+from timestep import FixedTimestep, lerp, lerp_angle
+
+
+class Snapshot:
+    """Render-side copy of one simulation step (buffers reused between publishes)"""
+
+    def __init__(self, traffic_count, particle_count):
+        self.step = -1
+        self.published_at = 0.0
+        self.car_previous = None  # Pose before the step
+        self.car = None           # Pose after the step
+        self.car_speed = 0.0
+        self.traffic_previous = np.zeros((3, traffic_count))  # x, z, direction
+        self.traffic = np.zeros((3, traffic_count))
+        self.traffic_steering = np.zeros(traffic_count)
+        self.traffic_wheel_rotation = np.zeros(traffic_count)
+        self.particles = np.zeros((particle_count, 3), dtype=np.float32)
+
+    def capture(self, simulation, step):
+        car, traffic = simulation.car, simulation.traffic
+        self.car_previous = car.pose(0.0)
+        self.car = car.pose(1.0)
+        self.car_speed = car.speed
+        for i, values in enumerate(traffic.previous_state):
+            self.traffic_previous[i] = values
+        self.traffic[0], self.traffic[1], self.traffic[2] = traffic.x, traffic.z, traffic.direction
+        self.traffic_steering[:] = traffic.steering
+        self.traffic_wheel_rotation[:] = traffic.wheel_rotation
+        self.particles[:] = simulation.weather.positions
+        self.step = step
+        self.published_at = time.perf_counter()
+
+    def car_pose(self, alpha):
+        """Car pose blended between the step's start and end states"""
+        previous, current = self.car_previous, self.car
+        return current._replace(x=lerp(previous.x, current.x, alpha), z=lerp(previous.z, current.z, alpha),
+                                direction=lerp_angle(previous.direction, current.direction, alpha))
+
+    def traffic_state(self, alpha):
+        """(x, z, direction, steering, wheel_rotation) arrays for TrafficRenderer"""
+        previous, current = self.traffic_previous, self.traffic
+        return (lerp(previous[0], current[0], alpha), lerp(previous[1], current[1], alpha),
+                lerp_angle(previous[2], current[2], alpha),
+                self.traffic_steering, self.traffic_wheel_rotation)
+
+
+class SimulationThread:
+    def __init__(self, simulation):
+        """Run `simulation.update_simulation` steps off the GL thread"""
+        self.simulation = simulation
+        self.timestep = FixedTimestep(simulation.timestep.sim_rate, simulation.timestep.max_steps)
+        traffic_count, particle_count = simulation.traffic.count, simulation.weather.num_particles
+        self.buffers = (Snapshot(traffic_count, particle_count), Snapshot(traffic_count, particle_count))
+        self.front = None    # Latest published snapshot (set by the worker)
+        self.reading = None  # Snapshot the GL thread is drawing (set by the GL thread)
+        self.commands = queue.Queue()
+        self.step_count = 0
+        self.skipped_publishes = 0
+        self.running = False
+        self._worker = None
+
+    def start(self):
+        self.buffers[0].capture(self.simulation, 0)
+        self.front = self.buffers[0]
+        self.running = True
+        self._worker = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._worker.start()
+
+    def send(self, command):
+        """Queue a Car method name (e.g. 'move_forward') for the next step"""
+        self.commands.put(command)
+
+    def acquire(self):
+        """Latest snapshot for this frame; keep it until the next acquire()"""
+        self.reading = self.front
+        return self.reading
+
+    def alpha(self, snapshot):
+        """Interpolation factor for `snapshot` at the current time"""
+        elapsed = time.perf_counter() - snapshot.published_at
+        return min(max(elapsed / self.timestep.dt, 0.0), 1.0)
+
+    def _apply_commands(self):
+        car = self.simulation.car
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            getattr(car, command)()
+
+    def _publish(self):
+        # Write into the buffer that is not the latest one; if the GL thread is
+        # still drawing it (it fell a publish behind), skip this publish rather
+        # than wait - the next step publishes again
+        back = self.buffers[1] if self.front is self.buffers[0] else self.buffers[0]
+        if back is self.reading:
+            self.skipped_publishes += 1
+            return
+        back.capture(self.simulation, self.step_count)
+        self.front = back
+
+    def _run(self):
+        timestep = self.timestep
+        last_time = time.perf_counter()
+        while self.running:
+            now = time.perf_counter()
+            steps = timestep.advance(now - last_time)
+            last_time = now
+            for _ in range(steps):
+                self._apply_commands()
+                self.simulation.update_simulation(timestep.dt)
+                self.step_count += 1
+            if steps:
+                self._publish()
+            else:
+                time.sleep(max(timestep.dt - timestep.accumulator, 0.0))
+
+    def stop(self):
+        """Stop the worker after its current step"""
+        self.running = False
+        if self._worker is not None:
+            self._worker.join(timeout=1.0)
+            self._worker = None
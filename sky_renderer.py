@@ -0,0 +1,189 @@
+# sky_renderer.py - OpenGL front-end for the night sky (stars, moon)
+#
+# Stars are uploaded once to a static vertex buffer and drawn with one call;
+# the moon reuses the cached unit sphere from primitives.py. With baked=True
+# stars and moon are rendered once into a cubemap and the sky becomes a
+# single textured box around the camera, whatever the star count.
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from renderer import Renderer
+from gl_buffers import VertexBuffer, vbo_supported
+from primitives import draw_sphere
+
+MOON_POSITION = (0.0, 60.0, 150.0)  # Centered on road (X=0), higher and further away
+MOON_RADIUS = 8.0  # Slightly larger moon
+MOON_COLOR = (1.0, 1.0, 0.8)  # Brighter pale yellow
+MOON_EMISSION = [0.9, 0.9, 0.7, 1.0]  # Stronger emission for "moon effect"
+NO_EMISSION = [0.0, 0.0, 0.0, 1.0]
+STAR_POINT_SIZE = 2.0
+
+CUBEMAP_SIZE = 1024  # Texels per cubemap face
+SKY_BOX_HALF_SIZE = 300.0  # Inside the far plane from any camera position
+
+# (face, view direction, up) with the up vectors of the GL cube map convention,
+# so a face rendered with gluLookAt can be sampled without flipping
+CUBE_FACES = (
+    (GL_TEXTURE_CUBE_MAP_POSITIVE_X, (1, 0, 0), (0, -1, 0)),
+    (GL_TEXTURE_CUBE_MAP_NEGATIVE_X, (-1, 0, 0), (0, -1, 0)),
+    (GL_TEXTURE_CUBE_MAP_POSITIVE_Y, (0, 1, 0), (0, 0, 1)),
+    (GL_TEXTURE_CUBE_MAP_NEGATIVE_Y, (0, -1, 0), (0, 0, -1)),
+    (GL_TEXTURE_CUBE_MAP_POSITIVE_Z, (0, 0, 1), (0, -1, 0)),
+    (GL_TEXTURE_CUBE_MAP_NEGATIVE_Z, (0, 0, -1), (0, -1, 0)),
+)
+
+
+def sky_box_vertices(half_size=SKY_BOX_HALF_SIZE):
+    """Cube around the origin as (36, 3) float32 triangle vertices"""
+    corners = np.array([(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float32)
+    # Corner index = 4 * (x > 0) + 2 * (y > 0) + (z > 0); two triangles per face
+    faces = ((0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3))
+    indices = [face[i] for face in faces for i in (0, 1, 2, 0, 2, 3)]
+    return corners[indices] * half_size
+
+
+class SkyRenderer(Renderer):
+    def __init__(self, city, baked=False):
+        """baked: draw stars and moon from a cubemap rendered once"""
+        self.city = city
+        self.baked = baked
+        self.star_buffer = None  # Static star positions
+        self.box_buffer = None
+        self.cubemap_id = None
+
+    def setup_gl_resources(self):
+        """Upload the star field (and the sky box for the baked sky)"""
+        if vbo_supported():
+            self.star_buffer = VertexBuffer(self.city.stars, ('position',))
+            if self.baked:
+                self.box_buffer = VertexBuffer(sky_box_vertices(), ('position',))
+        if self.baked and self.box_buffer is None:
+            print("⚠️ Baked sky needs buffer objects, drawing stars directly")
+            self.baked = False
+
+    def draw_stars(self):
+        glDisable(GL_LIGHTING)
+        glColor3f(1.0, 1.0, 1.0)
+        glPointSize(STAR_POINT_SIZE)
+        if self.star_buffer is not None:
+            self.star_buffer.draw(GL_POINTS)
+        else:
+            # Client-side vertex array fallback (no buffer objects)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glVertexPointer(3, GL_FLOAT, 0, self.city.stars)
+            glDrawArrays(GL_POINTS, 0, len(self.city.stars))
+            glDisableClientState(GL_VERTEX_ARRAY)
+
+    def draw_moon(self):
+        glPushMatrix()
+        glTranslatef(*MOON_POSITION)
+        glColor3f(*MOON_COLOR)
+
+        # Moon glow
+        glEnable(GL_LIGHTING)
+        glMaterialfv(GL_FRONT, GL_EMISSION, MOON_EMISSION)
+        draw_sphere(MOON_RADIUS)
+        glMaterialfv(GL_FRONT, GL_EMISSION, NO_EMISSION)
+        glPopMatrix()
+
+    def bake_cubemap(self):
+        """Render stars and moon as seen from the origin into a cubemap"""
+        cubemap = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_CUBE_MAP, cubemap)
+        for parameter, value in ((GL_TEXTURE_MIN_FILTER, GL_LINEAR), (GL_TEXTURE_MAG_FILTER, GL_LINEAR),
+                                 (GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE), (GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE),
+                                 (GL_TEXTURE_WRAP_R, GL_CLAMP_TO_EDGE)):
+            glTexParameteri(GL_TEXTURE_CUBE_MAP, parameter, value)
+        for face, _, _ in CUBE_FACES:
+            glTexImage2D(face, 0, GL_RGBA, CUBEMAP_SIZE, CUBEMAP_SIZE, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glBindTexture(GL_TEXTURE_CUBE_MAP, 0)
+
+        framebuffer = glGenFramebuffers(1)
+        depth = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, CUBEMAP_SIZE, CUBEMAP_SIZE)
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, depth)
+
+        glPushAttrib(GL_ALL_ATTRIB_BITS)
+        glViewport(0, 0, CUBEMAP_SIZE, CUBEMAP_SIZE)
+        glDisable(GL_FOG)
+        glEnable(GL_DEPTH_TEST)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        gluPerspective(90.0, 1.0, 1.0, 1000.0)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        try:
+            for face, forward, up in CUBE_FACES:
+                glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, face, cubemap, 0)
+                if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+                    raise RuntimeError("sky framebuffer incomplete")
+                glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+                glLoadIdentity()
+                gluLookAt(0, 0, 0, *forward, *up)
+                self.draw_stars()
+                self.draw_moon()
+        finally:
+            glMatrixMode(GL_PROJECTION)
+            glPopMatrix()
+            glMatrixMode(GL_MODELVIEW)
+            glPopMatrix()
+            glPopAttrib()
+            glBindFramebuffer(GL_FRAMEBUFFER, 0)
+            glDeleteFramebuffers(1, [framebuffer])
+            glDeleteRenderbuffers(1, [depth])
+        return cubemap
+
+    def draw_baked(self, camera_position):
+        glPushAttrib(GL_ENABLE_BIT | GL_DEPTH_BUFFER_BIT | GL_TEXTURE_BIT)
+        glDisable(GL_LIGHTING)
+        glDisable(GL_FOG)
+        glEnable(GL_DEPTH_TEST)  # The road is drawn before the sky
+        glDepthMask(GL_FALSE)  # Sky stays behind everything drawn later
+        glEnable(GL_TEXTURE_CUBE_MAP)
+        glBindTexture(GL_TEXTURE_CUBE_MAP, self.cubemap_id)
+        # Texture coordinates = box vertex position = view direction
+        for coordinate, generate, plane in ((GL_S, GL_TEXTURE_GEN_S, (1, 0, 0, 0)),
+                                            (GL_T, GL_TEXTURE_GEN_T, (0, 1, 0, 0)),
+                                            (GL_R, GL_TEXTURE_GEN_R, (0, 0, 1, 0))):
+            glTexGeni(coordinate, GL_TEXTURE_GEN_MODE, GL_OBJECT_LINEAR)
+            glTexGenfv(coordinate, GL_OBJECT_PLANE, plane)
+            glEnable(generate)
+        glColor3f(1.0, 1.0, 1.0)
+        glPushMatrix()
+        if camera_position is not None:
+            glTranslatef(*camera_position)
+        self.box_buffer.draw(GL_TRIANGLES)
+        glPopMatrix()
+        glBindTexture(GL_TEXTURE_CUBE_MAP, 0)
+        glPopAttrib()
+
+    def render(self, camera_position=None):
+        """Draw stars and moon (camera_position centers the baked sky box)"""
+        if self.baked:
+            if self.cubemap_id is None:
+                # Baked on first use, once the lights of the scene are set up
+                try:
+                    self.cubemap_id = self.bake_cubemap()
+                    print(f"   🌌 Sky baked into a {CUBEMAP_SIZE}px cubemap")
+                except Exception as e:
+                    print(f"⚠️ Sky baking unavailable ({e}), drawing stars directly")
+                    self.baked = False
+            if self.cubemap_id is not None:
+                self.draw_baked(camera_position)
+                return
+        self.draw_stars()
+        self.draw_moon()
+        glEnable(GL_LIGHTING)
+
+    def cleanup(self):
+        """Release star and sky box buffers and the cubemap"""
+        for buffer in (self.star_buffer, self.box_buffer):
+            if buffer is not None:
+                buffer.delete()
+        self.star_buffer = self.box_buffer = None
+        if self.cubemap_id is not None:
+            glDeleteTextures([self.cubemap_id])
+            self.cubemap_id = None
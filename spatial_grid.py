@@ -0,0 +1,64 @@
+# spatial_grid.py - Uniform grid index over building footprints (no GL)
+import math
+import numpy as np
+
+
+class SpatialGrid:
+    """Hash grid mapping (cell_x, cell_z) to buildings whose footprint touches it"""
+
+    def __init__(self, buildings, cell_size=10.0):
+        """buildings: BuildingTable"""
+        self.cell_size = float(cell_size)
+        self.buildings = buildings
+        self.cells = {}  # (cell_x, cell_z) -> (start, end) slice of self.members
+        self.members = np.zeros(0, dtype=np.int64)  # Building indices grouped by cell
+        # (N, 4) min_x, min_z, max_x, max_z per building for collision tests
+        self.bounds = np.column_stack(buildings.footprints()) if len(buildings) else np.zeros((0, 4))
+        if len(buildings) == 0:
+            return
+
+        # Every (building, cell) pair of the footprints, built from whole columns
+        min_x, min_z, max_x, max_z = self.bounds.T
+        size = self.cell_size
+        x0, x1 = np.floor(min_x / size).astype(np.int64), np.floor(max_x / size).astype(np.int64)
+        z0, z1 = np.floor(min_z / size).astype(np.int64), np.floor(max_z / size).astype(np.int64)
+        rows = z1 - z0 + 1
+        counts = (x1 - x0 + 1) * rows
+        owner = np.repeat(np.arange(len(buildings)), counts)
+        offset = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell_x = x0[owner] + offset // rows[owner]
+        cell_z = z0[owner] + offset % rows[owner]
+
+        # Group building indices per cell (ascending within a cell)
+        order = np.lexsort((owner, cell_z, cell_x))
+        cell_x, cell_z, self.members = cell_x[order], cell_z[order], owner[order]
+        starts = np.flatnonzero(np.concatenate(([True], (cell_x[1:] != cell_x[:-1]) | (cell_z[1:] != cell_z[:-1]))))
+        ends = np.append(starts[1:], len(owner))
+        self.cells = dict(zip(zip(cell_x[starts].tolist(), cell_z[starts].tolist()),
+                              zip(starts.tolist(), ends.tolist())))
+
+    def __len__(self):
+        return len(self.buildings)
+
+    def _cells_in_rect(self, min_x, min_z, max_x, max_z):
+        """Yield every cell key overlapping an axis-aligned rectangle"""
+        size = self.cell_size
+        x0, x1 = math.floor(min_x / size), math.floor(max_x / size)
+        z0, z1 = math.floor(min_z / size), math.floor(max_z / size)
+        for cx in range(x0, x1 + 1):
+            for cz in range(z0, z1 + 1):
+                yield (cx, cz)
+
+    def _members_in_rect(self, min_x, min_z, max_x, max_z):
+        """Building indices of every overlapping cell (a building may repeat)"""
+        cells, members = self.cells, self.members
+        found = [members[start:end] for start, end in
+                 (cells[key] for key in self._cells_in_rect(min_x, min_z, max_x, max_z) if key in cells)]
+        if not found:
+            return members[:0]
+        return found[0] if len(found) == 1 else np.concatenate(found)
+
+    def query_bounds(self, min_x, min_z, max_x, max_z):
+        """(K, 4) footprint bounds of the candidates in the rectangle (collision tests)"""
+        # Repeats are harmless for overlap tests
+        return self.bounds[self._members_in_rect(min_x, min_z, max_x, max_z)]
@@ -0,0 +1,46 @@
+# stages.py - Per-stage timing hooks shared by CitySimulation and HeadlessSimulation
+import time
+from contextlib import nullcontext
+
+# Returned by simulation.stage() when no timer is attached (reusable, stateless)
+NULL_STAGE = nullcontext()
+
+
+class StageTimer:
+    """Collects wall-clock durations (ns) per named stage
+
+    Attach to a simulation with ``simulation.stage_timer = timer``. An optional
+    ``sync`` callable (e.g. glFinish) runs before each measurement ends so GPU
+    work is attributed to the stage that issued it.
+    """
+
+    def __init__(self, sync=None):
+        self.sync = sync
+        self.samples = {}
+
+    def __call__(self, name):
+        return _StageScope(self, name)
+
+    def record(self, name, duration_ns):
+        self.samples.setdefault(name, []).append(duration_ns)
+
+    def reset(self):
+        self.samples.clear()
+
+
+class _StageScope:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.timer.sync is not None:
+            self.timer.sync()
+        self.timer.record(self.name, time.perf_counter_ns() - self.start)
+        return False
@@ -0,0 +1,151 @@
+# street_lights.py - Instanced street light rendering (GLSL + glDrawArraysInstanced)
+#
+# The lamp model (pole, bulb, two halos) lives in one static VBO. Lamp
+# positions go into a per-instance attribute buffer, so any number of lamps
+# costs three instanced draw calls: lit pole, emissive bulb, blended halos.
+import numpy as np
+from OpenGL.GL import *
+from gl_buffers import VertexBuffer
+from instancing import LIGHTING_GLSL, InstancedProgram, InstanceAttribute
+from primitives import sphere_vertices
+
+POLE_COLOR = (0.3, 0.3, 0.3, 1.0)
+BULB_COLOR = (1.0, 1.0, 0.0, 1.0)
+HALO_COLORS = ((1.0, 1.0, 0.5, 0.3), (1.0, 1.0, 0.5, 0.1))
+HALO_RADII = (1.5, 3.0)
+BULB_RADIUS = 0.5
+HEAD_HEIGHT = 4.0
+INSTANCE_ATTRIBUTE = 3  # Generic vertex attribute slot for per-lamp data
+
+VERTEX_SHADER = """
+#version 120
+attribute vec4 instance;  // xyz = lamp base position, w = yaw (radians)
+uniform float emissive;   // 1.0: output vertex color unlit (bulb)
+varying vec4 color;
+varying float fog_depth;
+""" + LIGHTING_GLSL + """
+void main() {
+    float c = cos(instance.w);
+    float s = sin(instance.w);
+    vec3 p = gl_Vertex.xyz;
+    vec3 n = gl_Normal;
+    p = vec3(c * p.x + s * p.z, p.y, -s * p.x + c * p.z) + instance.xyz;
+    n = vec3(c * n.x + s * n.z, n.y, -s * n.x + c * n.z);
+
+    vec4 eye = gl_ModelViewMatrix * vec4(p, 1.0);
+    gl_Position = gl_ProjectionMatrix * eye;
+    fog_depth = length(eye.xyz);
+
+    if (emissive > 0.5) {
+        color = gl_Color;
+    } else {
+        color = fixed_function_lighting(eye, gl_NormalMatrix * n, gl_Color);
+    }
+}
+"""
+
+
+def box_triangles(width, height, depth):
+    """Axis-aligned box centered on the origin as (36, 6) position + normal rows"""
+    w, h, d = width / 2.0, height / 2.0, depth / 2.0
+    faces = [
+        ((0, 0, 1), [(-w, -h, d), (w, -h, d), (w, h, d), (-w, h, d)]),
+        ((0, 0, -1), [(-w, -h, -d), (-w, h, -d), (w, h, -d), (w, -h, -d)]),
+        ((0, 1, 0), [(-w, h, -d), (-w, h, d), (w, h, d), (w, h, -d)]),
+        ((0, -1, 0), [(-w, -h, -d), (w, -h, -d), (w, -h, d), (-w, -h, d)]),
+        ((1, 0, 0), [(w, -h, -d), (w, h, -d), (w, h, d), (w, -h, d)]),
+        ((-1, 0, 0), [(-w, -h, -d), (-w, -h, d), (-w, h, d), (-w, h, -d)]),
+    ]
+    rows = []
+    for normal, quad in faces:
+        for index in (0, 1, 2, 0, 2, 3):
+            rows.append(quad[index] + normal)
+    return np.array(rows, dtype=np.float32)
+
+
+def sphere_triangles(radius, slices=16, stacks=16):
+    """Shared unit sphere scaled to radius, as (N, 6) position + normal rows"""
+    rows = np.array(sphere_vertices(slices, stacks))
+    rows[:, 0:3] *= radius
+    return rows
+
+
+def with_color(rows, color, offset=(0.0, 0.0, 0.0)):
+    """Append an RGBA column and translate positions"""
+    rows = rows.copy()
+    rows[:, 0:3] += np.asarray(offset, dtype=np.float32)
+    colors = np.tile(np.asarray(color, dtype=np.float32), (len(rows), 1))
+    return np.hstack([rows, colors])
+
+
+def build_lamp_mesh():
+    """Lamp model as (vertices, ranges): position(3) normal(3) color(4) rows and
+    (first, count) ranges for the 'pole', 'bulb' and 'halos' parts"""
+    head = (0.0, HEAD_HEIGHT, 0.0)
+    # The immediate-mode pole is a unit cube under glScalef(0.1, 8, 0.1); its normals
+    # end up scaled by the inverse, which is what makes the lit pole look bright
+    pole = box_triangles(0.1, 8.0, 0.1)
+    pole[:, 3:6] *= np.array([1 / 0.1, 1 / 8.0, 1 / 0.1], dtype=np.float32)
+    parts = [
+        ('pole', with_color(pole, POLE_COLOR)),
+        ('bulb', with_color(sphere_triangles(BULB_RADIUS), BULB_COLOR, head)),
+        ('halos', np.vstack([with_color(sphere_triangles(radius), color, head)
+                             for radius, color in zip(HALO_RADII, HALO_COLORS)])),
+    ]
+    ranges = {}
+    first = 0
+    for name, rows in parts:
+        ranges[name] = (first, len(rows))
+        first += len(rows)
+    return np.vstack([rows for _, rows in parts]), ranges
+
+
+class InstancedStreetLights:
+    """Draws many identical lamps with one instanced draw per lamp part"""
+
+    def __init__(self):
+        vertices, self.ranges = build_lamp_mesh()
+        self.mesh = VertexBuffer(vertices, ('position', 'normal', 'color'))
+        self.instances = InstanceAttribute(INSTANCE_ATTRIBUTE)
+        self.program = InstancedProgram("Street light", VERTEX_SHADER, {'instance': INSTANCE_ATTRIBUTE})
+        self.emissive_location = self.program.uniform('emissive')
+
+    def draw(self, positions, yaw=None):
+        """Draw a lamp at every (N, 2) ground position (optional yaw per lamp, radians)"""
+        count = len(positions)
+        if count == 0:
+            return
+        instances = np.zeros((count, 4), dtype=np.float32)
+        instances[:, 0] = positions[:, 0]
+        instances[:, 2] = positions[:, 1]
+        if yaw is not None:
+            instances[:, 3] = yaw
+
+        self.instances.upload(instances)
+        self.program.use()
+        self.mesh.bind()
+
+        # Lit pole, emissive bulb
+        glUniform1f(self.emissive_location, 0.0)
+        glDrawArraysInstanced(GL_TRIANGLES, *self.ranges['pole'], count)
+        glUniform1f(self.emissive_location, 1.0)
+        glDrawArraysInstanced(GL_TRIANGLES, *self.ranges['bulb'], count)
+
+        # Translucent glow halos
+        glUniform1f(self.emissive_location, 0.0)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glDepthMask(GL_FALSE)  # Don't write to depth buffer for transparent glow
+        glDrawArraysInstanced(GL_TRIANGLES, *self.ranges['halos'], count)
+        glDepthMask(GL_TRUE)
+        glDisable(GL_BLEND)
+
+        self.mesh.unbind()
+        self.program.release()
+        self.instances.disable()
+
+    def delete(self):
+        """Release buffers and shader program"""
+        self.mesh.delete()
+        self.instances.delete()
+        self.program.delete()
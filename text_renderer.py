@@ -0,0 +1,213 @@
+# text_renderer.py - HUD text drawn from a glyph atlas
+#
+# Every glyph of a font is rendered once into a single texture. Text is laid
+# out as textured quads into one streamed vertex buffer and drawn with one
+# call per frame, so changing HUD values never create or upload textures.
+import numpy as np
+import pygame
+from OpenGL.GL import *
+from gl_buffers import VertexBuffer, vbo_supported
+
+ATLAS_CHARACTERS = ''.join(chr(c) for c in range(32, 127)) + '°'
+ATLAS_WIDTH = 512
+GLYPH_PADDING = 1  # Empty texels between glyphs (no bleeding with GL_LINEAR)
+LAYOUT_CACHE_SIZE = 256  # Laid-out strings kept for reuse
+
+# Glyph edge columns (left, right, top, bottom, u0, v0, u1, v1) picked for the
+# two triangles of a glyph quad: x, y, u, v per corner
+QUAD_CORNERS = np.array([
+    (0, 2, 4, 5), (1, 2, 6, 5), (1, 3, 6, 7),
+    (0, 2, 4, 5), (1, 3, 6, 7), (0, 3, 4, 7),
+])
+
+_atlases = {}  # (font name, size) -> GlyphAtlas
+
+
+def get_glyph_atlas(name, size):
+    """Shared atlas for a SysFont; built once per font and size"""
+    key = (name, size)
+    if key not in _atlases:
+        _atlases[key] = GlyphAtlas(pygame.font.SysFont(name, size))
+    return _atlases[key]
+
+
+def delete_glyph_atlases():
+    for atlas in _atlases.values():
+        atlas.delete()
+    _atlases.clear()
+
+
+class GlyphAtlas:
+    """White glyphs of one font packed into a single RGBA texture"""
+
+    def __init__(self, font, characters=ATLAS_CHARACTERS):
+        self.font = font
+        self.characters = ''
+        self.index = {}  # character -> row in self.glyphs
+        self.glyphs = np.zeros((0, 6), dtype=np.float32)  # u0, v0, u1, v1, width, height
+        self.texture_id = None
+        self.uploads = 0  # Texture uploads so far (startup, then only for new characters)
+        self.add(characters)
+
+    def add(self, characters):
+        """Make sure every character has a glyph; rebuilds the texture if one
+        was missing and returns True in that case"""
+        missing = [c for c in dict.fromkeys(characters) if c not in self.index]
+        if not missing:
+            return False
+        self.characters += ''.join(missing)
+        surfaces = [self.render_glyph(c) for c in self.characters]
+
+        # Shelf packing: left to right, new row when the atlas width is reached
+        placements = []
+        x = y = row_height = 0
+        for surface in surfaces:
+            w, h = surface.get_size()
+            if x + w > ATLAS_WIDTH:
+                x, y, row_height = 0, y + row_height + GLYPH_PADDING, 0
+            placements.append((x, y, w, h))
+            x += w + GLYPH_PADDING
+            row_height = max(row_height, h)
+        height = y + row_height
+
+        image = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+        image.fill((255, 255, 255, 0))
+        for surface, (x, y, w, h) in zip(surfaces, placements):
+            image.blit(surface, (x, y))
+        self.glyphs = np.array([(x / ATLAS_WIDTH, y / height, (x + w) / ATLAS_WIDTH, (y + h) / height, w, h)
+                                for x, y, w, h in placements], dtype=np.float32)
+        self.index = {c: i for i, c in enumerate(self.characters)}
+        self.upload(pygame.image.tostring(image, "RGBA", False), height)
+        return True
+
+    def render_glyph(self, character):
+        try:
+            return self.font.render(character, True, (255, 255, 255))
+        except pygame.error:
+            # Zero-width characters (e.g. emoji variation selectors)
+            return pygame.Surface((0, self.font.get_height()), pygame.SRCALPHA)
+
+    def upload(self, pixels, height):
+        if self.texture_id is None:
+            self.texture_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, ATLAS_WIDTH, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        self.uploads += 1
+
+    def delete(self):
+        if self.texture_id is not None:
+            glDeleteTextures([self.texture_id])
+            self.texture_id = None
+
+
+class TextRenderer:
+    """Batches text for one frame and draws it from a GlyphAtlas in one call"""
+
+    LAYOUT = ('position', 'texcoord', 'color')
+
+    def __init__(self, font_name='Arial', size=20):
+        self.font_name = font_name
+        self.size = size
+        self.atlas = None
+        self.buffer = None  # Streamed every frame (GL_STREAM_DRAW)
+        self.batches = []
+        self.layouts = {}  # text -> layout rows at the origin
+
+    def setup_gl_resources(self):
+        """Build the glyph atlas and the dynamic vertex buffer"""
+        self.atlas = get_glyph_atlas(self.font_name, self.size)
+        if vbo_supported():
+            self.buffer = VertexBuffer(np.zeros((0, 9), dtype=np.float32), self.LAYOUT, GL_STREAM_DRAW)
+
+    def glyph_rows(self, text):
+        if self.atlas is None:
+            self.setup_gl_resources()
+        if self.atlas.add(text):
+            self.layouts.clear()  # Texture coordinates moved
+        index = self.atlas.index
+        return self.atlas.glyphs[[index[c] for c in text]]
+
+    def measure(self, text):
+        """(width, height) of `text` in pixels"""
+        glyphs = self.glyph_rows(text)
+        if len(glyphs) == 0:
+            return 0, 0
+        return int(glyphs[:, 4].sum()), int(glyphs[:, 5].max())
+
+    def layout(self, text):
+        """(N * 6, 4) x, y, u, v triangle rows for `text` at the origin (memoized)"""
+        rows = self.layouts.get(text)
+        if rows is None:
+            glyphs = self.glyph_rows(text)
+            left = np.concatenate([[0.0], np.cumsum(glyphs[:-1, 4])]).astype(np.float32)
+            edges = np.column_stack([left, left + glyphs[:, 4], np.zeros(len(glyphs), dtype=np.float32),
+                                     glyphs[:, 5], glyphs[:, 0:4]])
+            rows = edges[:, QUAD_CORNERS].reshape(-1, 4)
+            if len(self.layouts) >= LAYOUT_CACHE_SIZE:
+                self.layouts.clear()  # Values that change every frame: start over
+            self.layouts[text] = rows
+        return rows
+
+    def vertices(self, text, x, y, color=(1.0, 1.0, 1.0, 1.0)):
+        """Vertex rows for `text` at (x, y), for callers that queue the same
+        text for many frames with add_vertices() (valid until atlas.uploads changes)"""
+        layout = self.layout(text)
+        rows = np.empty((len(layout), 9), dtype=np.float32)
+        rows[:, 0] = layout[:, 0] + x
+        rows[:, 1] = layout[:, 1] + y
+        rows[:, 2] = 0.0
+        rows[:, 3:5] = layout[:, 2:4]
+        rows[:, 5:9] = tuple(color) + (1.0,) * (4 - len(color))
+        return rows
+
+    def add(self, text, x, y, color=(1.0, 1.0, 1.0, 1.0)):
+        """Queue `text` with its top-left corner at (x, y) (y grows downward)"""
+        if text:
+            self.batches.append(self.vertices(text, x, y, color))
+
+    def add_vertices(self, rows):
+        """Queue rows built by vertices()"""
+        self.batches.append(rows)
+
+    def draw(self):
+        """Draw and clear everything queued this frame"""
+        if not self.batches:
+            return
+        vertices = np.vstack(self.batches)
+        self.batches.clear()
+
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self.atlas.texture_id)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        if self.buffer is not None:
+            self.buffer.upload(vertices)
+            self.buffer.draw(GL_TRIANGLES)
+        else:
+            # Client-side arrays (no buffer objects)
+            stride = vertices.strides[0]
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(3, GL_FLOAT, stride, vertices)
+            glTexCoordPointer(2, GL_FLOAT, stride, vertices[:, 3:])
+            glColorPointer(4, GL_FLOAT, stride, vertices[:, 5:])
+            glDrawArrays(GL_TRIANGLES, 0, len(vertices))
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDisable(GL_BLEND)
+        glDisable(GL_TEXTURE_2D)
+
+    def cleanup(self):
+        """Release the vertex buffer and the glyph atlases"""
+        self.layouts.clear()
+        if self.buffer is not None:
+            self.buffer.delete()
+            self.buffer = None
+        delete_glyph_atlases()
+        self.atlas = None
@@ -0,0 +1,54 @@
+# timestep.py - Fixed-timestep accumulator and render interpolation helpers
+#
+# The simulation advances in fixed steps of 1/sim_rate seconds no matter how
+# fast frames are drawn; rendering blends the last two simulation states by
+# the leftover fraction of a step (alpha).
+from collections import namedtuple
+
+REFERENCE_RATE = 60.0  # Per-step constants (speeds, decays) were tuned at 60 steps/s
+MAX_CATCH_UP_STEPS = 5  # Steps per frame at most; slower frames drop simulated time
+
+# Interpolated car state for the camera and renderers
+Pose = namedtuple('Pose', 'x y z direction wheel_angle wheel_rotation')
+
+
+def step_scale(delta_time):
+    """Step length relative to one reference (60 Hz) step"""
+    return delta_time * REFERENCE_RATE
+
+
+def lerp(a, b, alpha):
+    return a + (b - a) * alpha
+
+
+def lerp_angle(a, b, alpha):
+    """Blend angles in degrees along the shorter arc (scalars or arrays)"""
+    difference = (b - a + 180.0) % 360.0 - 180.0
+    return (a + difference * alpha) % 360.0
+
+
+class FixedTimestep:
+    def __init__(self, sim_rate=REFERENCE_RATE, max_steps=MAX_CATCH_UP_STEPS):
+        self.sim_rate = sim_rate
+        self.dt = 1.0 / sim_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # Simulated time skipped by the catch-up cap
+
+    def advance(self, frame_time):
+        """Add a frame's wall-clock time, return the number of steps to run"""
+        self.accumulator += max(frame_time, 0.0)
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            # Falling behind: run at most max_steps and drop the rest instead of
+            # spiralling into ever longer frames
+            self.dropped_time += (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+            self.accumulator = self.max_steps * self.dt + self.accumulator % self.dt
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """Fraction of a step not simulated yet (0..1), for render interpolation"""
+        return min(self.accumulator / self.dt, 1.0)
@@ -0,0 +1,146 @@
+# traffic.py - AI traffic: many vehicles in NumPy arrays (no GL)
+#
+# Every vehicle drives from intersection to intersection along the road
+# graph (Road.get_intersection_graph), keeping to the right-hand lane. State
+# lives in one array per attribute, so a step is a handful of vectorized
+# operations regardless of the number of vehicles.
+import numpy as np
+from road_graph import lane_directions
+from timestep import lerp, lerp_angle, step_scale
+
+MOVE_FACTOR = 0.08         # World units per step per speed unit (same as Car.update)
+MAX_STEERING = 55.0        # Wheel angle limit in degrees (same as Car)
+STEERING_RATE = 0.25       # Heading change per step per degree of wheel angle
+ACCELERATION = 0.5         # Speed units per step
+BRAKE_POWER = 1.0
+CRUISE_SPEED = (12.0, 22.0)  # Per-vehicle cruise speed range
+SLOWDOWN_DISTANCE = 12.0   # Start slowing down this far before an intersection
+TURN_SPEED_FRACTION = 0.4  # Fraction of cruise speed kept through intersections
+ARRIVE_RADIUS = 2.0
+LANES_PER_DIRECTION = 1
+VEHICLE_Y = 0.3
+
+BODY_COLORS = np.array([
+    (0.2, 0.5, 0.8), (0.8, 0.2, 0.2), (0.9, 0.9, 0.9), (0.15, 0.15, 0.15),
+    (0.9, 0.7, 0.1), (0.3, 0.6, 0.3), (0.5, 0.5, 0.55), (0.6, 0.3, 0.6),
+], dtype=np.float32)
+
+
+class Traffic:
+    def __init__(self, road, count=None, seed=None):
+        """count: number of vehicles, default one per lane of every road segment"""
+        self.road = road
+        self.rng = np.random.default_rng(seed)
+        self.nodes, self.neighbors = road.get_intersection_graph()
+        self.lane_width = road.road_width / 2.0 / LANES_PER_DIRECTION
+
+        origins, targets = np.nonzero(self.neighbors >= 0)
+        self.edges = np.column_stack([origins, self.neighbors[origins, targets]])
+        if count is None:
+            count = len(self.edges) * LANES_PER_DIRECTION
+        if len(self.edges) == 0:
+            count = 0  # Single intersection: nowhere to drive
+        self.count = count
+
+        # Vehicle state, one entry per vehicle
+        self.x = np.zeros(count)
+        self.z = np.zeros(count)
+        self.direction = np.zeros(count)   # Degrees, same convention as Car.direction
+        self.speed = np.zeros(count)
+        self.steering = np.zeros(count)    # Wheel angle in degrees
+        self.lane = np.zeros(count, dtype=np.int8)  # 0 = rightmost lane of the travel direction
+        self.origin = np.zeros(count, dtype=np.int64)  # Node the vehicle came from
+        self.target = np.zeros(count, dtype=np.int64)  # Node it is driving to
+        self.cruise_speed = np.zeros(count)
+        self.wheel_rotation = np.zeros(count)
+        self.color_index = np.zeros(count, dtype=np.int64)
+        self.previous_state = (self.x, self.z, self.direction)  # Before the last update (interpolation)
+
+        if count:
+            self.spawn()
+            print(f"🚙 Traffic: {count} AI vehicles on {len(self.edges)} lane segments")
+
+    def spawn(self):
+        """Place every vehicle on a random road segment, in its lane, facing along it"""
+        count = self.count
+        edges = self.edges[self.rng.integers(0, len(self.edges), count)]
+        self.origin = edges[:, 0].copy()
+        self.target = edges[:, 1].copy()
+        self.lane = self.rng.integers(0, LANES_PER_DIRECTION, count).astype(np.int8)
+        start = self.nodes[self.origin]
+        end = self.nodes[self.target]
+        t = self.rng.uniform(0.2, 0.8, count)[:, None]
+        headings = (end - start) / np.linalg.norm(end - start, axis=1)[:, None]
+        position = start + (end - start) * t + lane_directions(headings) * self.lane_offsets()[:, None]
+        self.x = position[:, 0]
+        self.z = position[:, 1]
+        self.direction = np.degrees(np.arctan2(headings[:, 0], headings[:, 1])) % 360
+        self.cruise_speed = self.rng.uniform(*CRUISE_SPEED, count)
+        self.speed = self.cruise_speed * 0.5
+        self.color_index = self.rng.integers(0, len(BODY_COLORS), count)
+        self.previous_state = (self.x.copy(), self.z.copy(), self.direction.copy())
+
+    def lane_offsets(self):
+        """Distance of each vehicle's lane center from the road center line"""
+        return (self.lane + 0.5) * self.lane_width
+
+    def targets(self):
+        """(points, headings): lane point at each target intersection and segment heading"""
+        start = self.nodes[self.origin]
+        end = self.nodes[self.target]
+        headings = (end - start) / np.linalg.norm(end - start, axis=1)[:, None]
+        points = end + lane_directions(headings) * self.lane_offsets()[:, None]
+        return points, headings
+
+    def choose_next(self, vehicles):
+        """Pick a random onward segment at the target intersection (U-turn only at dead ends)"""
+        candidates = self.neighbors[self.target[vehicles]]
+        valid = (candidates >= 0) & (candidates != self.origin[vehicles][:, None])
+        dead_end = ~valid.any(axis=1)
+        valid[dead_end] = candidates[dead_end] >= 0
+        choice = np.argmax(valid * self.rng.random(valid.shape), axis=1)
+        self.origin[vehicles] = self.target[vehicles]
+        self.target[vehicles] = candidates[np.arange(len(vehicles)), choice]
+
+    def update(self, delta_time=1.0 / 60.0):
+        """Advance every vehicle by one simulation step of delta_time seconds"""
+        if self.count == 0:
+            return
+        self.previous_state = (self.x.copy(), self.z.copy(), self.direction.copy())
+        steps = step_scale(delta_time)
+        points, headings = self.targets()
+        dx = points[:, 0] - self.x
+        dz = points[:, 1] - self.z
+
+        # Reached (or driven past) the target intersection: continue on a new segment
+        arrived = (np.hypot(dx, dz) < ARRIVE_RADIUS) | (dx * headings[:, 0] + dz * headings[:, 1] < 0)
+        if arrived.any():
+            self.choose_next(np.nonzero(arrived)[0])
+            points, headings = self.targets()
+            dx = points[:, 0] - self.x
+            dz = points[:, 1] - self.z
+        distance = np.hypot(dx, dz)
+
+        # Steer toward the lane point (same turn model as Car.update)
+        error = (np.degrees(np.arctan2(dx, dz)) - self.direction + 180.0) % 360.0 - 180.0
+        self.steering = np.clip(error, -MAX_STEERING, MAX_STEERING)
+        turn_speed = 0.4 + 0.6 * np.minimum(np.abs(self.speed) / 20.0, 1.0)
+        self.direction = (self.direction + self.steering * STEERING_RATE * turn_speed * steps) % 360.0
+
+        # Slow down approaching intersections and while turning, cruise in between
+        slowdown = np.minimum(distance / SLOWDOWN_DISTANCE, 1.0 - np.abs(error) / 90.0)
+        slowdown = np.clip(slowdown, TURN_SPEED_FRACTION, 1.0)
+        self.speed += np.clip(self.cruise_speed * slowdown - self.speed, -BRAKE_POWER * steps, ACCELERATION * steps)
+
+        dir_rad = np.radians(self.direction)
+        self.x += self.speed * np.sin(dir_rad) * MOVE_FACTOR * steps
+        self.z += self.speed * np.cos(dir_rad) * MOVE_FACTOR * steps
+
+        # Wheel animation (same formula as Car.update_wheel_rotation)
+        self.wheel_rotation = (self.wheel_rotation + self.speed * 36.0 * delta_time) % 360.0
+
+    def interpolated(self, alpha=1.0):
+        """(x, z, direction) arrays blended between the last two updates"""
+        prev_x, prev_z, prev_direction = self.previous_state
+        return (lerp(prev_x, self.x, alpha), lerp(prev_z, self.z, alpha),
+                lerp_angle(prev_direction, self.direction, alpha))
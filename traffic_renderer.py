@@ -0,0 +1,175 @@
+# traffic_renderer.py - OpenGL front-end for Traffic (instanced car meshes)
+#
+# All AI vehicles share the car model from car_mesh.py. Bodies are drawn
+# with one instanced draw per material (body color per vehicle), wheels with
+# one instanced draw carrying each wheel's position, yaw and spin.
+import numpy as np
+from OpenGL.GL import *
+from renderer import Renderer
+from car import Car
+from car_mesh import CarMesh, EMISSION, NO_EMISSION, WHEEL_POSITIONS, WHEEL_HEIGHT
+from frustum import extract_planes, aabb_visible
+from instancing import LIGHTING_GLSL, InstancedProgram, InstanceAttribute, instancing_supported
+from traffic import BODY_COLORS, VEHICLE_Y
+
+INSTANCE_ATTRIBUTE = 3  # xyz + yaw
+EXTRA_ATTRIBUTE = 4     # rgb body color + wheel spin
+VEHICLE_HALF_EXTENT = 1.8  # Bounding box half size for culling (car is 1.6 x 3.2)
+WHEEL_SEGMENTS = 10  # Coarser wheels than the player car: wheels dominate the vertex count
+
+VERTEX_SHADER = """
+#version 120
+attribute vec4 instance;  // xyz = position, w = yaw (radians, as glRotatef about y)
+attribute vec4 extra;     // rgb = body color, w = spin about local z (radians)
+uniform float use_tint;   // 1.0: replace vertex color by the instance body color
+uniform vec3 emission;
+varying vec4 color;
+varying float fog_depth;
+""" + LIGHTING_GLSL + """
+void main() {
+    vec3 p = gl_Vertex.xyz;
+    vec3 n = gl_Normal;
+    float cs = cos(extra.w);
+    float ss = sin(extra.w);
+    p.xy = vec2(cs * p.x - ss * p.y, ss * p.x + cs * p.y);
+    n.xy = vec2(cs * n.x - ss * n.y, ss * n.x + cs * n.y);
+    float c = cos(instance.w);
+    float s = sin(instance.w);
+    p = vec3(c * p.x + s * p.z, p.y, -s * p.x + c * p.z) + instance.xyz;
+    n = vec3(c * n.x + s * n.z, n.y, -s * n.x + c * n.z);
+
+    vec4 eye = gl_ModelViewMatrix * vec4(p, 1.0);
+    gl_Position = gl_ProjectionMatrix * eye;
+    fog_depth = length(eye.xyz);
+
+    vec4 material = mix(gl_Color, vec4(extra.rgb, gl_Color.a), use_tint);
+    vec4 lit = fixed_function_lighting(eye, gl_NormalMatrix * n, material);
+    color = vec4(min(lit.rgb + emission, vec3(1.0)), lit.a);
+}
+"""
+
+
+def wheel_instances(x, z, direction, steering, wheel_rotation):
+    """Per-wheel (position + yaw, spin) rows for every vehicle, 4 wheels each"""
+    count = len(x)
+    yaw = np.radians(direction)
+    cos_yaw, sin_yaw = np.cos(yaw), np.sin(yaw)
+    instances = np.empty((count, len(WHEEL_POSITIONS), 4), dtype=np.float32)
+    extra = np.zeros((count, len(WHEEL_POSITIONS), 4), dtype=np.float32)
+    for i, (wheel_x, wheel_z, steers) in enumerate(WHEEL_POSITIONS):
+        # Same transform chain as CarMesh.draw: rotate the wheel offset by the car yaw
+        instances[:, i, 0] = x + wheel_x * cos_yaw + wheel_z * sin_yaw
+        instances[:, i, 1] = VEHICLE_Y + WHEEL_HEIGHT
+        instances[:, i, 2] = z - wheel_x * sin_yaw + wheel_z * cos_yaw
+        wheel_yaw = direction + 90.0 + (steering if steers else 0.0)
+        instances[:, i, 3] = np.radians(wheel_yaw)
+        extra[:, i, 3] = np.radians(wheel_rotation)
+    return instances.reshape(-1, 4), extra.reshape(-1, 4)
+
+
+class TrafficRenderer(Renderer):
+    def __init__(self, traffic):
+        self.traffic = traffic
+        self.mesh = None  # Shared CarMesh (default car style)
+        self.program = None  # None: fall back to one CarMesh.draw per vehicle
+        self.instances = None
+        self.extra = None
+        self.stats = {'vehicles': 0, 'drawn': 0}
+
+    def setup_gl_resources(self):
+        """Upload the shared car model and the instancing shader"""
+        self.mesh = CarMesh(Car(), WHEEL_SEGMENTS)
+        if instancing_supported():
+            try:
+                self.program = InstancedProgram("Traffic", VERTEX_SHADER,
+                                                {'instance': INSTANCE_ATTRIBUTE, 'extra': EXTRA_ATTRIBUTE})
+                self.instances = InstanceAttribute(INSTANCE_ATTRIBUTE)
+                self.extra = InstanceAttribute(EXTRA_ATTRIBUTE)
+                self.use_tint_location = self.program.uniform('use_tint')
+                self.emission_location = self.program.uniform('emission')
+            except Exception as e:
+                print(f"⚠️ Traffic instancing unavailable ({e}), drawing vehicles one by one")
+                self.program = None
+        print(f"   🚙 Traffic renderer ready ({'instanced' if self.program else 'per-vehicle'})")
+
+    def visible_vehicles(self, view_projection, x, z):
+        """Indices of vehicles at (x, z) inside the view frustum"""
+        traffic = self.traffic
+        if view_projection is None:
+            return np.arange(traffic.count)
+        centers = np.column_stack([x, np.full(traffic.count, VEHICLE_Y + 0.6), z])
+        half = np.array([VEHICLE_HALF_EXTENT, 0.9, VEHICLE_HALF_EXTENT])
+        visible = aabb_visible(extract_planes(view_projection), centers - half, centers + half)
+        return np.nonzero(visible)[0]
+
+    def render(self, view_projection=None, alpha=1.0, state=None):
+        """alpha: blend between the last two simulation steps (see Traffic.interpolated)
+        state: (x, z, direction, steering, wheel_rotation) arrays to draw instead,
+        e.g. from a simulation-thread snapshot"""
+        traffic = self.traffic
+        if traffic.count == 0:
+            return
+        if self.mesh is None:
+            self.setup_gl_resources()
+        if state is None:
+            x, z, direction = traffic.interpolated(alpha)
+            state = (x, z, direction, traffic.steering, traffic.wheel_rotation)
+        x, z, direction, steering, wheel_rotation = state
+        vehicles = self.visible_vehicles(view_projection, x, z)
+        self.stats['vehicles'] = traffic.count
+        self.stats['drawn'] = len(vehicles)
+        if len(vehicles) == 0:
+            return
+
+        if self.program is None:
+            for i in vehicles.tolist():
+                self.mesh.draw(x[i], VEHICLE_Y, z[i], direction[i], steering[i], wheel_rotation[i])
+            return
+        self.draw_instanced(vehicles, x[vehicles], z[vehicles], direction[vehicles],
+                            steering[vehicles], wheel_rotation[vehicles])
+
+    def draw_instanced(self, vehicles, x, z, direction, steering, wheel_rotation):
+        traffic = self.traffic
+        mesh = self.mesh
+        count = len(vehicles)
+
+        instances = np.column_stack([x, np.full(count, VEHICLE_Y), z, np.radians(direction)])
+        extra = np.zeros((count, 4), dtype=np.float32)
+        extra[:, 0:3] = BODY_COLORS[traffic.color_index[vehicles]]
+        self.instances.upload(instances)
+        self.extra.upload(extra)
+        self.program.use()
+        mesh.bind()
+
+        # Body in the vehicle's color, then glass and trim with their own colors
+        glUniform3f(self.emission_location, 0.0, 0.0, 0.0)
+        glUniform1f(self.use_tint_location, 1.0)
+        glDrawArraysInstanced(GL_TRIANGLES, *mesh.ranges['body'], count)
+        glUniform1f(self.use_tint_location, 0.0)
+        body_count = mesh.ranges['body'][1]
+        glDrawArraysInstanced(GL_TRIANGLES, mesh.opaque_first + body_count, mesh.opaque_count - body_count, count)
+        for material in ('headlights', 'taillights'):
+            glUniform3f(self.emission_location, *EMISSION[material][:3])
+            glDrawArraysInstanced(GL_TRIANGLES, *mesh.ranges[material], count)
+        glUniform3f(self.emission_location, *NO_EMISSION[:3])
+        glLineWidth(2.0)
+        glDrawArraysInstanced(GL_LINES, mesh.line_first, mesh.line_count, count)
+        glLineWidth(1.0)
+
+        # Wheels: four instances per vehicle
+        wheels, spin = wheel_instances(x, z, direction, steering, wheel_rotation)
+        self.instances.upload(wheels)
+        self.extra.upload(spin)
+        glDrawArraysInstanced(GL_TRIANGLES, mesh.wheel_first, mesh.wheel_count, len(wheels))
+
+        mesh.unbind()
+        self.program.release()
+        self.instances.disable()
+        self.extra.disable()
+
+    def cleanup(self):
+        """Release the shared mesh, instance buffers and shader"""
+        for resource in (self.mesh, self.instances, self.extra, self.program):
+            if resource is not None:
+                resource.delete()
+        self.mesh = self.instances = self.extra = self.program = None
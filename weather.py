@@ -1,20 +1,22 @@
-# weather.py - Performance-Optimized Weather System
+# weather.py - Performance-Optimized Weather System (simulation only, no GL calls)
 import numpy as np
-from OpenGL.GL import *
-import random
+from timestep import step_scale
 
 class WeatherSystem:
-    def __init__(self):
-        # Fog settings
-        self.fog_enabled = False
+    def __init__(self, num_particles=3570, seed=None):
+        # Fog settings (applied to GL by WeatherRenderer)
         self.fog_color = (0.1, 0.1, 0.15, 1.0)  # Bluish-gray matching night sky
         self.fog_density = 0.0  # Fog disabled per user request
         
-        # Snowfall particle system
-        self.num_particles = 3570  # Heavy blizzard (reduced from 10710)
-        self.particles = []
+        # Snowfall particle system (structure-of-arrays, float32)
+        self.num_particles = num_particles  # Heavy blizzard default: 3570
         self.particle_spawn_radius = 40.0
         self.particle_spawn_height = 30.0
+        self.rng = np.random.default_rng(seed)
+        
+        self.positions = np.zeros((num_particles, 3), dtype=np.float32)  # x, y, z
+        self.fall_speed = np.zeros(num_particles, dtype=np.float32)
+        self.drift = np.zeros((num_particles, 2), dtype=np.float32)  # drift x, drift z
         
         # Initialize particle pool
         self.init_particles()
@@ -23,90 +25,48 @@ class WeatherSystem:
         print(f"   Fog: Exponential squared (density={self.fog_density})")
         print(f"   Snowflakes: {self.num_particles} particles")
     
+    def _randomize_motion(self, count):
+        """Fresh fall speeds and wind drift for `count` particles"""
+        fall_speed = self.rng.uniform(0.1, 0.3, count).astype(np.float32)
+        drift = self.rng.uniform(-0.02, 0.02, (count, 2)).astype(np.float32)
+        return fall_speed, drift
+    
     def init_particles(self):
         """Initialize snowflake particle pool"""
-        for i in range(self.num_particles):
-            particle = {
-                'x': random.uniform(-self.particle_spawn_radius, self.particle_spawn_radius),
-                'y': random.uniform(0, self.particle_spawn_height),
-                'z': random.uniform(-self.particle_spawn_radius, self.particle_spawn_radius),
-                'fall_speed': random.uniform(0.1, 0.3),
-                'drift_x': random.uniform(-0.02, 0.02),
-                'drift_z': random.uniform(-0.02, 0.02)
-            }
-            self.particles.append(particle)
-    
-    def enable_fog(self):
-        """Enable OpenGL hardware fog"""
-        if self.fog_density == 0.0:
-            print("   ✗ Fog disabled (density=0)")
-            return
-        glEnable(GL_FOG)
-        glFogi(GL_FOG_MODE, GL_EXP2)  # Exponential squared for smooth falloff
-        glFogfv(GL_FOG_COLOR, self.fog_color)
-        glFogf(GL_FOG_DENSITY, self.fog_density)
-        glHint(GL_FOG_HINT, GL_NICEST)
-        self.fog_enabled = True
-        print("   ✓ Atmospheric fog enabled")
-    
-    def disable_fog(self):
-        """Disable OpenGL fog"""
-        glDisable(GL_FOG)
-        self.fog_enabled = False
-        print("   ✗ Atmospheric fog disabled")
-    
-    def update(self, camera):
-        """Update particle positions relative to camera"""
-        for particle in self.particles:
-            # Apply falling motion
-            particle['y'] -= particle['fall_speed']
-            
-            # Apply wind drift
-            particle['x'] += particle['drift_x']
-            particle['z'] += particle['drift_z']
-            
-            # Recycle particle if it hits the ground or goes too far
-            if particle['y'] < 0 or abs(particle['x'] - camera.x) > self.particle_spawn_radius * 2 or abs(particle['z'] - camera.z) > self.particle_spawn_radius * 2:
-                # Respawn above camera with random offset
-                particle['x'] = camera.x + random.uniform(-self.particle_spawn_radius, self.particle_spawn_radius)
-                particle['y'] = camera.y + self.particle_spawn_height + random.uniform(0, 10)
-                particle['z'] = camera.z + random.uniform(-self.particle_spawn_radius, self.particle_spawn_radius)
-                particle['fall_speed'] = random.uniform(0.1, 0.3)
-                particle['drift_x'] = random.uniform(-0.02, 0.02)
-                particle['drift_z'] = random.uniform(-0.02, 0.02)
+        n = self.num_particles
+        radius = self.particle_spawn_radius
+        self.positions[:, 0] = self.rng.uniform(-radius, radius, n)
+        self.positions[:, 1] = self.rng.uniform(0, self.particle_spawn_height, n)
+        self.positions[:, 2] = self.rng.uniform(-radius, radius, n)
+        self.fall_speed[:], self.drift[:] = self._randomize_motion(n)
     
-    def render(self):
-        """Render snowflakes efficiently using GL_POINTS"""
-        # Disable lighting for particles
-        glDisable(GL_LIGHTING)
+    def update(self, camera, delta_time=1.0 / 60.0):
+        """Update particle positions relative to camera (vectorized)
         
-        # Enable blending for soft particles
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        fall_speed and drift are per 60 Hz step, scaled by delta_time.
+        """
+        positions = self.positions
+        steps = np.float32(step_scale(delta_time))
         
-        # Set point size for snowflakes
-        glPointSize(3.0)
+        # Apply falling motion and wind drift
+        positions[:, 1] -= self.fall_speed * steps
+        positions[:, 0] += self.drift[:, 0] * steps
+        positions[:, 2] += self.drift[:, 1] * steps
         
-        # Set snowflake color (white with slight transparency)
-        glColor4f(1.0, 1.0, 1.0, 0.8)
-        
-        # Draw all particles in a single batch
-        glBegin(GL_POINTS)
-        for particle in self.particles:
-            glVertex3f(particle['x'], particle['y'], particle['z'])
-        glEnd()
-        
-        # Reset point size
-        glPointSize(1.0)
-        
-        # Disable blending
-        glDisable(GL_BLEND)
+        # Recycle particles that hit the ground or drifted too far from camera
+        limit = self.particle_spawn_radius * 2
+        recycle = positions[:, 1] < 0
+        recycle |= np.abs(positions[:, 0] - camera.x) > limit
+        recycle |= np.abs(positions[:, 2] - camera.z) > limit
+        count = int(np.count_nonzero(recycle))
+        if count == 0:
+            return
         
-        # Re-enable lighting
-        glEnable(GL_LIGHTING)
-    
-    def cleanup(self):
-        """Clean up weather system resources"""
-        if self.fog_enabled:
-            self.disable_fog()
-        print("🧹 Weather system cleaned up")
+        # Respawn above camera with random offset
+        radius = self.particle_spawn_radius
+        spawn = np.empty((count, 3), dtype=np.float32)
+        spawn[:, 0] = camera.x + self.rng.uniform(-radius, radius, count)
+        spawn[:, 1] = camera.y + self.particle_spawn_height + self.rng.uniform(0, 10, count)
+        spawn[:, 2] = camera.z + self.rng.uniform(-radius, radius, count)
+        positions[recycle] = spawn
+        self.fall_speed[recycle], self.drift[recycle] = self._randomize_motion(count)
@@ -0,0 +1,84 @@
+# weather_renderer.py - OpenGL front-end for WeatherSystem (fog, snowflakes)
+from OpenGL.GL import *
+from renderer import Renderer
+from gl_buffers import VertexBuffer, vbo_supported
+
+class WeatherRenderer(Renderer):
+    def __init__(self, weather):
+        self.weather = weather
+        self.fog_enabled = False
+        self.particle_buffer = None  # Streamed every frame (GL_STREAM_DRAW)
+    
+    def setup_gl_resources(self):
+        """Apply fog settings and allocate the particle buffer"""
+        self.enable_fog()
+        if vbo_supported():
+            self.particle_buffer = VertexBuffer(self.weather.positions, ('position',), GL_STREAM_DRAW)
+    
+    def enable_fog(self):
+        """Enable OpenGL hardware fog"""
+        if self.weather.fog_density == 0.0:
+            print("   ✗ Fog disabled (density=0)")
+            return
+        glEnable(GL_FOG)
+        glFogi(GL_FOG_MODE, GL_EXP2)  # Exponential squared for smooth falloff
+        glFogfv(GL_FOG_COLOR, self.weather.fog_color)
+        glFogf(GL_FOG_DENSITY, self.weather.fog_density)
+        glHint(GL_FOG_HINT, GL_NICEST)
+        self.fog_enabled = True
+        print("   ✓ Atmospheric fog enabled")
+    
+    def disable_fog(self):
+        """Disable OpenGL fog"""
+        glDisable(GL_FOG)
+        self.fog_enabled = False
+        print("   ✗ Atmospheric fog disabled")
+    
+    def render(self, positions=None):
+        """Render snowflakes efficiently using GL_POINTS
+        
+        positions: particle array to draw instead of the live one (snapshot)
+        """
+        # Disable lighting for particles
+        glDisable(GL_LIGHTING)
+        
+        # Enable blending for soft particles
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        
+        # Set point size for snowflakes
+        glPointSize(3.0)
+        
+        # Set snowflake color (white with slight transparency)
+        glColor4f(1.0, 1.0, 1.0, 0.8)
+        
+        # Draw all particles with a single glDrawArrays call
+        if positions is None:
+            positions = self.weather.positions
+        if self.particle_buffer is not None:
+            self.particle_buffer.upload(positions)
+            self.particle_buffer.draw(GL_POINTS)
+        else:
+            # Client-side vertex array fallback (no buffer objects)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glVertexPointer(3, GL_FLOAT, 0, positions)
+            glDrawArrays(GL_POINTS, 0, len(positions))
+            glDisableClientState(GL_VERTEX_ARRAY)
+        
+        # Reset point size
+        glPointSize(1.0)
+        
+        # Disable blending
+        glDisable(GL_BLEND)
+        
+        # Re-enable lighting
+        glEnable(GL_LIGHTING)
+    
+    def cleanup(self):
+        """Clean up weather system resources"""
+        if self.fog_enabled:
+            self.disable_fog()
+        if self.particle_buffer is not None:
+            self.particle_buffer.delete()
+            self.particle_buffer = None
+        print("🧹 Weather system cleaned up")